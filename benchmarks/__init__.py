@@ -0,0 +1,5 @@
+"""benchmarks
+
+Scripts that measure the performance of the game's hot paths.
+Run them from the project root, e.g. `python -m benchmarks.ecs_stress`.
+"""
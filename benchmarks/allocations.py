@@ -0,0 +1,91 @@
+"""benchmarks.allocations.py
+
+Allocation benchmark for the gameloop. Runs the simulation and drawing
+of a frame headlessly with the player walking around the first stage,
+then traces the allocations and garbage collections of steady-state
+frames. Exits with an error when a frame goes over the budget, so it
+can be used as a check.
+"""
+
+import argparse
+import os
+import sys
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import GUI, Effects, Internal, Player, Render, Stages
+
+# pylint: enable=wrong-import-position
+
+
+def main() -> None:  # pylint: disable=too-many-locals
+    """Runs the benchmark and prints the frames over budget and the worst frame."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--warmup", type=int, default=120)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--budget", type=int, default=Internal.ALLOCATION_BUDGET)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    plr = Player.Player(Internal.SCREEN_WIDTH / 2 - 25, 730, 50, 80, 250, 10, 10)
+    controls = Player.Controls()
+    objects = Stages.STAGES[plr.stage]
+
+    hud = GUI.HUD()
+    hud.add(GUI.HealthBar(0, Internal.SCREEN_HEIGHT - 60, plr))
+    particles = Effects.ParticleSystem(seed=0)
+    presenter = Render.Presenter(screen)
+    queue = Render.RenderQueue()
+    camera = Render.Camera()
+    camera.set_room(*Stages.room_size(plr.stage))
+    camera.snap(plr)
+
+    tracker = Internal.AllocationTracker(args.budget, args.top)
+    dt = 1 / 60
+
+    for frame in range(args.warmup + args.frames):
+        if frame == args.warmup:
+            tracker.start()
+        if frame >= args.warmup:
+            tracker.begin_frame()
+
+        # walk back and forth so the frames are not all the same
+        actions = Player.controls.RIGHT if frame // 90 % 2 else Player.controls.LEFT
+        controls.apply(plr, actions, dt)
+        plr.update_(dt, objects)
+        camera.follow(plr, dt)
+        particles.update(dt)
+
+        queue.add_all(objects[1], camera.offset)
+        queue.add(plr, camera.offset, Render.LAYER_PLAYER)
+        particles.queue(queue, camera.offset)
+        controls.release(plr)
+        plr.timers.advance()
+        hud.update()
+        hud.queue(queue)
+        presenter.draw(queue)
+
+        if frame >= args.warmup:
+            tracker.end_frame()
+
+    tracker.stop()
+
+    worst = max(tracker.frames, key=lambda stats: stats.peak)
+    print(f"worst of {len(tracker.frames)} frames:\n{worst}")
+    try:
+        tracker.check()
+    except Internal.AllocationBudgetError as e:
+        print(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
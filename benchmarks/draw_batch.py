@@ -0,0 +1,126 @@
+"""benchmarks.draw_batch.py
+
+Draw benchmark for the render queue. Fills a room with tile-sized
+platforms, spikes and lava and compares drawing them one by one with
+Group.draw against batching them through a RenderQueue.
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import Tuple
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import Internal, Level, Render
+
+# pylint: enable=wrong-import-position
+
+TILE = Internal.TILE_SIZE
+
+
+def build_room(count: int, rng: random.Random) -> Tuple[Level.Group, Level.Group, Level.Group]:
+    """Builds a room of tile-sized objects, mostly platforms in horizontal runs.
+
+    :param count: The number of objects.
+    :type count: int
+    :param rng: The random number generator to use.
+    :type rng: random.Random
+    :return: The platforms, spikes and lava of the room.
+    :rtype: Tuple[Level.Group, Level.Group, Level.Group]
+    """
+
+    columns = Internal.SCREEN_WIDTH // TILE
+    rows = Internal.SCREEN_HEIGHT // TILE
+
+    platforms, spikes, lavas = Level.Group(), Level.Group(), Level.Group()
+    for index in range(count):
+        # objects past the first screenful of cells stack on the same cells
+        cell = index % (columns * rows)
+        xcor, ycor = cell % columns * TILE, cell // columns * TILE
+
+        kind = rng.random()
+        if kind < 0.7:
+            platforms.add(Level.Platform(xcor, ycor, TILE, TILE))
+        elif kind < 0.9:
+            spikes.add(Level.Spike(xcor, ycor, TILE, TILE))
+        else:
+            lavas.add(Level.Lava(xcor, ycor, TILE, TILE))
+
+    return platforms, spikes, lavas
+
+
+def bench_groups(room: Tuple[Level.Group, ...], screen: pygame.Surface, frames: int) -> float:
+    """Times drawing the room one object at a time.
+
+    :param room: The groups of the room.
+    :type room: Tuple[Level.Group, ...]
+    :param screen: The surface to draw on.
+    :type screen: pygame.Surface
+    :param frames: The number of frames to draw.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        for group in room:
+            group.draw(screen)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_queue(
+    room: Tuple[Level.Group, ...], screen: pygame.Surface, frames: int
+) -> Tuple[float, int]:
+    """Times drawing the room through a RenderQueue.
+
+    :param room: The groups of the room.
+    :type room: Tuple[Level.Group, ...]
+    :param screen: The surface to draw on.
+    :type screen: pygame.Surface
+    :param frames: The number of frames to draw.
+    :type frames: int
+    :return: The average time per frame in milliseconds and the draw calls per frame.
+    :rtype: Tuple[float, int]
+    """
+
+    queue = Render.RenderQueue()
+    calls = 0
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        for group in room:
+            queue.add_all(group)
+        calls = queue.flush(screen)
+    return (time.perf_counter() - start) / frames * 1000, calls
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.Surface((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    print(f"{'objects':>8} {'group ms/frame':>15} {'queue ms/frame':>15} {'queue calls':>12}")
+    for count in args.counts:
+        room = build_room(count, random.Random(count))
+        group_ms = bench_groups(room, screen, args.frames)
+        queue_ms, calls = bench_queue(room, screen, args.frames)
+        print(f"{count:>8} {group_ms:15.3f} {queue_ms:15.3f} {calls:>12}")
+
+
+if __name__ == "__main__":
+    main()
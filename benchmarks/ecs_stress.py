@@ -0,0 +1,142 @@
+"""benchmarks.ecs_stress.py
+
+Stress benchmark for the ECS. Spawns thousands of player-sized actors
+spread over every stage and compares a batched ECS step against
+updating the same number of Player objects one by one. The ECS is also
+timed through the level-of-detail update scheduler.
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from src import ECS, Player, Stages
+
+DT = 1 / 60
+
+
+def spawn_actors(world: ECS.World, count: int, rng: random.Random) -> None:
+    """Spawns actors at random positions in random stages.
+
+    :param world: The World to spawn in.
+    :type world: ECS.World
+    :param count: The number of actors to spawn.
+    :type count: int
+    :param rng: The random number generator to use.
+    :type rng: random.Random
+    """
+
+    grids = list(Stages.GRID_LOCATIONS.values())
+    for _ in range(count):
+        eid = world.spawn(
+            rng.uniform(150, 1400),
+            rng.uniform(150, 650),
+            50,
+            80,
+            health=10,
+            grid=rng.choice(grids),
+        )
+        world.x_vel[eid] = rng.choice((-250, 0, 250))
+
+
+def bench_ecs(count: int, frames: int) -> float:
+    """Times the ECS with the given number of actors.
+
+    :param count: The number of actors.
+    :type count: int
+    :param frames: The number of frames to simulate.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    world = ECS.World(count)
+    spawn_actors(world, count, random.Random(count))
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        ECS.step(world, DT)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_scheduled(count: int, frames: int) -> float:
+    """Times the ECS with the given number of actors, run through the update scheduler
+    with the player in the first stage.
+
+    :param count: The number of actors.
+    :type count: int
+    :param frames: The number of frames to simulate.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    world = ECS.World(count)
+    spawn_actors(world, count, random.Random(count))
+    scheduler = ECS.UpdateScheduler(world)
+    scheduler.set_focus(Stages.GRID_LOCATIONS[1])
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        scheduler.update(DT)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_players(count: int, frames: int) -> float:
+    """Times updating the given number of Player objects one by one.
+
+    :param count: The number of players.
+    :type count: int
+    :param frames: The number of frames to simulate.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    rng = random.Random(count)
+    players: List[Player.Player] = []
+    for _ in range(count):
+        players.append(
+            Player.Player(rng.uniform(150, 1400), rng.uniform(150, 650), 50, 80, 250, 10, 10)
+        )
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        for plr in players:
+            plr.update_(DT, Stages.STAGES[1])
+            # keep the players in the first stage so none of them leave the known stages
+            plr.grid_xcor, plr.grid_ycor = (1, 1)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument(
+        "--player-limit",
+        type=int,
+        default=1000,
+        help="largest count to also time with Player objects",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'actors':>8} {'ecs ms/frame':>14} {'scheduled ms/frame':>19} {'player ms/frame':>16}"
+    )
+    for count in args.counts:
+        ecs_ms = bench_ecs(count, args.frames)
+        scheduled_ms = bench_scheduled(count, args.frames)
+        player_ms = (
+            f"{bench_players(count, args.frames):16.3f}"
+            if count <= args.player_limit
+            else f"{'-':>16}"
+        )
+        print(f"{count:>8} {ecs_ms:14.3f} {scheduled_ms:19.3f} {player_ms}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""benchmarks.ghost.py
+
+Ghost stream check over loopback. A stand-in sender plays a headless game
+with random input and streams it to a receiver on a local port, dropping
+a share of the packets on purpose. The receiver is advanced in step, and
+the ghost it shows is compared with where the sender's player really was
+on that frame. Prints the bandwidth of the stream and the error of the
+ghost.
+
+With --play, a recording is streamed to a running game instead.
+"""
+
+import argparse
+import math
+import random
+import sys
+from typing import Dict, Tuple
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import Net, Sim
+
+# pylint: enable=wrong-import-position
+
+UDP_HEADER = 28
+'''The bytes of IPv4 and UDP header sent with every packet.
+'''
+
+
+class LossySender(Net.GhostSender):
+    """A ghost sender that drops some of its packets, like a lossy network."""
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        loss: float,
+        rng: random.Random,
+        recording: str | None = None,
+    ) -> None:
+        """Initializer for a LossySender object.
+
+        :param address: The host and port to send to.
+        :type address: Tuple[str, int]
+        :param loss: The share of packets to drop, from 0 to 1.
+        :type loss: float
+        :param rng: The random number generator that picks the packets to drop.
+        :type rng: random.Random
+        :param recording: The path of the recording to write, or None to not record.
+        :type recording: str | None, optional
+        """
+
+        super().__init__(address, recording)
+        self.loss: float = loss
+        self.rng: random.Random = rng
+        self.lost: int = 0
+
+    def send(self, packet: bytes) -> None:
+        """Sends a packet unless it is picked to be dropped.
+
+        :param packet: The packet.
+        :type packet: bytes
+        """
+
+        if self.rng.random() < self.loss:
+            self.lost += 1
+            return
+        super().send(packet)
+
+
+def main() -> None:
+    """Runs the check and prints the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--loss", type=float, default=0.05, help="share of packets dropped")
+    parser.add_argument("--record", help="also record the stand-in's run to this path")
+    parser.add_argument("--play", help="stream this recording to --port instead")
+    parser.add_argument("--port", type=int, default=47800)
+    args = parser.parse_args()
+
+    if args.play is not None:
+        Net.play_recording(args.play, ("127.0.0.1", args.port))
+        return
+
+    rng = random.Random(args.seed)
+    game = Sim.HeadlessGame()
+    actions = Sim.random_actions(rng)
+
+    receiver = Net.GhostReceiver(("127.0.0.1", 0), pygame.Surface((50, 100)))
+    sender = LossySender(receiver.address, args.loss, rng, args.record)
+
+    # the bottom center and room of the sender's player on every frame
+    truth: Dict[int, Tuple[float, float, Tuple[int, int]]] = {}
+    errors = []
+    hidden = 0
+    for _ in range(args.frames):
+        game.step(next(actions))
+        plr = game.plr
+        sender.update(plr)
+        truth[sender.frame] = (
+            plr.xcor + plr.width / 2,
+            plr.ycor + plr.height,
+            (plr.grid_xcor, plr.grid_ycor),
+        )
+
+        receiver.poll()
+        receiver.update()
+        state = receiver.state
+        if state is None:
+            hidden += 1
+            continue
+        xcor, ycor, grid = truth[max(receiver.clock, 1)]
+        if grid == state.grid:
+            errors.append(math.hypot(state.xcor - xcor, state.ycor - ycor))
+
+    sender.close()
+    receiver.close()
+
+    seconds = args.frames / Sim.FPS
+    print(
+        f"{sender.packets_sent} packets sent, {sender.lost} dropped by the stand-in, "
+        f"{receiver.decoder.dropped} late or missing their key"
+    )
+    print(
+        f"{sender.bytes_sent / seconds:.0f} B/s of payload, "
+        f"{(sender.bytes_sent + UDP_HEADER * sender.packets_sent) / seconds:.0f} B/s "
+        f"with headers, {sender.bytes_sent / max(1, sender.packets_sent):.1f} B per packet"
+    )
+    errors.sort()
+    if errors:
+        print(
+            f"ghost error: median {errors[len(errors) // 2]:.1f} px, "
+            f"p99 {errors[int(len(errors) * 0.99)]:.1f} px, max {errors[-1]:.1f} px, "
+            f"hidden for {hidden} frames"
+        )
+
+    if receiver.invalid or not errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""benchmarks.lifecycle.py
+
+Stage lifecycle benchmark. Walks through every stage and back with
+tilemaps drawn, once with the memory budget and once keeping everything,
+and prints the memory loaded after each room, the time each room change
+took, and what each loaded stage holds at the end.
+"""
+
+import argparse
+import os
+import time
+from typing import List
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import Internal, Level, Render, Stages
+
+# pylint: enable=wrong-import-position
+
+
+def walk(budget: int, path: List[int | str], assets: Internal.Assets) -> Stages.StageLifecycle:
+    """Enters every stage of a path with a new lifecycle and prints the memory after each.
+
+    :param budget: The memory budget of the lifecycle.
+    :type budget: int
+    :param path: The names of the stages to enter, in order.
+    :type path: List[int | str]
+    :param assets: The asset manager to render text with.
+    :type assets: Internal.Assets
+    :return: The lifecycle after the walk.
+    :rtype: Stages.StageLifecycle
+    """
+
+    lifecycle = Stages.StageLifecycle(budget)
+    screen = pygame.Surface((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    def load_stage(name: int | str) -> None:
+        stage = Stages.STAGES[name]
+        size = Stages.room_size(name)
+        built = {
+            ("spatial hash", name): lambda: Render.SpatialHash.from_stage(stage),
+            ("tilemap", name): lambda: Level.TileMap.from_stage(stage, *size),
+        }
+        for key, factory in built.items():
+            lifecycle.acquire(name, key, factory, depends_on=("stage", name))
+        for info in stage[4] or ():
+            lifecycle.acquire(
+                name,
+                ("text", info.msg, info.size, tuple(info.color)),
+                lambda info=info: assets.text(info.msg, info.size, info.color),
+                lambda _, info=info: assets.release_text(info.msg, info.size, info.color),
+            )
+
+    lifecycle.add_hook("load", load_stage)
+    # the room the player is in is drawn, which renders its tilemap chunks
+    lifecycle.add_hook(
+        "enter", lambda name: lifecycle.get(("tilemap", name)).draw(screen)
+    )
+
+    peak = 0
+    for name in path:
+        begin = time.perf_counter()
+        lifecycle.enter(name)
+        elapsed = (time.perf_counter() - begin) * 1000
+        loaded = lifecycle.loaded_bytes
+        peak = max(peak, loaded)
+        print(
+            f"    stage {name!s:>9}: {loaded / 2**20:6.1f} MiB loaded, "
+            f"{len(Stages.STAGES.built):2} stages built, entered in {elapsed:6.2f} ms"
+        )
+    print(f"    peak {peak / 2**20:.1f} MiB, {lifecycle.freed} resources freed")
+    return lifecycle
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=Internal.STAGE_MEMORY_BUDGET)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    assets = Internal.Assets()
+
+    regular = sorted(name for name in Stages.GRID_LOCATIONS if isinstance(name, int))
+    path = regular + regular[-2::-1]
+
+    print(f"budget of {args.budget / 2**20:.1f} MiB:")
+    lifecycle = walk(args.budget, path, assets)
+
+    # starts from no stages built, like the first walk
+    Stages.STAGES.built.clear()
+    assets.texts.clear()
+    print("keeping everything:")
+    walk(2**62, path, assets)
+
+    print()
+    print(lifecycle.report())
+
+
+if __name__ == "__main__":
+    main()
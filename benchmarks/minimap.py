@@ -0,0 +1,67 @@
+"""benchmarks.minimap.py
+
+World map benchmark. Builds the map of every regular stage with an
+empty thumbnail cache and again with the cache filled by the first
+run, then times opening the map.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import GUI, Internal, Render
+
+# pylint: enable=wrong-import-position
+
+
+def build(cache_dir: str) -> float:
+    """Times building the world map until every thumbnail is on it.
+
+    :param cache_dir: The directory the thumbnails are cached in.
+    :type cache_dir: str
+    :return: The time in milliseconds.
+    :rtype: float
+    """
+
+    begin = time.perf_counter()
+    world_map = GUI.WorldMap(cache_dir)
+    world_map.wait()
+    return (time.perf_counter() - begin) * 1000
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--opens", type=int, default=1000)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"cold cache: {build(cache_dir):.2f} ms")
+        print(f"warm cache: {build(cache_dir):.2f} ms")
+
+        world_map = GUI.WorldMap(cache_dir)
+        world_map.wait()
+        world_map.toggle()
+
+    render_queue = Render.RenderQueue()
+    begin = time.perf_counter()
+    for _ in range(args.opens):
+        world_map.queue(render_queue)
+        render_queue.flush(screen)
+    opened = (time.perf_counter() - begin) / args.opens * 1e6
+    print(f"open: {opened:.2f} us for a {world_map.surface.get_size()} map")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""benchmarks.navigation.py
+
+Navigation benchmark. Builds the navigation graph of every stage, then
+times path queries on a cold cache and again once they are cached.
+"""
+
+import argparse
+import random
+import time
+from typing import Tuple
+
+from src import Level, Stages
+
+
+def bench_queries(
+    graph: Level.NavGraph, queries: int, rng: random.Random
+) -> Tuple[float, float]:
+    """Times random path queries on a graph.
+
+    :param graph: The graph to query.
+    :type graph: Level.NavGraph
+    :param queries: The number of queries.
+    :type queries: int
+    :param rng: The random number generator to pick nodes with.
+    :type rng: random.Random
+    :return: The average time of a query in microseconds without and with the cache.
+    :rtype: Tuple[float, float]
+    """
+
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(queries)]
+
+    # pylint: disable=protected-access
+    cold = 0.0
+    for start, goal in pairs:
+        graph._paths.clear()
+        begin = time.perf_counter()
+        graph.path(start, goal)
+        cold += time.perf_counter() - begin
+    # pylint: enable=protected-access
+
+    begin = time.perf_counter()
+    for start, goal in pairs:
+        graph.path(start, goal)
+    warm = time.perf_counter() - begin
+
+    return cold / queries * 1e6, warm / queries * 1e6
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'stage':>10} {'nodes':>6} {'edges':>6} {'build ms':>9} "
+        f"{'cold us/query':>14} {'cached us/query':>16}"
+    )
+    for name in Stages.GRID_LOCATIONS:
+        begin = time.perf_counter()
+        graph = Level.NavGraph.from_stage(Stages.STAGES[name], *Stages.room_size(name))
+        build_ms = (time.perf_counter() - begin) * 1000
+
+        edges = sum(len(node.edges) for node in graph.nodes)
+        cold, warm = bench_queries(graph, args.queries, rng)
+        print(
+            f"{name!s:>10} {len(graph):>6} {edges:>6} {build_ms:9.2f} {cold:14.2f} {warm:16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
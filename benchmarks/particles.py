@@ -0,0 +1,96 @@
+"""benchmarks.particles.py
+
+Particle benchmark. Keeps a fixed number of particles alive and
+times updating and drawing them each frame.
+"""
+
+import argparse
+import os
+import time
+from typing import Tuple
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import numpy as np
+import pygame
+
+from src import Effects, Internal, Render
+
+# pylint: enable=wrong-import-position
+
+
+def fill(system: Effects.ParticleSystem, count: int) -> None:
+    """Tops the particle system up to a number of particles spread over the screen.
+
+    :param system: The particle system.
+    :type system: Effects.ParticleSystem
+    :param count: The number of particles to keep alive.
+    :type count: int
+    """
+
+    missing = count - len(system)
+    if missing <= 0:
+        return
+
+    rng = system.rng
+    pos = np.empty((missing, 2), np.float32)
+    pos[:, 0] = rng.uniform(0, Internal.SCREEN_WIDTH, missing)
+    pos[:, 1] = rng.uniform(0, Internal.SCREEN_HEIGHT, missing)
+    vel = rng.normal(0, 100, (missing, 2))
+    system.emit(missing, pos, vel, rng.uniform(0.5, 2, missing), (255, 120, 0), 0.2, 1)
+
+
+def bench(count: int, screen: pygame.Surface, frames: int) -> Tuple[float, float]:
+    """Times updating and drawing a number of particles.
+
+    :param count: The number of particles.
+    :type count: int
+    :param screen: The surface to draw on.
+    :type screen: pygame.Surface
+    :param frames: The number of frames to run.
+    :type frames: int
+    :return: The average update and draw times per frame in milliseconds.
+    :rtype: Tuple[float, float]
+    """
+
+    system = Effects.ParticleSystem(max(count, 1), seed=count)
+    queue = Render.RenderQueue()
+    update_time = draw_time = 0.0
+
+    for _ in range(frames):
+        fill(system, count)
+
+        start = time.perf_counter()
+        system.update(1 / 60)
+        update_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        screen.fill((0, 0, 0))
+        system.queue(queue)
+        queue.flush(screen)
+        draw_time += time.perf_counter() - start
+
+    return update_time / frames * 1000, draw_time / frames * 1000
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.Surface((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    print(f"{'particles':>10} {'update ms/frame':>16} {'draw ms/frame':>14}")
+    for count in args.counts:
+        update_ms, draw_ms = bench(count, screen, args.frames)
+        print(f"{count:>10} {update_ms:16.3f} {draw_ms:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""benchmarks.scaling.py
+
+Scaling benchmark. Generates stress stages with more and more objects and
+times a frame of Player.update_, against the object Groups and against a
+tilemap, and of drawing the stage with Group.draw and through the spatial
+hash and a RenderQueue like the gameloop does. Prints a table and the
+first object count where each goes over the frame budget.
+
+Tilemaps and spatial hashes are built once and do not follow moving
+platforms, so their columns are timed in the same stage without any,
+which is generated with the same seed.
+
+With --plot, also plots frame time against object count, if matplotlib
+is installed.
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import Dict, List
+
+# the benchmark draws to an off-screen surface, so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+from src import Internal, Level, Player, Render, Sim, Stages
+
+# pylint: enable=wrong-import-position
+
+BUDGET = 1000 / Sim.FPS
+'''The time a whole frame can take in milliseconds.
+'''
+
+NAME = "STRESS"
+'''The name the stress stages are registered under.
+'''
+
+
+def reset(plr: Player.Player) -> None:
+    """Puts the player back at the spawn of the stress stage, e.g. after dying or leaving it.
+
+    :param plr: The player.
+    :type plr: Player.Player
+    """
+
+    plr.grid_xcor, plr.grid_ycor = Stages.GRID_LOCATIONS[NAME]
+    plr.stage = NAME
+    plr.xcor, plr.ycor = Stages.SPAWN[0], Stages.SPAWN[1] - plr.height
+    plr.y_vel = 0
+    plr.health = plr.max_health
+    plr.interp_data.moving = False
+
+
+def bench_update(
+    stage: Stages.Stage,
+    movers: List[Stages.Mover],
+    frames: int,
+    tilemap: Level.TileMap | None = None,
+) -> float:
+    """Times Player.update_ with random input in a stage. The movers are not timed.
+
+    :param stage: The stage.
+    :type stage: Stages.Stage
+    :param movers: The movers of the stage's moving platforms.
+    :type movers: List[Stages.Mover]
+    :param frames: The number of frames to simulate.
+    :type frames: int
+    :param tilemap: The tilemap to collide with instead of the Groups.
+    :type tilemap: Level.TileMap | None, optional
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    timers = Internal.TimerService()
+    plr = Player.new_player(timers)
+    controls = Player.Controls()
+    actions = Sim.random_actions(random.Random(frames))
+    reset(plr)
+
+    elapsed = 0.0
+    for _ in range(frames):
+        for mover in movers:
+            mover.update(Sim.DT)
+        controls.apply(plr, next(actions), Sim.DT)
+
+        start = time.perf_counter()
+        try:
+            plr.update_(Sim.DT, stage, tilemap)
+        except Stages.StageNotFoundError:
+            # walked out of the stress stage, which has no neighbours
+            pass
+        elapsed += time.perf_counter() - start
+
+        if plr.stage != NAME or plr.grid_xcor != stage[0][0] or plr.grid_ycor != stage[0][1]:
+            reset(plr)
+        controls.release(plr)
+        timers.advance()
+    return elapsed / frames * 1000
+
+
+def bench_draw(stage: Stages.Stage, screen: pygame.Surface, frames: int) -> float:
+    """Times drawing every object of a stage with Group.draw.
+
+    :param stage: The stage.
+    :type stage: Stages.Stage
+    :param screen: The surface to draw on.
+    :type screen: pygame.Surface
+    :param frames: The number of frames to draw.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    groups = [group for group in stage[1:4] if group is not None]
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        for group in groups:
+            group.draw(screen)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_queue(stage: Stages.Stage, screen: pygame.Surface, frames: int) -> float:
+    """Times drawing the objects in view of a stage through the spatial hash and a RenderQueue.
+
+    :param stage: The stage.
+    :type stage: Stages.Stage
+    :param screen: The surface to draw on.
+    :type screen: pygame.Surface
+    :param frames: The number of frames to draw.
+    :type frames: int
+    :return: The average time per frame in milliseconds.
+    :rtype: float
+    """
+
+    spatial_hash = Render.SpatialHash.from_stage(stage)
+    queue = Render.RenderQueue()
+    view = screen.get_rect()
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((0, 0, 0))
+        queue.add_all(spatial_hash.query(view))
+        queue.flush(screen)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def plot(counts: List[int], results: Dict[str, List[float]], path: str) -> None:
+    """Plots frame time against object count, with the frame budget marked.
+
+    :param counts: The object counts.
+    :type counts: List[int]
+    :param results: The time per frame in milliseconds of each benchmark, for every count.
+    :type results: Dict[str, List[float]]
+    :param path: The path of the image to save.
+    :type path: str
+    """
+
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from matplotlib import pyplot
+    except ImportError:
+        print("matplotlib is not installed, skipping the plot")
+        return
+
+    figure, axes = pyplot.subplots()
+    for label, times in results.items():
+        axes.plot(counts, times, marker="o", label=label)
+    axes.axhline(BUDGET, color="red", linestyle="--", label="frame budget")
+    axes.set_xscale("log")
+    axes.set_yscale("log")
+    axes.set_xlabel("objects")
+    axes.set_ylabel("ms per frame")
+    axes.legend()
+    figure.savefig(path)
+    print(f"plot saved to {path}")
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[15, 50, 100, 500, 1000, 5000, 10000]
+    )
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--moving", type=float, default=0.1, help="share of moving platforms")
+    parser.add_argument("--density", type=float, help="widen the room to this tile coverage")
+    parser.add_argument("--plot", help="save a plot of the results to this path")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.Surface((Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT))
+
+    results: Dict[str, List[float]] = {
+        "update": [],
+        "update (tilemap)": [],
+        "Group.draw": [],
+        "queue": [],
+    }
+    if args.moving:
+        print(
+            f"{args.moving:.0%} of the platforms move, except for the tilemap and queue "
+            "columns, which do not follow them"
+        )
+    print(f"{'objects':>8} {'room':>10}" + "".join(f"{label:>18}" for label in results))
+    for count in args.counts:
+        # the same mix as the preset stages, mostly platforms
+        stage, size, movers = Stages.stress_stage(
+            args.seed,
+            platforms=count * 7 // 10,
+            spikes=count * 2 // 10,
+            lava=count - count * 7 // 10 - count * 2 // 10,
+            moving=args.moving,
+            density=args.density,
+        )
+        Stages.add_stage(NAME, stage, size)
+        # the same stage with its platforms still, for the tilemap and the spatial hash
+        static, _, _ = Stages.stress_stage(
+            args.seed,
+            platforms=count * 7 // 10,
+            spikes=count * 2 // 10,
+            lava=count - count * 7 // 10 - count * 2 // 10,
+            density=args.density,
+        )
+        tilemap = Level.TileMap.from_stage(static, *size)
+
+        results["update"].append(bench_update(stage, movers, args.frames))
+        results["update (tilemap)"].append(bench_update(static, [], args.frames, tilemap))
+        results["Group.draw"].append(bench_draw(stage, screen, args.frames))
+        results["queue"].append(bench_queue(static, screen, args.frames))
+        print(
+            f"{count:>8} {size[0]:>5}x{size[1]:<4}"
+            + "".join(f"{times[-1]:18.3f}" for times in results.values())
+        )
+
+    print()
+    for label, times in results.items():
+        over = [count for count, elapsed in zip(args.counts, times) if elapsed > BUDGET]
+        if over:
+            print(f"{label} goes over the {BUDGET:.1f} ms frame budget at {over[0]} objects")
+        else:
+            print(f"{label} stays under the {BUDGET:.1f} ms frame budget")
+
+    if args.plot is not None:
+        plot(args.counts, results, args.plot)
+
+
+if __name__ == "__main__":
+    main()
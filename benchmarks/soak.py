@@ -0,0 +1,69 @@
+"""benchmarks.soak.py
+
+Soak test runner. Plays many headless games with seeded random input
+in a process pool, checks the invariants after every frame, saves the
+input log of every failure, and reports the throughput. A saved log can
+be replayed to reproduce its failure.
+
+About half of the games fail with StageNotFoundError within 20,000
+frames, which is a bug in the collisions: when the player falls past
+the end of the floor of a doorway, the floor pushes it sideways to one
+player width outside the room, where it is not far enough out to change
+rooms and falls out of the bottom of the world.
+"""
+
+import argparse
+import os
+import time
+
+# pylint: disable=wrong-import-position
+from src import Sim
+
+# pylint: enable=wrong-import-position
+
+
+def main() -> None:
+    """Runs the soak test, or replays an input log."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first game")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tilemaps", action="store_true")
+    parser.add_argument("--ignore", nargs="*", default=[], help="invariants to skip")
+    parser.add_argument("--out", default="soak_failures")
+    parser.add_argument("--replay", metavar="LOG", help="replay an input log instead")
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        log = Sim.InputLog.load(args.replay)
+        print(f"recorded: {log.failure}")
+        result = Sim.replay(log, args.ignore)
+        if result is None:
+            print("replayed: no failure")
+        else:
+            print(f"replayed: frame {result[0]} of {len(log)}: {result[1]}")
+        return
+
+    start = time.perf_counter()
+    failures, played = Sim.soak(
+        range(args.seed, args.seed + args.games),
+        args.frames,
+        args.workers,
+        args.tilemaps,
+        args.out,
+        ignore=args.ignore,
+    )
+    elapsed = time.perf_counter() - start
+
+    for failure in failures:
+        print(failure)
+    print(
+        f"{args.games} games, {played} frames in {elapsed:.1f} s "
+        f"({played / elapsed:.0f} frames/s), {len(failures)} failures"
+    )
+
+
+if __name__ == "__main__":
+    main()
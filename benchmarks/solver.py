@@ -0,0 +1,76 @@
+"""benchmarks.solver.py
+
+Route solver runner. Searches every room reachable from the start of a
+new game with the headless physics, in a process pool, and prints the
+fastest route found through each exit and the fastest arrival at each
+stage. Exits with an error when a stage cannot be reached, so it can be
+used as a check after editing the stages.
+
+Room searches are cached in cache/solver, so after an edit only the
+rooms that changed and the rooms after them are searched again.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# pylint: disable=wrong-import-position
+from src import Sim
+
+# pylint: enable=wrong-import-position
+
+
+def main() -> None:
+    """Runs the solver and prints the report."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--hold", type=int, default=4, help="frames each move is held for")
+    parser.add_argument("--max-frames", type=int, default=1200)
+    parser.add_argument("--beam-width", type=int, default=1000)
+    parser.add_argument("--cell", type=int, default=16)
+    parser.add_argument("--ignore", nargs="*", default=[], help="invariants to skip")
+    parser.add_argument("--replay", action="store_true", help="replay every route found")
+    parser.add_argument(
+        "--cache",
+        default=os.path.join(os.path.dirname(os.path.dirname(__file__)) or ".", "cache", "solver"),
+        help="directory room searches are cached in",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="search every room")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = Sim.solve_world(
+        args.workers,
+        None if args.no_cache else args.cache,
+        hold=args.hold,
+        max_frames=args.max_frames,
+        beam_width=args.beam_width,
+        cell=args.cell,
+        ignore=tuple(args.ignore),
+    )
+    elapsed = time.perf_counter() - start
+
+    print(report)
+    print(
+        f"{report.searches} room searches, {report.cached} from the cache, "
+        f"{report.tried} moves in {elapsed:.1f} s"
+    )
+
+    # the input of every arrival is played from a new game, to check it ends in its stage
+    if args.replay:
+        for name, inputs in report.inputs.items():
+            game = Sim.HeadlessGame()
+            for actions in inputs:
+                game.step(actions)
+            if game.plr.stage != name:
+                print(f"route to stage {name} ended in stage {game.plr.stage} when replayed")
+                sys.exit(1)
+
+    if report.unreachable:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
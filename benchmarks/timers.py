@@ -0,0 +1,62 @@
+"""benchmarks.timers.py
+
+Timer service benchmark. Keeps a growing number of long cooldowns
+running while a fixed number of short timers expire every frame, and
+times advancing a frame. The time per frame should stay flat as the
+number of live timers grows, since only the expiring ones are touched.
+"""
+
+import argparse
+import random
+import time
+
+from src import Internal
+
+
+def bench_advance(live: int, expiring: int, frames: int, rng: random.Random) -> float:
+    """Times advancing the timer service with live timers that do not expire.
+
+    :param live: The number of timers that stay running for the whole benchmark.
+    :type live: int
+    :param expiring: The number of timers that expire on each frame.
+    :type expiring: int
+    :param frames: The number of frames to advance.
+    :type frames: int
+    :param rng: The random number generator to pick delays with.
+    :type rng: random.Random
+    :return: The average time of a frame in microseconds.
+    :rtype: float
+    """
+
+    timers = Internal.TimerService()
+    for _ in range(live):
+        timers.schedule(frames + rng.randrange(1, 600))
+
+    # repeating timers keep the same number expiring on every frame
+    for _ in range(expiring):
+        timers.schedule(1, repeat=1)
+
+    begin = time.perf_counter()
+    for _ in range(frames):
+        timers.advance()
+    return (time.perf_counter() - begin) / frames * 1e6
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table of the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--expiring", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'live':>8} {'expiring':>9} {'us/frame':>9}")
+    for live in (0, 100, 1000, 10000, 100000):
+        per_frame = bench_advance(live, args.expiring, args.frames, rng)
+        print(f"{live:>8} {args.expiring:>9} {per_frame:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,43 +3,148 @@
 The main module of the project. Runs the gameloop.
 """
 
+import functools
 import os
-from typing import Tuple
+import time
+from typing import Dict, List, Tuple
 
-import pygame
-from screeninfo import get_monitors
+# everything after this is part of startup
+STARTUP_BEGIN: float = time.perf_counter()
 
-from src import GUI, Internal, Level, Player, Stages
-from src.Internal import interp
+# pylint: disable=wrong-import-position
+import pygame
 
-# get the main monitor info,
-# then set the pygame window to open in the center of the screen
-MONITOR = get_monitors()[0]
-WINDOW_X: int = MONITOR.width // 2 - Internal.SCREEN_WIDTH // 2
-WINDOW_Y: int = MONITOR.height // 2 - Internal.SCREEN_HEIGHT // 2
-os.environ["SDL_VIDEO_WINDOW_POS"] = f"{WINDOW_X}, {WINDOW_Y}"
-pygame.init()
+import src
+from src import ECS, GUI, Animation, Effects, Internal, Level, Player, Render, Stages
+
+# pylint: enable=wrong-import-position
+
+startup: Internal.StartupTimer = Internal.StartupTimer(STARTUP_BEGIN)
+startup.mark("imports")
+
+# open the window in the center of the main monitor, only asking for the monitor info
+# when the window position is not already known
+if "SDL_VIDEO_WINDOW_POS" not in os.environ:
+    if Internal.WINDOW_POSITION is not None:
+        WINDOW_X, WINDOW_Y = Internal.WINDOW_POSITION  # pylint: disable=unpacking-non-sequence
+        os.environ["SDL_VIDEO_WINDOW_POS"] = f"{WINDOW_X}, {WINDOW_Y}"
+    else:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import screeninfo
+
+            MONITOR = screeninfo.get_monitors()[0]
+            WINDOW_X = MONITOR.width // 2 - Internal.SCREEN_WIDTH // 2
+            WINDOW_Y = MONITOR.height // 2 - Internal.SCREEN_HEIGHT // 2
+            os.environ["SDL_VIDEO_WINDOW_POS"] = f"{WINDOW_X}, {WINDOW_Y}"
+        except ImportError:
+            # without screeninfo, SDL centers the window on the main monitor itself
+            os.environ["SDL_VIDEO_CENTERED"] = "1"
+        except screeninfo.ScreenInfoError:
+            os.environ["SDL_VIDEO_CENTERED"] = "1"
+
+# only the pygame modules the game uses are initialized, pygame.init also opens the
+# audio device and joysticks, which can take a long time
+pygame.display.init()
+pygame.font.init()
 
 screen: pygame.Surface = pygame.display.set_mode(
     (Internal.SCREEN_WIDTH, Internal.SCREEN_HEIGHT)
 )
 pygame.display.set_caption("Untitled Metroidvania.")
+startup.mark("pygame init")
+
+# every cooldown and scheduled callback runs on game time, advanced once per frame
+timers: Internal.TimerService = Internal.TimerService()
 
 # setup the player to spawn in stage 1
-plr: Player.Player = Player.Player(
-    Internal.SCREEN_WIDTH / 2 - 25,
-    730,
-    width=50,
-    height=80,
-    speed=250,
-    health=10,
-    max_health=10,
-    has_collision=True,
-    color=(255, 0, 255),
-)
+plr: Player.Player = Player.new_player(timers)
 
-healthbar: GUI.HealthBar = GUI.HealthBar(0, Internal.SCREEN_HEIGHT - 60, plr)
+# the player is simulated as an entity of the ECS world, and synced with the Player
+# object the rest of the game reads every frame
+world: ECS.World = ECS.World()
+PLAYER_ID: int = world.spawn_hitbox(plr)
 
+# fonts and stage text are loaded before they are needed
+assets: Internal.Assets = Internal.Assets(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "fonts.json")
+)
+
+# the hud only re-renders widgets whose values changed
+hud: GUI.HUD = GUI.HUD()
+healthbar: GUI.HealthBar = hud.add(GUI.HealthBar(0, Internal.SCREEN_HEIGHT - 60, plr, assets))
+
+controls: Player.Controls = Player.Controls()
+
+# the state to go back to when restarting after dying
+spawn_snapshot: bytes = Player.snapshot.capture(plr, controls)
+
+# resume from the last checkpoint if there is a save, the save package is only imported here,
+# after the window is open
+SAVE_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves", "save.dat")
+progress: "src.Save.SaveGame" = src.Save.SaveGame()
+try:
+    # the visited rooms are only read from the save when the next one is written
+    progress = src.Save.SaveGame.load(SAVE_PATH)
+    progress.apply(plr)
+except FileNotFoundError:
+    progress.checkpoint(plr)
+except (OSError, src.Save.SaveError, Stages.StageNotFoundError) as e:
+    print(f"Could not load the save, starting a new game: {e}")
+    progress = src.Save.SaveGame()
+    progress.checkpoint(plr)
+
+saver: "src.Save.SaveWriter" = src.Save.SaveWriter(SAVE_PATH)
+
+# stages are loaded with the rooms around the player and unloaded once out of reach, and
+# what was built for them is only freed when unused past the memory budget
+lifecycle: Stages.StageLifecycle = Stages.StageLifecycle(Internal.STAGE_MEMORY_BUDGET)
+
+
+def load_stage(name: int | str) -> None:
+    """Builds what a stage is drawn and collided with, and renders its text.
+
+    :param name: The name of the stage.
+    :type name: int | str
+    """
+
+    stage = Stages.STAGES[name]
+    # spatial hashes are used to only draw the objects in view, and like tilemaps they are
+    # built from the stage's objects, so both are freed with it
+    lifecycle.acquire(
+        name,
+        ("spatial hash", name),
+        lambda: Render.SpatialHash.from_stage(stage),
+        depends_on=("stage", name),
+    )
+    if Internal.USE_TILEMAPS:
+        lifecycle.acquire(
+            name,
+            ("tilemap", name),
+            lambda: Level.TileMap.from_stage(stage, *Stages.room_size(name)),
+            depends_on=("stage", name),
+        )
+    else:
+        # the player entity collides with the stage's rects packed into arrays
+        lifecycle.acquire(
+            name,
+            ("colliders", name),
+            lambda: ECS.StageColliders(stage, Stages.room_size(name)),
+            depends_on=("stage", name),
+        )
+    # text is keyed by its content, so stages showing the same text share it
+    for info in stage[4] or ():
+        lifecycle.acquire(
+            name,
+            ("text", info.msg, info.size, tuple(info.color)),
+            functools.partial(assets.text, info.msg, info.size, info.color),
+            lambda _, info=info: assets.release_text(info.msg, info.size, info.color),
+        )
+
+
+lifecycle.add_hook("load", load_stage)
+
+# load the first stage and the ones around it, then remember the resolved fonts
 screen_objects: Tuple[
     Tuple[
         int,
@@ -49,56 +154,188 @@ screen_objects: Tuple[
     Level.Group | None,
     Level.Group | None,
     Tuple[Stages.TextInfo, ...] | None,
-] = Stages.STAGES[1]
+] = lifecycle.enter(plr.stage)
+assets.save_cache()
+startup.mark("assets")
+
+tilemap: Level.TileMap | None = None
+if Internal.USE_TILEMAPS:
+    tilemap = lifecycle.get(("tilemap", plr.stage))
+spatial_hash: Render.SpatialHash = lifecycle.get(("spatial hash", plr.stage))
+
+# the draw calls of each frame are batched by layer and color, drawn at the render scale,
+# and optionally drawn on a render thread while the next frame is simulated
+presenter: Render.Presenter = Render.Presenter(
+    screen,
+    Internal.RENDER_SCALE,
+    Internal.SMOOTH_SCALING,
+    1000 / 60 if Internal.AUTO_RENDER_SCALE else None,
+)
+pipeline: Render.RenderPipeline | None = None
+render_queue: Render.RenderQueue = Render.RenderQueue()
+if Internal.PIPELINED_RENDERING:
+    pipeline = Render.RenderPipeline(presenter)
+
+# frames are copied into a buffer pool and written on a writer thread, dropping frames
+# instead of stalling when the writer falls behind
+if Internal.FRAME_CAPTURE is not None:
+    presenter.capture = Render.FrameCapture(
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "captures",
+            time.strftime("%Y%m%d-%H%M%S")
+            + {"raw": ".raw", "png": "", "pipe": ".mp4"}[Internal.FRAME_CAPTURE],
+        ),
+        Internal.FRAME_CAPTURE,
+    )
+
+# the camera scrolls rooms that are larger than the screen
+camera: Render.Camera = Render.Camera()
+camera.set_room(*Stages.room_size(plr.stage))
+camera.snap(plr)
+
+# lava embers, spike sparks and dash trails
+particles: Effects.ParticleSystem = Effects.ParticleSystem()
+emitters: List[Effects.LavaEmitter] = Effects.stage_emitters(screen_objects[3])
+plr.on_hazard = functools.partial(Effects.hazard_burst, particles)
+controls.on_dash = functools.partial(Effects.dash_burst, particles)
+
+
+def loaded_colliders(grid: Tuple[int, int]) -> ECS.StageColliders | None:
+    """Gets the colliders of the stage at a grid location if it is loaded.
+
+    The player only leaves the loaded stages when teleported, and collides
+    with nothing for that frame until its new stage is entered.
+
+    :param grid: The grid location of the stage.
+    :type grid: Tuple[int, int]
+    :return: The colliders of the stage, or None if it does not exist or is not loaded.
+    :rtype: ECS.StageColliders | None
+    """
+
+    try:
+        key = ("colliders", Stages.grid_to_stage(grid))
+    except Stages.StageNotFoundError:
+        return None
+    return lifecycle.get(key) if key in lifecycle.resources else None
+
+
+def player_hazard(_: int, kind: str, rect: pygame.Rect) -> None:
+    """Passes the hazards the player entity touches on to the Player's hazard callback.
+
+    :param kind: The kind of hazard.
+    :type kind: str
+    :param rect: The rect of the hazard.
+    :type rect: pygame.Rect
+    """
+
+    if plr.on_hazard is not None:
+        plr.on_hazard(kind, rect)
+
+
+# every frame of the player, and its mirrored copy, is prepared once
+if Internal.PLAYER_SPRITE_SHEET is not None:
+    player_frames: Dict[str, List[pygame.Surface]] = Animation.load_sheet(
+        Internal.PLAYER_SPRITE_SHEET, Internal.PLAYER_FRAME_SIZE
+    )
+else:
+    player_frames = Animation.placeholder_frames(plr.width, plr.height, plr.color)
+player_animator: Animation.PlayerAnimator = Animation.PlayerAnimator(
+    plr, Animation.Atlas(player_frames)
+)
+
+# the world map draws the stage thumbnails on a worker thread and caches them on disk
+world_map: GUI.WorldMap = GUI.WorldMap(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "minimap")
+)
 
-jump_debounce: bool = False
-dash_debounce: bool = False
+# the ghost of another run, streamed from a second local game or a played recording,
+# and the stream of this run for another game to race against, the net package is only
+# imported when one of them is used
+ghost: "src.Net.GhostReceiver | None" = None
+if Internal.GHOST_ADDRESS is not None:
+    ghost_sprite: pygame.Surface = player_frames["idle"][0].copy()
+    ghost_sprite.set_alpha(96)
+    ghost = src.Net.GhostReceiver(Internal.GHOST_ADDRESS, ghost_sprite)
+ghost_sender: "src.Net.GhostSender | None" = None
+if Internal.GHOST_SEND_ADDRESS is not None or Internal.GHOST_RECORD:
+    GHOST_RECORDING: str | None = None
+    if Internal.GHOST_RECORD:
+        GHOST_RECORDING = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "ghosts",
+            time.strftime("%Y%m%d-%H%M%S") + ".ghost",
+        )
+    ghost_sender = src.Net.GhostSender(Internal.GHOST_SEND_ADDRESS, GHOST_RECORDING)
+
+startup.mark("stages and renderer")
+first_frame: bool = True
 
 # the stage the player was in last frame
 previous_stage: int | str = plr.stage
 
+# reports the frames that allocate more than the allocation budget
+allocations: Internal.AllocationTracker | None = None
+if Internal.TRACK_ALLOCATIONS:
+    allocations = Internal.AllocationTracker(Internal.ALLOCATION_BUDGET)
+    allocations.start()
+
+# input is polled while waiting for each frame, and the time from each input to the
+# frame that shows it is recorded
+sampler: Player.InputSampler = Player.InputSampler()
+latency: Internal.LatencyTracker = Internal.LatencyTracker()
+pipelined_input: List[float] = []
+
+
+def quit_game() -> None:
+    """Finishes the background work and closes the game."""
+
+    if pipeline is not None:
+        pipeline.close()
+    if presenter.capture is not None:
+        presenter.capture.close()
+    saver.close()
+    world_map.close()
+    if ghost is not None:
+        ghost.close()
+    if ghost_sender is not None:
+        ghost_sender.close()
+    if Internal.PROFILE_INPUT:
+        print(latency.report())
+    pygame.quit()
+    raise SystemExit
+
+
 # anything inside while True is the gameloop
 # this code executes each frame
 while True:
     # limits the game to 60fps and gets the time delta
-    dt: float = pygame.time.Clock().tick_busy_loop(60) / 1000.0
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-
-    # what to do if certain keys are pressed
-    keys: pygame.key.ScancodeWrapper = pygame.key.get_pressed()
-
-    # walking
-    if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-        plr.move_left(dt)
-    if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-        plr.move_right(dt)
-
-    # jumping
-    if keys[pygame.K_w] or keys[pygame.K_UP] or keys[pygame.K_SPACE]:
-        if plr.on_ground:
-            plr.jump()
-            start_time_j = pygame.time.get_ticks()
-            jump_debounce = True
-        elif not jump_debounce and not plr.double_jump_debounce:
-            plr.double_jump()
-
-    # dashing
-    if keys[pygame.K_LSHIFT] and not dash_debounce:
-        if plr.facing_right:
-            plr.moveto(plr.xcor + 150, plr.ycor, 0.2, interp.ease_out_circ, False)
-        if plr.facing_left:
-            plr.moveto(plr.xcor - 150, plr.ycor, 0.2, interp.ease_out_circ, False)
-        start_time_i = pygame.time.get_ticks()
-        dash_debounce = True
-
-    # restart if died
-    if keys[pygame.K_r] and plr.stage == "GAME_OVER":
-        plr.xcor, plr.ycor = (200, 730)
-        plr.grid_xcor, plr.grid_ycor = (1, 1)
-        plr.health = 10
+    dt: float = sampler.wait(60)
+    frame_start: float = time.perf_counter()
+    if allocations is not None:
+        allocations.begin_frame()
+
+    # the input is latched as late as possible, right before the frame is simulated
+    frame_input: Player.InputFrame = sampler.sample()
+    keys: pygame.key.ScancodeWrapper = frame_input.keys
+    actions: int = frame_input.held
+
+    # exit game
+    # maybe we'll add a menu later
+    if frame_input.quit_requested or keys[pygame.K_ESCAPE]:
+        quit_game()
+
+    # walking, jumping and dashing
+    controls.apply(plr, actions, dt, frame_input.pressed)
+
+    # open or close the map with M
+    if frame_input.pressed & Player.controls.MAP:
+        world_map.toggle()
+
+    # restart from the last checkpoint if died
+    if actions & Player.controls.RESTART and plr.stage == "GAME_OVER":
+        Player.snapshot.restore(spawn_snapshot, plr, controls)
+        progress.apply(plr, full_health=True)
 
     # DEBUG ROOM KEYBIND
     if keys[pygame.K_LCTRL] and keys[pygame.K_d] and plr.stage != "DEBUG":
@@ -112,56 +349,121 @@ while True:
         plr.ycor = Internal.SCREEN_HEIGHT - plr.height - 100
         plr.grid_xcor, plr.grid_ycor = (1, 1)
 
-    # exit game
-    # maybe we'll add a menu later
-    if keys[pygame.K_ESCAPE]:
-        pygame.quit()
-
-    # run any update logic for the player
-    plr.update_(dt, screen_objects)
+    # run any update logic for the player, as an entity of the world unless it collides with a
+    # tilemap, which only the Player can
+    if tilemap is None:
+        world.read(PLAYER_ID, plr)
+        # the Player's timers count down its i-frames
+        ECS.step(world, dt, frames=0, on_hazard=player_hazard, colliders=loaded_colliders)
+        world.write(PLAYER_ID, plr)
+    else:
+        plr.update_(dt, screen_objects, tilemap)
 
     # update the stage objects if the player changes screens
     if previous_stage != plr.stage:
-        screen_objects = Stages.STAGES[plr.stage]
-
-    # redraw the updated items on the screen
-    screen.fill((0, 0, 0))
-
-    screen_objects[1].draw(screen)
-
-    # draw the objects if they are not None
-    if screen_objects[2]:
-        screen_objects[2].draw(screen)
-    if screen_objects[3]:
-        screen_objects[3].draw(screen)
+        # loads the stages around the new one and unloads the ones left behind
+        screen_objects = lifecycle.enter(plr.stage)
+        if Internal.USE_TILEMAPS:
+            tilemap = lifecycle.get(("tilemap", plr.stage))
+        spatial_hash = lifecycle.get(("spatial hash", plr.stage))
+        if Internal.PROFILE_STAGE_MEMORY:
+            print(lifecycle.report())
+
+        # save a checkpoint when entering a regular stage
+        if isinstance(plr.stage, int):
+            progress.checkpoint(plr)
+            saver.save(progress)
+        elif plr.stage == "GAME_OVER":
+            progress.deaths += 1
+            saver.save(progress)
+
+        # particles are in room coordinates, so they do not carry over to the next room
+        particles.clear()
+        emitters = Effects.stage_emitters(screen_objects[3])
+
+        camera.set_room(*Stages.room_size(plr.stage))
+        camera.snap(plr)
+    else:
+        camera.follow(plr, dt)
+
+    for emitter in emitters:
+        emitter.update(particles, dt)
+    Effects.dash_trail(particles, plr, dt)
+    particles.update(dt)
+
+    # queue the frame, the screen itself is only drawn on when the queue is flushed
+    if pipeline is not None:
+        render_queue = pipeline.queue
+
+    # only the objects in view are drawn
+    offset: Tuple[int, int] = camera.offset
+    if tilemap is not None:
+        render_queue.call(
+            functools.partial(tilemap.draw, offset=offset, viewport=camera.viewport),
+            Render.LAYER_PLATFORMS,
+        )
+    else:
+        render_queue.add_all(spatial_hash.query(camera.viewport), offset)
 
     stage_text = screen_objects[4]
     if stage_text:
         for text in stage_text:
-            screen.blit(
-                pygame.font.SysFont("8514oem", text.size).render(
-                    text.msg, False, text.color
-                ),
-                (text.xcor + 50, text.ycor),
+            render_queue.sprite(
+                assets.text(text.msg, text.size, text.color),
+                (int(text.xcor) + 50 + offset[0], int(text.ycor) + offset[1]),
+                Render.LAYER_TEXT,
             )
 
-    plr.draw(screen)
+    # the ghost is queued before the player so the player is drawn over it
+    if ghost is not None:
+        ghost.poll()
+        ghost.update()
+        ghost.queue(render_queue, (plr.grid_xcor, plr.grid_ycor), offset)
+    if ghost_sender is not None:
+        ghost_sender.update(plr)
 
-    if jump_debounce and pygame.time.get_ticks() - start_time_j >= 200:
-        jump_debounce = False
+    player_animator.update(dt)
+    player_animator.queue(render_queue, offset)
+    particles.queue(render_queue, offset)
 
-    if (
-        dash_debounce
-        and pygame.time.get_ticks() - start_time_i >= 400
-        and plr.on_ground
-    ):
-        dash_debounce = False
+    controls.release(plr)
 
-    # the healthbar is updated last so it is drawn on top of everything
-    healthbar.update(screen)
+    # the hud is on the top layer so it is drawn on top of everything
+    # the presenter only redraws the rects of the hud that changed when the world did not
+    hud_dirty: List[pygame.Rect] = hud.update()
+    hud.queue(render_queue)
+    world_map.update(plr.stage)
+    world_map.queue(render_queue)
 
     # update frame by frame data
+    progress.play_time += dt
     previous_stage = plr.stage
-    plr.i_frames -= 1 if plr.i_frames > 0 else 0
-
-    pygame.display.flip()
+    timers.advance()
+
+    if pipeline is not None:
+        pipeline.present(hud_dirty)
+        # the pipeline shows the frame before this one, so that frame's input was just shown
+        latency.record(pipelined_input, time.perf_counter())
+        pipelined_input = frame_input.times
+    else:
+        changed: List[pygame.Rect] | None = presenter.draw(render_queue, hud_dirty)
+        if changed is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed)
+        latency.record(frame_input.times, time.perf_counter())
+
+    if first_frame:
+        startup.mark("first frame")
+        if Internal.PROFILE_STARTUP:
+            print(startup.report())
+    first_frame: bool = False
+
+    # lets the presenter lower the render scale if frames are over budget
+    presenter.record((time.perf_counter() - frame_start) * 1000)
+
+    if allocations is not None:
+        frame_allocations: Internal.FrameStats = allocations.end_frame()
+        if allocations.over_budget:
+            allocations.over_budget.clear()
+            print(frame_allocations)
@@ -0,0 +1,8 @@
+"""Animation
+
+The Animation package contains the sprite sheet loader, the atlas
+of pre-flipped frames and the animators that play them.
+"""
+
+from .animator import ANIMATION_FPS, Animation, Animator, PlayerAnimator, placeholder_frames
+from .atlas import STATES, Atlas, load_sheet, slice_sheet
@@ -0,0 +1,266 @@
+"""Animation.animator.py
+
+Module containing the animations, the state machine that plays them
+and the player animator, which picks its state from the player's.
+"""
+
+from typing import Dict, List, Tuple
+
+import pygame
+
+from ..Internal import check_type
+from ..Player import Player
+from ..Render import LAYER_PLAYER, RenderQueue
+from .atlas import STATES, Atlas
+
+Color = Tuple[int, int, int]
+
+ANIMATION_FPS: Dict[str, Tuple[float, bool]] = {
+    "idle": (4, True),
+    "run": (12, True),
+    "jump": (10, False),
+    "double_jump": (16, False),
+    "dash": (20, True),
+    "hurt": (20, True),
+}
+'''The frame rate of each player animation and whether it loops. Animations that
+do not loop hold their last frame.
+'''
+
+
+class Animation:
+    """How an animation in an atlas is played."""
+
+    def __init__(self, name: str, length: int, fps: float, loop: bool = True) -> None:
+        """Initializer for an Animation object.
+
+        :param name: The name of the animation in the atlas.
+        :type name: str
+        :param length: The number of frames.
+        :type length: int
+        :param fps: The frames shown per second.
+        :type fps: float
+        :param loop: Whether to start over after the last frame instead of holding it.
+        :type loop: bool, optional
+        """
+
+        check_type(name, str)
+        check_type(length, int)
+
+        self.name: str = name
+        self.length: int = length
+        self.fps: float = fps
+        self.loop: bool = loop
+
+    def index(self, elapsed: float) -> int:
+        """Gets the frame shown after the animation has played for some time.
+
+        :param elapsed: The time played in seconds.
+        :type elapsed: float
+        :return: The index of the frame.
+        :rtype: int
+        """
+
+        index = int(elapsed * self.fps)
+        if self.loop:
+            return index % self.length
+        return min(index, self.length - 1)
+
+
+class Animator:
+    """A state machine that plays one animation of an atlas at a time."""
+
+    def __init__(self, atlas: Atlas, animations: Dict[str, Animation], state: str) -> None:
+        """Initializer for an Animator object.
+
+        :param atlas: The atlas with the frames of every animation.
+        :type atlas: Atlas
+        :param animations: The animation of each state.
+        :type animations: Dict[str, Animation]
+        :param state: The state to start in.
+        :type state: str
+        """
+
+        check_type(atlas, Atlas)
+        check_type(animations, dict)
+
+        self.atlas: Atlas = atlas
+        self.animations: Dict[str, Animation] = animations
+        self.state: str = state
+        self.elapsed: float = 0
+        self.flipped: bool = False
+
+    def set_state(self, state: str) -> None:
+        """Switches to the animation of a state, restarting it if the state changed.
+
+        States without an animation use the idle animation.
+
+        :param state: The state.
+        :type state: str
+        """
+
+        if state not in self.animations:
+            state = "idle"
+        if state != self.state:
+            self.state = state
+            self.elapsed = 0
+
+    def update(self, dt: float) -> None:
+        """Advances the current animation.
+
+        :param dt: The time since the last frame in seconds.
+        :type dt: float
+        """
+
+        self.elapsed += dt
+
+    @property
+    def frame(self) -> pygame.Surface:
+        """The frame to show, already mirrored if flipped."""
+
+        animation = self.animations[self.state]
+        return self.atlas.frame(animation.name, animation.index(self.elapsed), self.flipped)
+
+
+class PlayerAnimator(Animator):
+    """Animates the player from its movement state."""
+
+    def __init__(self, plr: Player, atlas: Atlas) -> None:
+        """Initializer for a PlayerAnimator object.
+
+        :param plr: The player to animate.
+        :type plr: Player
+        :param atlas: The atlas with the player's animations, which must include idle.
+        :type atlas: Atlas
+        :raises ValueError: If the atlas has no idle animation, e.g. the first row of the
+            sprite sheet is empty.
+        """
+
+        check_type(plr, Player)
+        # states without an animation fall back to idle, so it has to exist
+        if "idle" not in atlas.lengths:
+            raise ValueError(
+                "The player's atlas has no idle animation, which every state falls back to."
+            )
+
+        animations = {
+            state: Animation(state, atlas.lengths[state], *ANIMATION_FPS.get(state, (10, True)))
+            for state in STATES
+            if state in atlas.lengths
+        }
+        super().__init__(atlas, animations, "idle")
+
+        self.plr: Player = plr
+        self._previous_xcor: float = plr.xcor
+
+    def player_state(self) -> str:
+        """Gets the animation state of the player, the most important first.
+
+        :return: The state.
+        :rtype: str
+        """
+
+        plr = self.plr
+        if plr.i_frames > 0:
+            return "hurt"
+        if plr.interp_data.moving:
+            return "dash"
+        if not plr.on_ground:
+            # the debounce is only set in the air after a double jump
+            if plr.double_jump_debounce and plr.y_vel < 0:
+                return "double_jump"
+            return "jump"
+        if plr.xcor != self._previous_xcor:
+            return "run"
+        return "idle"
+
+    def update(self, dt: float) -> None:
+        """Picks the state and facing from the player, then advances the animation.
+
+        Call it after the player has updated for the frame.
+
+        :param dt: The time since the last frame in seconds.
+        :type dt: float
+        """
+
+        self.set_state(self.player_state())
+        self.flipped = self.plr.facing_left
+        self._previous_xcor = self.plr.xcor
+        super().update(dt)
+
+    def queue(
+        self, render_queue: RenderQueue, offset: Tuple[int, int] = (0, 0), layer: int = LAYER_PLAYER
+    ) -> None:
+        """Queues the current frame, with its bottom center on the bottom center of the player.
+
+        :param render_queue: The queue to draw with.
+        :type render_queue: RenderQueue
+        :param offset: The amount to shift the frame by, from the camera.
+        :type offset: Tuple[int, int], optional
+        :param layer: The layer of the frame.
+        :type layer: int, optional
+        """
+
+        frame = self.frame
+        plr = self.plr
+        width, height = frame.get_size()
+        render_queue.sprite(
+            frame,
+            (
+                int(plr.xcor + (plr.width - width) / 2) + offset[0],
+                int(plr.ycor + plr.height - height) + offset[1],
+            ),
+            layer,
+        )
+
+
+def _shade(color: Color, amount: float) -> Color:
+    """Internal function that mixes a color with white, or with black for negative amounts.
+
+    :param color: The color.
+    :type color: Color
+    :param amount: How much to mix in, from -1 to 1.
+    :type amount: float
+    :return: The mixed color.
+    :rtype: Color
+    """
+
+    target = 255 if amount > 0 else 0
+    amount = abs(amount)
+    return tuple(round(channel + (target - channel) * amount) for channel in color)
+
+
+def placeholder_frames(width: int, height: int, color: Color) -> Dict[str, List[pygame.Surface]]:
+    """Draws simple frames for every state, used until the player has a sprite sheet.
+
+    The frames are the player's rect with a visor on the side it faces,
+    squashed, stretched or shaded depending on the state.
+
+    :param width: The width of the player.
+    :type width: int
+    :param height: The height of the player.
+    :type height: int
+    :param color: The color of the player.
+    :type color: Color
+    :return: The frames of each state, facing right.
+    :rtype: Dict[str, List[pygame.Surface]]
+    """
+
+    def frame(body: Color, squash: int = 0, visor_y: int = 0) -> pygame.Surface:
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # squashing keeps the feet on the ground and the frame the size of the hitbox
+        body_rect = pygame.Rect(squash // 2, squash, width - squash, height - squash)
+        surface.fill(body, body_rect)
+        visor = pygame.Rect(0, 0, max(1, body_rect.width // 3), max(1, height // 10))
+        visor.topright = (body_rect.right - 4, body_rect.top + height // 6 + visor_y)
+        surface.fill(_shade(body, -0.6), visor)
+        return surface
+
+    return {
+        "idle": [frame(color), frame(color, 2)],
+        "run": [frame(color, 0, 2), frame(color, 4, 0), frame(color, 0, -2), frame(color, 4, 0)],
+        "jump": [frame(color, 6), frame(color)],
+        "double_jump": [frame(_shade(color, 0.3), 8), frame(_shade(color, 0.15)), frame(color)],
+        "dash": [frame(_shade(color, 0.4), 10), frame(_shade(color, 0.2), 10)],
+        "hurt": [frame((255, 255, 255)), frame(color)],
+    }
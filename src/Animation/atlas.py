@@ -0,0 +1,144 @@
+"""Animation.atlas.py
+
+Module containing the sprite sheet loader and the frame atlas.
+
+Flipping or scaling a sprite every frame costs as much as drawing it
+several times over, so every frame is prepared once: sheets are loaded
+and sliced when the game starts, the frames and their mirrored copies
+are packed into a single atlas surface in the display's pixel format,
+and each frame is kept as a subsurface of the atlas. Drawing a frame is
+then a single blit of a surface that needs no conversion.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import pygame
+
+from ..Internal import check_type
+
+STATES: Tuple[str, ...] = ("idle", "run", "jump", "double_jump", "dash", "hurt")
+'''The animation states, in the order of the rows of a character sprite sheet.
+'''
+
+# frames are spaced apart in the atlas so smooth scaling does not bleed between them
+_PADDING = 1
+
+
+def slice_sheet(sheet: pygame.Surface, frame_size: Tuple[int, int]) -> List[List[pygame.Surface]]:
+    """Slices a sprite sheet into rows of frames.
+
+    A row ends at its first fully transparent frame, so rows can have
+    different numbers of frames.
+
+    :param sheet: The sprite sheet.
+    :type sheet: pygame.Surface
+    :param frame_size: The width and height of a frame.
+    :type frame_size: Tuple[int, int]
+    :return: The frames of each row.
+    :rtype: List[List[pygame.Surface]]
+    """
+
+    width, height = frame_size
+    columns = sheet.get_width() // width
+    rows = sheet.get_height() // height
+
+    sliced = []
+    for row in range(rows):
+        frames = []
+        for column in range(columns):
+            frame = sheet.subsurface((column * width, row * height, width, height))
+            if frame.get_bounding_rect().width == 0:
+                break
+            frames.append(frame.copy())
+        sliced.append(frames)
+    return sliced
+
+
+def load_sheet(
+    path: str, frame_size: Tuple[int, int], states: Sequence[str] = STATES
+) -> Dict[str, List[pygame.Surface]]:
+    """Loads a character sprite sheet with one row of frames for each state.
+
+    :param path: The path of the image.
+    :type path: str
+    :param frame_size: The width and height of a frame.
+    :type frame_size: Tuple[int, int]
+    :param states: The state of each row, from the top.
+    :type states: Sequence[str], optional
+    :return: The frames of each state.
+    :rtype: Dict[str, List[pygame.Surface]]
+    """
+
+    sheet = pygame.image.load(path)
+    rows = slice_sheet(sheet, frame_size)
+    return {state: frames for state, frames in zip(states, rows) if frames}
+
+
+class Atlas:
+    """Every frame of a set of animations and their mirrored copies packed into one surface."""
+
+    def __init__(self, animations: Dict[str, List[pygame.Surface]], max_width: int = 2048) -> None:
+        """Initializer for an Atlas object. Packs the frames and converts them once.
+
+        :param animations: The frames of each animation, facing right.
+        :type animations: Dict[str, List[pygame.Surface]]
+        :param max_width: The widest the atlas surface can be before frames wrap to a new row.
+        :type max_width: int, optional
+        """
+
+        check_type(animations, dict)
+
+        # every frame, then its mirrored copy, in the order they are packed
+        frames = []
+        for name, surfaces in animations.items():
+            for index, surface in enumerate(surfaces):
+                frames.append((name, index, False, surface))
+                frames.append((name, index, True, pygame.transform.flip(surface, True, False)))
+
+        # shelf packing, the tallest frames first so the shelves waste less space
+        order = sorted(range(len(frames)), key=lambda i: -frames[i][3].get_height())
+        positions: Dict[int, Tuple[int, int]] = {}
+        xcor = ycor = shelf_height = width = 0
+        for i in order:
+            frame_width, frame_height = frames[i][3].get_size()
+            if xcor and xcor + frame_width > max_width:
+                xcor = 0
+                ycor += shelf_height + _PADDING
+                shelf_height = 0
+            positions[i] = (xcor, ycor)
+            xcor += frame_width + _PADDING
+            width = max(width, xcor)
+            shelf_height = max(shelf_height, frame_height)
+
+        self.surface: pygame.Surface = pygame.Surface(
+            (max(1, width), max(1, ycor + shelf_height)), pygame.SRCALPHA
+        )
+        for i, (_, _, _, surface) in enumerate(frames):
+            self.surface.blit(surface, positions[i])
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+        # (animation, frame, flipped) -> the frame as a subsurface of the atlas
+        self.frames: Dict[Tuple[str, int, bool], pygame.Surface] = {}
+        self.lengths: Dict[str, int] = {
+            name: len(surfaces) for name, surfaces in animations.items()
+        }
+        for i, (name, index, flipped, surface) in enumerate(frames):
+            self.frames[(name, index, flipped)] = self.surface.subsurface(
+                (positions[i], surface.get_size())
+            )
+
+    def frame(self, name: str, index: int, flipped: bool = False) -> pygame.Surface:
+        """Gets a frame of an animation.
+
+        :param name: The name of the animation.
+        :type name: str
+        :param index: The index of the frame, wrapped around the length of the animation.
+        :type index: int
+        :param flipped: Whether to get the mirrored frame, facing left.
+        :type flipped: bool, optional
+        :return: The frame.
+        :rtype: pygame.Surface
+        """
+
+        return self.frames[(name, index % self.lengths[name], flipped)]
@@ -0,0 +1,9 @@
+"""ECS
+
+The ECS package contains the entity-component system, which runs the
+simulation of many actors at once with array-backed components.
+"""
+
+from .scheduler import FAR, FULL, NEAR, RoomClock, UpdateScheduler
+from .systems import ColliderLookup, HazardCallback, StageColliders, colliders_for, step
+from .world import FACING_LEFT, FACING_RIGHT, World
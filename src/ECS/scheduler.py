@@ -0,0 +1,268 @@
+"""ECS.scheduler.py
+
+Module containing the level-of-detail update scheduler, which keeps the
+whole world going without simulating every room at the full frame rate.
+
+The room the player is in runs every frame. Rooms next to it run every
+few frames with the time they missed, so they are never far behind when
+the player walks in. Far rooms only run on coarse, staggered ticks, or
+not at all, and are fast-forwarded when they come close. Time is always
+simulated in substeps no longer than max_step, so a larger tick does
+not let entities fall through platforms.
+
+Every room except the current one shares a per-frame time budget. Rooms
+that do not fit keep their missed time and run first on the next frame.
+"""
+
+import math
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..Internal import check_type
+from .systems import step
+from .world import World
+
+FULL = 0
+'''Tier of the room the player is in, updated every frame.
+'''
+NEAR = 1
+'''Tier of the rooms next to the player's room, updated at a reduced rate.
+'''
+FAR = 2
+'''Tier of every other room, updated on coarse ticks or fast-forwarded when it comes close.
+'''
+
+
+class RoomClock:
+    """How far behind the present a room's simulation is."""
+
+    def __init__(self, grid: Tuple[int, int], tier: int) -> None:
+        """Initializer for a RoomClock object.
+
+        :param grid: The grid location of the room.
+        :type grid: Tuple[int, int]
+        :param tier: The tier of the room, FULL, NEAR or FAR.
+        :type tier: int
+        """
+
+        self.grid: Tuple[int, int] = grid
+        self.tier: int = tier
+
+        # the time and frames that passed since the room last ran
+        self.pending: float = 0
+        self.frames: int = 0
+
+        # the frame the room is due on, spread out so rooms of a tier do not all run together
+        self.phase: int = hash(grid)
+
+
+class UpdateScheduler:
+    """Decides which rooms of a World run each frame and for how long."""
+
+    def __init__(
+        self,
+        world: World,
+        near_every: int = 4,
+        far_every: int = 0,
+        max_step: float = 1 / 30,
+        budget_ms: float = 2.0,
+        settle_time: float = 5.0,
+    ) -> None:
+        """Initializer for an UpdateScheduler object.
+
+        :param world: The World to update.
+        :type world: World
+        :param near_every: How many frames apart the rooms next to the focus run.
+        :type near_every: int, optional
+        :param far_every: How many frames apart far rooms run, or 0 to only fast-forward
+            them when they become near.
+        :type far_every: int, optional
+        :param max_step: The longest time simulated in one step, in seconds.
+        :type max_step: float, optional
+        :param budget_ms: The time the rooms other than the focus can take per frame,
+            in milliseconds.
+        :type budget_ms: float, optional
+        :param settle_time: The most missed time simulated when a room catches up, in
+            seconds. Anything longer is dropped, as rooms have settled by then.
+        :type settle_time: float, optional
+        """
+
+        check_type(world, World)
+
+        self.world: World = world
+        self.near_every: int = max(1, near_every)
+        self.far_every: int = far_every
+        self.max_step: float = max_step
+        self.budget_ms: float = budget_ms
+        self.settle_time: float = settle_time
+
+        self.focus: Tuple[int, int] = (0, 0)
+        self.clocks: Dict[Tuple[int, int], RoomClock] = {}
+        self.frame: int = 0
+
+        # how the last frame went, for profiling: the rooms run and deferred besides the
+        # focus, and the milliseconds they took
+        self.stats: Dict[str, float] = {"run": 0, "deferred": 0, "ms": 0}
+
+    def tier(self, grid: Tuple[int, int]) -> int:
+        """Gets the tier of a room from its distance to the focus.
+
+        :param grid: The grid location of the room.
+        :type grid: Tuple[int, int]
+        :return: The tier, FULL, NEAR or FAR.
+        :rtype: int
+        """
+
+        distance = abs(grid[0] - self.focus[0]) + abs(grid[1] - self.focus[1])
+        return min(distance, FAR)
+
+    def set_focus(self, grid: Tuple[int, int]) -> None:
+        """Moves the focus to the room the player is in.
+
+        Rooms that were far and are now near or in focus are fast-forwarded
+        right away, so they are up to date when they are first seen.
+
+        :param grid: The grid location of the player's room.
+        :type grid: Tuple[int, int]
+        """
+
+        self.focus = (int(grid[0]), int(grid[1]))
+
+        rooms = self._rooms()
+        for room, clock in self.clocks.items():
+            tier = self.tier(room)
+            if tier < clock.tier and room in rooms:
+                self._run(clock, rooms[room])
+            clock.tier = tier
+
+    def _rooms(self) -> Dict[Tuple[int, int], np.ndarray]:
+        """Internal method that groups the living entities by room.
+
+        :return: The ids of the entities in each room.
+        :rtype: Dict[Tuple[int, int], np.ndarray]
+        """
+
+        world = self.world
+        ids = np.flatnonzero(world.alive[: world.count])
+        if not ids.size:
+            return {}
+
+        rooms, room_of = np.unique(
+            np.stack((world.grid_x[ids], world.grid_y[ids]), axis=1), axis=0, return_inverse=True
+        )
+        room_of = room_of.reshape(-1)
+        order = np.argsort(room_of, kind="stable")
+        bounds = np.searchsorted(room_of[order], np.arange(len(rooms) + 1))
+        return {
+            (int(grid_x), int(grid_y)): ids[order[bounds[index] : bounds[index + 1]]]
+            for index, (grid_x, grid_y) in enumerate(rooms)
+        }
+
+    def _run(self, clock: RoomClock, ids: np.ndarray) -> np.ndarray:
+        """Internal method that simulates the time a room missed in substeps.
+
+        :param clock: The clock of the room.
+        :type clock: RoomClock
+        :param ids: The ids of the entities in the room.
+        :type ids: np.ndarray
+        :return: The ids of the entities that changed rooms.
+        :rtype: np.ndarray
+        """
+
+        pending = min(clock.pending, self.settle_time)
+        frames = clock.frames
+        clock.pending = 0
+        clock.frames = 0
+        if pending <= 0:
+            return ids[:0]
+
+        steps = max(1, math.ceil(pending / self.max_step - 1e-9))
+        moved: List[np.ndarray] = []
+        for index in range(steps):
+            # the frames are shared out so the i-frames count down by the right total
+            step_frames = frames * (index + 1) // steps - frames * index // steps
+            moved.append(step(self.world, pending / steps, ids, step_frames))
+
+            # entities that left the room are simulated by their new room from now on
+            if moved[-1].size:
+                ids = np.setdiff1d(ids, moved[-1], assume_unique=True)
+        return np.unique(np.concatenate(moved))
+
+    def _due(self, clock: RoomClock) -> bool:
+        """Internal method that checks whether a room is due to run this frame.
+
+        :param clock: The clock of the room.
+        :type clock: RoomClock
+        :return: Whether it is due.
+        :rtype: bool
+        """
+
+        if clock.tier == FULL:
+            return True
+        every = self.near_every if clock.tier == NEAR else self.far_every
+        return every > 0 and (self.frame + clock.phase) % every == 0
+
+    def update(self, dt: float) -> np.ndarray:
+        """Runs the rooms that are due this frame.
+
+        :param dt: Delta time.
+        :type dt: float
+        :return: The ids of the entities that changed rooms.
+        :rtype: np.ndarray
+        """
+
+        rooms = self._rooms()
+        moved: List[np.ndarray] = []
+
+        due: List[RoomClock] = []
+        for grid, ids in rooms.items():
+            clock = self.clocks.get(grid)
+            if clock is None:
+                clock = self.clocks[grid] = RoomClock(grid, self.tier(grid))
+            clock.pending += dt
+            clock.frames += 1
+
+            if clock.tier == FULL:
+                moved.append(self._run(clock, ids))
+            elif self._due(clock) or clock.frames > self._every(clock.tier):
+                # rooms deferred by the budget are past their period and still due
+                due.append(clock)
+
+        # the nearest and most behind rooms get the budget first
+        due.sort(key=lambda clock: (clock.tier, -clock.pending))
+        start = time.perf_counter()
+        run = deferred = 0
+        for clock in due:
+            # at least one room runs each frame, so a small budget still makes progress
+            if run and (time.perf_counter() - start) * 1000 >= self.budget_ms:
+                deferred += 1
+                continue
+            moved.append(self._run(clock, rooms[clock.grid]))
+            run += 1
+        self.stats = {"run": run, "deferred": deferred, "ms": (time.perf_counter() - start) * 1000}
+
+        # rooms that emptied keep no clock, they start over when something walks in
+        for grid in [grid for grid in self.clocks if grid not in rooms]:
+            del self.clocks[grid]
+
+        self.frame += 1
+        if not moved:
+            return np.empty(0, np.intp)
+        return np.unique(np.concatenate(moved))
+
+    def _every(self, tier: int) -> int | float:
+        """Internal method that gets how many frames apart the rooms of a tier run.
+
+        :param tier: The tier.
+        :type tier: int
+        :return: The period in frames, infinite for rooms that only catch up when entered.
+        :rtype: int | float
+        """
+
+        if tier == FULL:
+            return 1
+        if tier == NEAR:
+            return self.near_every
+        return self.far_every if self.far_every > 0 else math.inf
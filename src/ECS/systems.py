@@ -0,0 +1,516 @@
+"""ECS.systems.py
+
+Module containing the systems that run the simulation of a World.
+
+Each system processes every matching entity in one batch and mirrors
+the logic of the Player it was generalized from, so the Player can be
+run as one entity among many.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+import pygame
+
+from ..Internal import GRAVITY_ACCELERATION, SCREEN_HEIGHT, SCREEN_WIDTH
+from ..Internal.hitboxes import EasingFunction
+from ..Stages import StageNotFoundError, STAGES, grid_to_stage, room_size
+from .world import FACING_LEFT, FACING_RIGHT, World
+
+# vectorized versions of easing functions that only work on single values
+_VECTORIZED: Dict[EasingFunction, Callable[[np.ndarray], np.ndarray]] = {}
+
+
+class StageColliders:
+    """The collision rects of a stage as arrays of (left, top, width, height)."""
+
+    def __init__(
+        self, stage: Tuple[Any, ...], size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    ) -> None:
+        """Initializer for a StageColliders object.
+
+        :param stage: The stage to read, in the format used by Stages.
+        :type stage: Tuple[Any, ...]
+        :param size: The width and height of the stage's room.
+        :type size: Tuple[int, int], optional
+        """
+
+        self.width: int = size[0]
+        self.height: int = size[1]
+
+        self.platforms: np.ndarray = _rects(
+            tuple(platform) for platform in stage[1] if platform.has_collision
+        )
+        self.spikes: np.ndarray = _rects(
+            tuple(spike.hitbox) for spike in stage[2] or () if spike.has_collision
+        )
+        self.lavas: np.ndarray = _rects(
+            tuple(lava) for lava in stage[3] or () if lava.has_collision
+        )
+
+
+def _rects(rects: Any) -> np.ndarray:
+    """Internal function that packs rects into an (n, 4) array.
+
+    :param rects: An iterable of (left, top, width, height) tuples.
+    :type rects: Any
+    :return: The packed rects.
+    :rtype: np.ndarray
+    """
+
+    return np.array(list(rects), np.float64).reshape(-1, 4)
+
+
+ColliderLookup = Callable[[Tuple[int, int]], StageColliders | None]
+'''Gets the colliders of the stage at a grid location, or None if there is none to collide with.
+'''
+
+_colliders: Dict[Tuple[int, int], StageColliders] = {}
+
+
+def colliders_for(grid: Tuple[int, int]) -> StageColliders | None:
+    """Gets the cached colliders of the stage at the given grid location.
+
+    The colliders are kept for as long as the process runs, which suits
+    simulations that never unload stages. The gameloop gets them through
+    the stage lifecycle instead, so they are freed with their stage.
+
+    :param grid: The grid location of the stage.
+    :type grid: Tuple[int, int]
+    :return: The colliders of the stage, or None if there is no stage there.
+    :rtype: StageColliders | None
+    """
+
+    if grid not in _colliders:
+        try:
+            name = grid_to_stage(grid)
+        except StageNotFoundError:
+            # not cached, a stage can be added there later
+            return None
+        _colliders[grid] = StageColliders(STAGES[name], room_size(name))
+    return _colliders[grid]
+
+
+def _room_sizes(grid_x: np.ndarray, grid_y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Internal function that gets the room size for each grid location.
+
+    :param grid_x: The grid x-coordinates.
+    :type grid_x: np.ndarray
+    :param grid_y: The grid y-coordinates.
+    :type grid_y: np.ndarray
+    :return: The room widths and heights, the screen size where there is no room.
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+
+    widths = np.full(len(grid_x), SCREEN_WIDTH, np.float64)
+    heights = np.full(len(grid_x), SCREEN_HEIGHT, np.float64)
+    if len(grid_x) == 0:
+        return widths, heights
+
+    rooms, room_of = np.unique(np.stack((grid_x, grid_y), axis=1), axis=0, return_inverse=True)
+    room_of = room_of.reshape(-1)
+    for index, (room_x, room_y) in enumerate(rooms):
+        try:
+            width, height = room_size(grid_to_stage((int(room_x), int(room_y))))
+        except StageNotFoundError:
+            continue
+        widths[room_of == index] = width
+        heights[room_of == index] = height
+    return widths, heights
+
+
+def _select(world: World, ids: np.ndarray | None, *components: np.ndarray) -> np.ndarray:
+    """Internal function that gets the ids of the living entities where every component is set.
+
+    :param world: The World to read.
+    :type world: World
+    :param ids: The ids to choose from, or None for every entity.
+    :type ids: np.ndarray | None
+    :param components: Boolean components that must be set.
+    :type components: np.ndarray
+    :return: The selected ids.
+    :rtype: np.ndarray
+    """
+
+    if ids is None:
+        mask = world.alive[: world.count]
+        for component in components:
+            mask = mask & component[: world.count]
+        return np.flatnonzero(mask)
+
+    mask = world.alive[ids]
+    for component in components:
+        mask = mask & component[ids]
+    return ids[mask]
+
+
+def _ease(easing_type: EasingFunction, t: np.ndarray) -> np.ndarray:
+    """Internal function that applies an easing function to an array of t values.
+
+    :param easing_type: The easing function.
+    :type easing_type: EasingFunction
+    :param t: The interpolation t values.
+    :type t: np.ndarray
+    :return: The eased t values.
+    :rtype: np.ndarray
+    """
+
+    if easing_type not in _VECTORIZED:
+        _VECTORIZED[easing_type] = np.vectorize(easing_type, otypes=[np.float64])
+    return _VECTORIZED[easing_type](t)
+
+
+def movement_system(world: World, dt: float, ids: np.ndarray | None = None) -> None:
+    """Moves entities horizontally by their x velocity and updates their facing.
+
+    :param world: The World to update.
+    :type world: World
+    :param dt: Delta time.
+    :type dt: float
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    """
+
+    ids = _select(world, ids, world.x_vel != 0)
+    x_vel = world.x_vel[ids]
+    world.xcor[ids] += x_vel * dt
+    world.facing[ids] = np.where(x_vel < 0, FACING_LEFT, FACING_RIGHT)
+
+
+def gravity_system(world: World, dt: float, ids: np.ndarray | None = None) -> None:
+    """Applies gravity and syncs the colliders to the new positions.
+
+    :param world: The World to update.
+    :type world: World
+    :param dt: Delta time.
+    :type dt: float
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    """
+
+    falling = _select(world, ids, world.gravity)
+    world.y_vel[falling] += GRAVITY_ACCELERATION * dt
+    world.ycor[falling] += world.y_vel[falling] * dt
+
+    ids = _select(world, ids)
+    world.on_ground[ids] = False
+    world.collider_x[ids] = world.xcor[ids]
+    world.collider_y[ids] = world.ycor[ids]
+
+
+def tween_system(world: World, dt: float, ids: np.ndarray | None = None) -> None:
+    """Advances the moveto tweens of all moving entities.
+
+    :param world: The World to update.
+    :type world: World
+    :param dt: Delta time.
+    :type dt: float
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    """
+
+    ids = _select(world, ids, world.moving)
+    if not ids.size:
+        return
+
+    world.y_vel[ids] = 0
+    world.elapsed[ids] += dt
+
+    finished = world.elapsed[ids] >= world.duration[ids]
+    done = ids[finished]
+    world.xcor[done] = world.target_x[done]
+    world.ycor[done] = world.target_y[done]
+    world.moving[done] = False
+    world.has_collision[done] = True
+
+    ids = ids[~finished]
+    if not ids.size:
+        return
+
+    t = world.elapsed[ids] / world.duration[ids]
+    eased = np.empty_like(t)
+    easings = world.easing[ids]
+    for easing in np.unique(easings):
+        selected = easings == easing
+        eased[selected] = _ease(world.easings[easing], t[selected])
+
+    world.xcor[ids] = world.start_x[ids] + eased * (world.target_x[ids] - world.start_x[ids])
+    world.ycor[ids] = world.start_y[ids] + eased * (world.target_y[ids] - world.start_y[ids])
+
+
+def _collider_rects(
+    world: World, ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Internal function that gets the whole-pixel collider rects of the entities.
+
+    :param world: The World to read.
+    :type world: World
+    :param ids: The ids of the entities.
+    :type ids: np.ndarray
+    :return: The left, top, width and height of each collider.
+    :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    """
+
+    return (
+        np.trunc(world.collider_x[ids]),
+        np.trunc(world.collider_y[ids]),
+        world.width[ids],
+        world.height[ids],
+    )
+
+
+# pylint: disable=too-many-locals
+def collision_system(world: World, solids: np.ndarray, ids: np.ndarray) -> None:
+    """Pushes the given entities out of the solid rects, the same way as the Player.
+
+    :param world: The World to update.
+    :type world: World
+    :param solids: The solid rects as an (n, 4) array.
+    :type solids: np.ndarray
+    :param ids: The ids of the entities to collide.
+    :type ids: np.ndarray
+    """
+
+    ids = ids[world.has_collision[ids]]
+    if not ids.size:
+        return
+
+    left, top, width, height = _collider_rects(world, ids)
+    coord_x = world.collider_x[ids]
+    coord_y = world.collider_y[ids]
+    facing_right = world.facing[ids] == FACING_RIGHT
+
+    for solid_left, solid_top, solid_width, solid_height in solids:
+        solid_right = solid_left + solid_width
+        solid_bottom = solid_top + solid_height
+
+        hit = (
+            (left < solid_right)
+            & (left + width > solid_left)
+            & (top < solid_bottom)
+            & (top + height > solid_top)
+        )
+        if not hit.any():
+            continue
+
+        clip_width = np.minimum(left + width, solid_right) - np.maximum(left, solid_left)
+        clip_height = np.minimum(top + height, solid_bottom) - np.maximum(top, solid_top)
+        center_x = solid_left + solid_width / 2
+
+        # horizontal collisions (left and right walls)
+        horizontal = hit & (clip_height > clip_width - 3)
+        left_side = horizontal & (coord_x + width > solid_left) & (coord_x + width < center_x)
+        right_side = (
+            horizontal & ~left_side & (coord_x < solid_right) & (coord_x > center_x)
+        )
+        stopped = ids[left_side | right_side]
+        world.moving[stopped] = False
+        world.target_x[stopped] = world.xcor[stopped]
+        world.target_y[stopped] = world.ycor[stopped]
+
+        pushed = left_side & facing_right
+        world.xcor[ids[pushed]] = solid_left - width[pushed]
+        world.xcor[ids[(left_side & ~facing_right) | right_side]] = solid_right
+
+        # vertical collisions (floor and ceiling)
+        vertical = hit & (clip_width - 3 > clip_height)
+        on_top = vertical & (coord_y + height > solid_top) & (coord_y < solid_top)
+        below = (
+            vertical & ~on_top & (coord_y < solid_bottom) & (coord_y + height > solid_bottom)
+        )
+        world.ycor[ids[on_top]] = solid_top - height[on_top]
+        world.ycor[ids[below]] = solid_bottom
+        world.y_vel[ids[on_top | below]] = 0
+        world.on_ground[ids[on_top]] = True
+
+
+def damage(world: World, ids: np.ndarray, dmg: int | float) -> None:
+    """Damages the given entities that have no i-frames left, the same as Player.take_damage.
+
+    :param world: The World to update.
+    :type world: World
+    :param ids: The ids of the entities to damage.
+    :type ids: np.ndarray
+    :param dmg: The amount of damage.
+    :type dmg: int | float
+    """
+
+    ids = ids[world.i_frames[ids] == 0]
+    world.health[ids] = np.maximum(world.health[ids] - dmg, 0)
+    world.i_frames[ids] = 10
+
+    # dead entities are sent to the game over room
+    dead = ids[world.health[ids] == 0]
+    world.xcor[dead] = 800 - world.width[dead] / 2
+    world.ycor[dead] = 540 - world.height[dead]
+    world.grid_x[dead] = 1
+    world.grid_y[dead] = 0
+
+
+HazardCallback = Callable[[int, str, pygame.Rect], None]
+'''Called with the id of an entity, the kind of hazard and its rect when the entity touches it.
+'''
+
+
+# pylint: disable=too-many-arguments
+def hazard_system(
+    world: World,
+    hazards: np.ndarray,
+    dmg: int | float,
+    ids: np.ndarray,
+    kind: str = "hazard",
+    on_hazard: HazardCallback | None = None,
+) -> None:
+    """Knocks back and damages the given entities touching any of the hazard rects.
+
+    :param world: The World to update.
+    :type world: World
+    :param hazards: The hazard rects as an (n, 4) array.
+    :type hazards: np.ndarray
+    :param dmg: The damage dealt by each hazard.
+    :type dmg: int | float
+    :param ids: The ids of the entities to check.
+    :type ids: np.ndarray
+    :param kind: The kind of hazard, passed to on_hazard, e.g. "spike".
+    :type kind: str, optional
+    :param on_hazard: Called for every entity touching a hazard, after it is damaged, the
+        same as Player.on_hazard.
+    :type on_hazard: HazardCallback | None, optional
+    """
+
+    ids = ids[world.has_collision[ids]]
+    if not ids.size:
+        return
+
+    left, top, width, height = _collider_rects(world, ids)
+    for hazard_left, hazard_top, hazard_width, hazard_height in hazards:
+        hit = ids[
+            (left < hazard_left + hazard_width)
+            & (left + width > hazard_left)
+            & (top < hazard_top + hazard_height)
+            & (top + height > hazard_top)
+        ]
+        if hit.size:
+            world.y_vel[hit] = -500
+            damage(world, hit, dmg)
+            if on_hazard is not None:
+                rect = pygame.Rect(hazard_left, hazard_top, hazard_width, hazard_height)
+                for eid in hit:
+                    on_hazard(int(eid), kind, rect)
+
+
+def transition_system(world: World, ids: np.ndarray | None = None) -> np.ndarray:
+    """Moves entities that left their room into the neighbouring room.
+
+    :param world: The World to update.
+    :type world: World
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    :return: The ids of the entities that changed rooms.
+    :rtype: np.ndarray
+    """
+
+    ids = _select(world, ids)
+    coord_x = world.collider_x[ids]
+    coord_y = world.collider_y[ids]
+    width = world.width[ids]
+    height = world.height[ids]
+
+    room_width, room_height = _room_sizes(world.grid_x[ids], world.grid_y[ids])
+
+    # the checks are exclusive and in the same order as in Player.update_
+    right = coord_x + width > room_width + width
+    left = ~right & (coord_x < -width)
+    up = ~(right | left) & (coord_y < -width)
+    down = ~(right | left | up) & (coord_y + height > room_height + width)
+
+    world.xcor[ids[right]] = 0
+    world.grid_x[ids[right]] += 1
+    world.grid_x[ids[left]] -= 1
+    world.grid_y[ids[up]] -= 1
+    world.ycor[ids[down]] = 0
+    world.grid_y[ids[down]] += 1
+
+    # entering from the right or the bottom depends on the size of the new room
+    if left.any() or up.any():
+        room_width, room_height = _room_sizes(world.grid_x[ids], world.grid_y[ids])
+        world.xcor[ids[left]] = room_width[left] - width[left]
+        world.ycor[ids[up]] = room_height[up] - 100 - height[up]
+
+    moved = ids[right | left | up | down]
+    world.moving[moved] = False
+    return moved
+
+
+def i_frame_system(world: World, ids: np.ndarray | None = None, frames: int = 1) -> None:
+    """Counts down the i-frames of every entity.
+
+    :param world: The World to update.
+    :type world: World
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    :param frames: The number of frames to count down by.
+    :type frames: int, optional
+    """
+
+    if ids is None and frames == 1:
+        i_frames = world.i_frames[: world.count]
+        i_frames[world.alive[: world.count] & (i_frames > 0)] -= 1
+        return
+
+    ids = _select(world, ids)
+    world.i_frames[ids] = np.maximum(world.i_frames[ids] - frames, 0)
+
+
+def step(
+    world: World,
+    dt: float,
+    ids: np.ndarray | None = None,
+    frames: int = 1,
+    on_hazard: HazardCallback | None = None,
+    colliders: ColliderLookup = colliders_for,
+) -> np.ndarray:
+    """Runs one frame of every system on the World.
+
+    Entities are grouped by room, so each room's colliders are only
+    checked against the entities inside it.
+
+    :param world: The World to update.
+    :type world: World
+    :param dt: Delta time.
+    :type dt: float
+    :param ids: The ids of the entities to update, or None for every entity.
+    :type ids: np.ndarray | None, optional
+    :param frames: The number of frames dt stands for, which i-frames count down by, or 0
+        when something else counts them down, like the Player's timers.
+    :type frames: int, optional
+    :param on_hazard: Called for every entity touching a spike or lava.
+    :type on_hazard: HazardCallback | None, optional
+    :param colliders: Gets the colliders of each room with entities in it.
+    :type colliders: ColliderLookup, optional
+    :return: The ids of the entities that changed rooms.
+    :rtype: np.ndarray
+    """
+
+    movement_system(world, dt, ids)
+    gravity_system(world, dt, ids)
+    tween_system(world, dt, ids)
+
+    ids = _select(world, ids)
+    rooms, room_of = np.unique(
+        np.stack((world.grid_x[ids], world.grid_y[ids]), axis=1), axis=0, return_inverse=True
+    )
+    for index, (grid_x, grid_y) in enumerate(rooms):
+        room = colliders((int(grid_x), int(grid_y)))
+        if room is None:
+            continue
+
+        in_room = ids[room_of.reshape(-1) == index]
+        collision_system(world, room.platforms, in_room)
+        hazard_system(world, room.spikes, 1, in_room, "spike", on_hazard)
+        hazard_system(world, room.lavas, 5, in_room, "lava", on_hazard)
+
+    moved = transition_system(world, ids)
+    if frames:
+        i_frame_system(world, ids, frames)
+    return moved
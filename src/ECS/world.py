@@ -0,0 +1,368 @@
+"""ECS.world.py
+
+Module containing the World, which stores the components of every
+entity in one NumPy array per field.
+
+An entity is just an index into those arrays, so systems can process
+every entity at once instead of calling methods on one object at a time.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..Internal import Hitbox, check_type, interp
+from ..Internal.hitboxes import EasingFunction
+from ..Stages import grid_to_stage
+
+# component name -> the fields of the World that store it
+COMPONENTS: Dict[str, Tuple[str, ...]] = {
+    "position": ("xcor", "ycor"),
+    "velocity": ("x_vel", "y_vel"),
+    "collider": (
+        "width",
+        "height",
+        "has_collision",
+        "on_ground",
+        "gravity",
+        "collider_x",
+        "collider_y",
+    ),
+    "facing": ("facing",),
+    "health": ("health", "max_health"),
+    "i_frames": ("i_frames",),
+    "grid": ("grid_x", "grid_y"),
+    "tween": (
+        "moving",
+        "start_x",
+        "start_y",
+        "target_x",
+        "target_y",
+        "duration",
+        "elapsed",
+        "easing",
+    ),
+}
+
+FACING_LEFT = -1
+'''Value of the facing component for entities facing left.
+'''
+FACING_RIGHT = 1
+'''Value of the facing component for entities facing right.
+'''
+
+
+# pylint: disable=too-many-instance-attributes
+class World:
+    """Structure-of-arrays storage for every entity in the game."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        """Initializer for a World object.
+
+        :param capacity: The number of entities to allocate space for. Grows as needed.
+        :type capacity: int, optional
+        """
+
+        check_type(capacity, int)
+
+        self.capacity: int = max(capacity, 1)
+        # one past the highest entity id ever used
+        self.count: int = 0
+        self.alive: np.ndarray = self._zeros(np.bool_)
+        self._free: List[int] = []
+
+        # position and velocity
+        self.xcor: np.ndarray = self._zeros(np.float64)
+        self.ycor: np.ndarray = self._zeros(np.float64)
+        self.x_vel: np.ndarray = self._zeros(np.float64)
+        self.y_vel: np.ndarray = self._zeros(np.float64)
+
+        # collider, with the position it was last synced at used for collision checks
+        self.width: np.ndarray = self._zeros(np.float64)
+        self.height: np.ndarray = self._zeros(np.float64)
+        self.has_collision: np.ndarray = self._zeros(np.bool_)
+        self.on_ground: np.ndarray = self._zeros(np.bool_)
+        self.gravity: np.ndarray = self._zeros(np.bool_)
+        self.collider_x: np.ndarray = self._zeros(np.float64)
+        self.collider_y: np.ndarray = self._zeros(np.float64)
+        self.facing: np.ndarray = self._zeros(np.int8)
+
+        # health, i-frames and the grid location of the room the entity is in
+        self.health: np.ndarray = self._zeros(np.float64)
+        self.max_health: np.ndarray = self._zeros(np.float64)
+        self.i_frames: np.ndarray = self._zeros(np.int32)
+        self.grid_x: np.ndarray = self._zeros(np.int32)
+        self.grid_y: np.ndarray = self._zeros(np.int32)
+
+        # moveto tweens, the same as InterpolationData
+        self.moving: np.ndarray = self._zeros(np.bool_)
+        self.start_x: np.ndarray = self._zeros(np.float64)
+        self.start_y: np.ndarray = self._zeros(np.float64)
+        self.target_x: np.ndarray = self._zeros(np.float64)
+        self.target_y: np.ndarray = self._zeros(np.float64)
+        self.duration: np.ndarray = self._zeros(np.float64)
+        self.elapsed: np.ndarray = self._zeros(np.float64)
+        self.easing: np.ndarray = self._zeros(np.int16)
+
+        # easing functions used by tweens, referenced by their index
+        self.easings: List[EasingFunction] = [interp.linear]
+
+    def __len__(self) -> int:
+        """Returns the number of living entities.
+
+        :return: The number of living entities.
+        :rtype: int
+        """
+
+        return int(np.count_nonzero(self.alive[: self.count]))
+
+    def _zeros(self, dtype: type) -> np.ndarray:
+        """Internal method that allocates a zeroed component array.
+
+        :param dtype: The dtype of the array.
+        :type dtype: type
+        :return: The allocated array.
+        :rtype: np.ndarray
+        """
+
+        return np.zeros(self.capacity, dtype)
+
+    def _grow(self) -> None:
+        """Internal method that doubles the capacity of every component array."""
+
+        new_capacity = self.capacity * 2
+        for field in sum(COMPONENTS.values(), ("alive",)):
+            old = getattr(self, field)
+            new = np.zeros(new_capacity, old.dtype)
+            new[: self.capacity] = old
+            setattr(self, field, new)
+
+        self.capacity = new_capacity
+
+    def spawn(
+        self,
+        xcor: int | float,
+        ycor: int | float,
+        width: int | float,
+        height: int | float,
+        health: int | float = 1,
+        max_health: int | float | None = None,
+        has_collision: bool = True,
+        gravity: bool = True,
+        grid: Tuple[int, int] = (1, 1),
+    ) -> int:
+        """Creates a new entity.
+
+        :param xcor: The x position of the entity.
+        :type xcor: int | float
+        :param ycor: The y position of the entity.
+        :type ycor: int | float
+        :param width: The width of the entity.
+        :type width: int | float
+        :param height: The height of the entity.
+        :type height: int | float
+        :param health: The health of the entity.
+        :type health: int | float, optional
+        :param max_health: The maximum health of the entity, defaults to health.
+        :type max_health: int | float | None, optional
+        :param has_collision: Whether the entity has collision.
+        :type has_collision: bool, optional
+        :param gravity: Whether the entity is affected by gravity.
+        :type gravity: bool, optional
+        :param grid: The grid location of the room the entity is in.
+        :type grid: Tuple[int, int], optional
+        :return: The id of the new entity.
+        :rtype: int
+        """
+
+        check_type(xcor, int, float)
+        check_type(ycor, int, float)
+        check_type(width, int, float)
+        check_type(height, int, float)
+
+        if self._free:
+            eid = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow()
+            eid = self.count
+            self.count += 1
+
+        for fields in COMPONENTS.values():
+            for field in fields:
+                getattr(self, field)[eid] = 0
+
+        self.alive[eid] = True
+        self.xcor[eid] = xcor
+        self.ycor[eid] = ycor
+        self.collider_x[eid] = xcor
+        self.collider_y[eid] = ycor
+        # colliders are whole pixels, the same as the pygame.Rect of a Hitbox
+        self.width[eid] = int(width)
+        self.height[eid] = int(height)
+        self.has_collision[eid] = has_collision
+        self.gravity[eid] = gravity
+        self.facing[eid] = FACING_RIGHT
+        self.health[eid] = health
+        self.max_health[eid] = health if max_health is None else max_health
+        self.grid_x[eid], self.grid_y[eid] = grid
+
+        return eid
+
+    def despawn(self, eid: int) -> None:
+        """Removes an entity. Its id may be reused by later spawns.
+
+        :param eid: The id of the entity.
+        :type eid: int
+        """
+
+        if not self.alive[eid]:
+            raise KeyError(f"Entity {eid} does not exist.")
+
+        self.alive[eid] = False
+        self._free.append(eid)
+
+    def easing_index(self, easing_type: EasingFunction) -> int:
+        """Gets the index of an easing function, registering it if it is new.
+
+        :param easing_type: The easing function.
+        :type easing_type: EasingFunction
+        :return: The index of the easing function.
+        :rtype: int
+        """
+
+        if easing_type not in self.easings:
+            self.easings.append(easing_type)
+        return self.easings.index(easing_type)
+
+    def moveto(
+        self,
+        eid: int,
+        xcor: int | float,
+        ycor: int | float,
+        duration: int | float,
+        easing_type: EasingFunction,
+        disable_collision: bool = True,
+    ) -> None:
+        """Starts moving an entity to the given coordinates, the same as Hitbox.moveto.
+
+        :param eid: The id of the entity.
+        :type eid: int
+        :param xcor: The x-coordinate of the destination.
+        :type xcor: int | float
+        :param ycor: The y-coordinate of the destination.
+        :type ycor: int | float
+        :param duration: The duration of the movement in seconds.
+        :type duration: int | float
+        :param easing_type: The easing function to use.
+        :type easing_type: EasingFunction
+        :param disable_collision: Whether to disable collision of the moving entity.
+        :type disable_collision: bool, optional
+        """
+
+        if disable_collision:
+            self.has_collision[eid] = False
+
+        self.start_x[eid] = self.xcor[eid]
+        self.start_y[eid] = self.ycor[eid]
+        self.target_x[eid] = xcor
+        self.target_y[eid] = ycor
+        self.duration[eid] = duration
+        self.elapsed[eid] = 0
+        self.easing[eid] = self.easing_index(easing_type)
+        self.moving[eid] = True
+
+    # player interop
+
+    def spawn_hitbox(self, hitbox: Hitbox) -> int:
+        """Creates an entity with the state of the given Hitbox, such as the Player.
+
+        :param hitbox: The Hitbox to copy.
+        :type hitbox: Hitbox
+        :return: The id of the new entity.
+        :rtype: int
+        """
+
+        check_type(hitbox, Hitbox)
+
+        eid = self.spawn(hitbox.xcor, hitbox.ycor, hitbox.width, hitbox.height)
+        self.read(eid, hitbox)
+        return eid
+
+    def read(self, eid: int, hitbox: Hitbox) -> None:
+        """Copies the state of a Hitbox into an entity.
+
+        Attributes the Hitbox does not have, such as health on a Platform,
+        are left unchanged.
+
+        :param eid: The id of the entity.
+        :type eid: int
+        :param hitbox: The Hitbox to copy from.
+        :type hitbox: Hitbox
+        """
+
+        self.xcor[eid] = hitbox.xcor
+        self.ycor[eid] = hitbox.ycor
+        self.y_vel[eid] = hitbox.y_vel
+        self.has_collision[eid] = hitbox.has_collision
+
+        data = hitbox.interp_data
+        self.moving[eid] = data.moving
+        self.start_x[eid], self.start_y[eid] = data.initial_pos
+        self.target_x[eid], self.target_y[eid] = data.target_pos
+        self.duration[eid] = data.duration
+        self.elapsed[eid] = data.elapsed_time
+        self.easing[eid] = self.easing_index(data.easing_type)
+
+        for attr in ("on_ground", "health", "max_health", "i_frames"):
+            if hasattr(hitbox, attr):
+                getattr(self, attr)[eid] = getattr(hitbox, attr)
+        if hasattr(hitbox, "facing_left"):
+            self.facing[eid] = FACING_LEFT if hitbox.facing_left else FACING_RIGHT
+        if hasattr(hitbox, "grid_xcor"):
+            self.grid_x[eid], self.grid_y[eid] = hitbox.grid_xcor, hitbox.grid_ycor
+
+    def write(self, eid: int, hitbox: Hitbox) -> None:
+        """Copies the state of an entity back into a Hitbox.
+
+        :param eid: The id of the entity.
+        :type eid: int
+        :param hitbox: The Hitbox to copy to.
+        :type hitbox: Hitbox
+        """
+
+        hitbox.xcor = float(self.xcor[eid])
+        hitbox.ycor = float(self.ycor[eid])
+        hitbox.y_vel = float(self.y_vel[eid])
+        hitbox.has_collision = bool(self.has_collision[eid])
+
+        data = hitbox.interp_data
+        data.moving = bool(self.moving[eid])
+        data.initial_pos = (float(self.start_x[eid]), float(self.start_y[eid]))
+        data.target_pos = (float(self.target_x[eid]), float(self.target_y[eid]))
+        data.duration = float(self.duration[eid])
+        data.elapsed_time = float(self.elapsed[eid])
+        data.easing_type = self.easings[self.easing[eid]]
+
+        # pylint: disable=attribute-defined-outside-init
+        hitbox.topleft = (int(self.collider_x[eid]), int(self.collider_y[eid]))
+        # pylint: enable=attribute-defined-outside-init
+        hitbox.coords.update(float(self.collider_x[eid]), float(self.collider_y[eid]))
+
+        if hasattr(hitbox, "on_ground"):
+            hitbox.on_ground = bool(self.on_ground[eid])
+        if hasattr(hitbox, "health"):
+            # keep whole-number health as an int, the same as the Player sets it
+            health = float(self.health[eid])
+            hitbox.health = int(health) if health.is_integer() else health
+            # the Player's i-frames are a timer, so it is only restarted when they changed
+            i_frames = int(self.i_frames[eid])
+            if hitbox.i_frames != i_frames:
+                hitbox.i_frames = i_frames
+        if hasattr(hitbox, "facing_left"):
+            hitbox.facing_left = self.facing[eid] == FACING_LEFT
+            hitbox.facing_right = not hitbox.facing_left
+        if hasattr(hitbox, "grid_xcor"):
+            hitbox.grid_xcor = int(self.grid_x[eid])
+            hitbox.grid_ycor = int(self.grid_y[eid])
+            hitbox.stage = grid_to_stage((hitbox.grid_xcor, hitbox.grid_ycor))
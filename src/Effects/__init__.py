@@ -0,0 +1,15 @@
+"""Effects
+
+The Effects package contains the particle system and the
+emitters that spawn particles for the stage and the player.
+"""
+
+from .emitters import (
+    LavaEmitter,
+    burst,
+    dash_burst,
+    dash_trail,
+    hazard_burst,
+    stage_emitters,
+)
+from .particles import ParticleSystem
@@ -0,0 +1,194 @@
+"""Effects.emitters.py
+
+Module containing the emitters that spawn particles for stage
+objects and player actions.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pygame
+
+from ..Internal import Hitbox, check_type
+from ..Level import Group, Lava
+from .particles import ParticleSystem
+
+LAVA_COLORS: Tuple[Tuple[int, int, int], ...] = ((255, 90, 0), (255, 170, 0), (255, 40, 0))
+'''The colors of the embers that rise from lava.
+'''
+SPIKE_COLOR: Tuple[int, int, int] = (230, 230, 230)
+'''The color of the sparks from hitting a spike.
+'''
+
+
+class LavaEmitter:
+    """Emits embers from the surface of a Lava object."""
+
+    def __init__(self, lava: Lava, rate: float = 0.2) -> None:
+        """Initializer for a LavaEmitter object.
+
+        :param lava: The lava to emit from.
+        :type lava: Lava
+        :param rate: The number of embers per second for each pixel of lava surface.
+        :type rate: float, optional
+        """
+
+        check_type(lava, Lava)
+        check_type(rate, int, float)
+
+        self.lava: Lava = lava
+        self.rate: float = rate
+
+        # embers owed from previous frames, so low rates still emit
+        self._pending: float = 0
+
+    def update(self, system: ParticleSystem, dt: float) -> None:
+        """Emits the embers for one frame.
+
+        :param system: The particle system to emit into.
+        :type system: ParticleSystem
+        :param dt: Delta time.
+        :type dt: float
+        """
+
+        self._pending += self.rate * self.lava.width * dt
+        count = int(self._pending)
+        if not count:
+            return
+        self._pending -= count
+
+        rng = system.rng
+        pos = np.empty((count, 2), np.float32)
+        pos[:, 0] = rng.uniform(self.lava.left, self.lava.right, count)
+        pos[:, 1] = self.lava.top
+        vel = np.empty((count, 2), np.float32)
+        vel[:, 0] = rng.normal(0, 20, count)
+        vel[:, 1] = rng.uniform(-160, -60, count)
+
+        color = LAVA_COLORS[int(rng.integers(len(LAVA_COLORS)))]
+        system.emit(count, pos, vel, rng.uniform(0.4, 1.0, count), color, gravity=0.2, drag=1)
+
+
+def stage_emitters(lavas: Group | None, rate: float = 0.2) -> List[LavaEmitter]:
+    """Creates the emitters for the lava of a stage.
+
+    :param lavas: The Lava objects of the stage.
+    :type lavas: Group | None
+    :param rate: The number of embers per second for each pixel of lava surface.
+    :type rate: float, optional
+    :return: One emitter for each lava.
+    :rtype: List[LavaEmitter]
+    """
+
+    if lavas is None:
+        return []
+    return [LavaEmitter(lava, rate) for lava in lavas]
+
+
+def burst(  # pylint: disable=too-many-arguments
+    system: ParticleSystem,
+    rect: pygame.Rect,
+    count: int,
+    speed: float,
+    life: float,
+    color: Tuple[int, int, int],
+    gravity: float = 1,
+) -> int:
+    """Emits particles in every direction from random points in a rect.
+
+    :param system: The particle system to emit into.
+    :type system: ParticleSystem
+    :param rect: The area the particles start in.
+    :type rect: pygame.Rect
+    :param count: The number of particles.
+    :type count: int
+    :param speed: The largest starting speed of the particles.
+    :type speed: float
+    :param life: The longest lifetime of the particles in seconds.
+    :type life: float
+    :param color: The color of the particles.
+    :type color: Tuple[int, int, int]
+    :param gravity: The multiplier of gravity on the particles.
+    :type gravity: float, optional
+    :return: The number of particles emitted.
+    :rtype: int
+    """
+
+    rng = system.rng
+    pos = np.empty((count, 2), np.float32)
+    pos[:, 0] = rng.uniform(rect.left, rect.right, count)
+    pos[:, 1] = rng.uniform(rect.top, rect.bottom, count)
+
+    angles = rng.uniform(0, 2 * np.pi, count)
+    speeds = rng.uniform(speed / 4, speed, count)
+    vel = np.empty((count, 2), np.float32)
+    vel[:, 0] = np.cos(angles) * speeds
+    vel[:, 1] = np.sin(angles) * speeds
+
+    return system.emit(
+        count, pos, vel, rng.uniform(life / 2, life, count), color, gravity=gravity, drag=2
+    )
+
+
+def hazard_burst(system: ParticleSystem, kind: str, rect: pygame.Rect) -> int:
+    """Emits the particles for the player touching a hazard. Used as Player.on_hazard.
+
+    :param system: The particle system to emit into.
+    :type system: ParticleSystem
+    :param kind: The kind of hazard, "spike" or "lava".
+    :type kind: str
+    :param rect: The rect of the hazard.
+    :type rect: pygame.Rect
+    :return: The number of particles emitted.
+    :rtype: int
+    """
+
+    # sparks fly from the tip of the spike, lava splashes from its surface
+    if kind == "spike":
+        return burst(
+            system, pygame.Rect(rect.centerx - 4, rect.top, 8, 8), 40, 400, 0.4, SPIKE_COLOR
+        )
+    return burst(
+        system, pygame.Rect(rect.left, rect.top, rect.width, 4), 80, 350, 0.6, LAVA_COLORS[0]
+    )
+
+
+def dash_burst(system: ParticleSystem, plr: Hitbox) -> int:
+    """Emits a puff of particles behind a player that starts dashing. Used as Controls.on_dash.
+
+    :param system: The particle system to emit into.
+    :type system: ParticleSystem
+    :param plr: The dashing player.
+    :type plr: Hitbox
+    :return: The number of particles emitted.
+    :rtype: int
+    """
+
+    return burst(system, pygame.Rect(plr), 60, 250, 0.35, plr.color, gravity=0)
+
+
+def dash_trail(system: ParticleSystem, plr: Hitbox, dt: float, rate: float = 600) -> int:
+    """Emits a trail of particles behind a player while it is dashing.
+
+    :param system: The particle system to emit into.
+    :type system: ParticleSystem
+    :param plr: The player.
+    :type plr: Hitbox
+    :param dt: Delta time.
+    :type dt: float
+    :param rate: The number of particles per second.
+    :type rate: float, optional
+    :return: The number of particles emitted.
+    :rtype: int
+    """
+
+    if not plr.interp_data.moving:
+        return 0
+
+    count = max(1, round(rate * dt))
+    rng = system.rng
+    pos = np.empty((count, 2), np.float32)
+    pos[:, 0] = rng.uniform(plr.left, plr.right, count)
+    pos[:, 1] = rng.uniform(plr.top, plr.bottom, count)
+
+    return system.emit(count, pos, (0, 0), rng.uniform(0.1, 0.3, count), plr.color, gravity=0)
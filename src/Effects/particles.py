@@ -0,0 +1,279 @@
+"""Effects.particles.py
+
+Module containing the particle system.
+
+Particles are stored in NumPy arrays instead of one object each, kept
+packed at the front of the arrays, and updated with a few vectorized
+operations per frame. They are drawn as small cached sprites with one
+Surface.blits call, so tens of thousands of particles stay cheap.
+"""
+
+import functools
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pygame
+
+from ..Internal import (
+    GRAVITY_ACCELERATION,
+    MAX_PARTICLES,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    check_type,
+)
+from ..Render import LAYER_EFFECTS, RenderQueue, scaled_sprite
+
+FADE_STEPS = 4
+'''The number of transparency steps particles fade out through.
+'''
+
+
+class ParticleSystem:  # pylint: disable=too-many-instance-attributes
+    """A fixed-capacity pool of particles updated and drawn in batches."""
+
+    def __init__(
+        self, capacity: int = MAX_PARTICLES, size: int = 4, seed: int | None = None
+    ) -> None:
+        """Initializer for a ParticleSystem object.
+
+        :param capacity: The maximum number of live particles. New particles are dropped when full.
+        :type capacity: int, optional
+        :param size: The width and height of a particle in pixels.
+        :type size: int, optional
+        :param seed: The seed of the random number generator used by emitters.
+        :type seed: int | None, optional
+        """
+
+        check_type(capacity, int)
+        check_type(size, int)
+
+        self.capacity: int = capacity
+        self.size: int = size
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # live particles are always packed into [0, count)
+        self.count: int = 0
+        self.pos: np.ndarray = np.zeros((capacity, 2), np.float32)
+        self.vel: np.ndarray = np.zeros((capacity, 2), np.float32)
+        self.life: np.ndarray = np.zeros(capacity, np.float32)
+        self.max_life: np.ndarray = np.ones(capacity, np.float32)
+        # multiplier of GRAVITY_ACCELERATION, negative to float upwards
+        self.gravity: np.ndarray = np.zeros(capacity, np.float32)
+        # fraction of velocity lost per second
+        self.drag: np.ndarray = np.zeros(capacity, np.float32)
+        # index into palette
+        self.color: np.ndarray = np.zeros(capacity, np.uint8)
+
+        self.palette: List[Tuple[int, int, int]] = []
+        self._palette_index: Dict[Tuple[int, int, int], int] = {}
+        self._sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        """Gets the number of live particles.
+
+        :return: The number of live particles.
+        :rtype: int
+        """
+
+        return self.count
+
+    def color_index(self, color: Tuple[int, int, int]) -> int:
+        """Gets the palette index of a color, adding it to the palette if needed.
+
+        :param color: The color.
+        :type color: Tuple[int, int, int]
+        :return: The index of the color.
+        :rtype: int
+        """
+
+        color = tuple(color)
+        if color not in self._palette_index:
+            if len(self.palette) == 256:
+                raise ValueError("A ParticleSystem can only have 256 colors.")
+            self._palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        return self._palette_index[color]
+
+    def emit(  # pylint: disable=too-many-arguments
+        self,
+        count: int,
+        pos: Tuple[float, float] | np.ndarray,
+        vel: Tuple[float, float] | np.ndarray,
+        life: float | np.ndarray,
+        color: Tuple[int, int, int],
+        gravity: float = 1,
+        drag: float = 0,
+    ) -> int:
+        """Spawns particles.
+
+        :param count: The number of particles to spawn.
+        :type count: int
+        :param pos: The position of every particle, or an array of one position each.
+        :type pos: Tuple[float, float] | np.ndarray
+        :param vel: The velocity of every particle, or an array of one velocity each.
+        :type vel: Tuple[float, float] | np.ndarray
+        :param life: The lifetime in seconds, or an array of one lifetime each.
+        :type life: float | np.ndarray
+        :param color: The color of the particles.
+        :type color: Tuple[int, int, int]
+        :param gravity: The multiplier of gravity on the particles.
+        :type gravity: float, optional
+        :param drag: The fraction of velocity the particles lose per second.
+        :type drag: float, optional
+        :return: The number of particles spawned, less than count if the pool is full.
+        :rtype: int
+        """
+
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return 0
+
+        # arrays of one value per particle are cut to the particles that fit
+        if isinstance(pos, np.ndarray) and pos.ndim == 2:
+            pos = pos[:count]
+        if isinstance(vel, np.ndarray) and vel.ndim == 2:
+            vel = vel[:count]
+        if isinstance(life, np.ndarray) and life.ndim == 1:
+            life = life[:count]
+
+        new = slice(self.count, self.count + count)
+        self.pos[new] = pos
+        self.vel[new] = vel
+        self.life[new] = life
+        self.max_life[new] = self.life[new]
+        self.gravity[new] = gravity
+        self.drag[new] = drag
+        self.color[new] = self.color_index(color)
+
+        self.count += count
+        return count
+
+    def clear(self) -> None:
+        """Removes every particle."""
+
+        self.count = 0
+
+    def update(self, dt: float) -> None:
+        """Moves the particles one frame and removes the ones that died.
+
+        :param dt: Delta time.
+        :type dt: float
+        """
+
+        count = self.count
+        if not count:
+            return
+
+        vel = self.vel[:count]
+        vel[:, 1] += self.gravity[:count] * (GRAVITY_ACCELERATION * dt)
+        vel *= np.maximum(0, 1 - self.drag[:count] * dt)[:, None]
+        self.pos[:count] += vel * dt
+        self.life[:count] -= dt
+
+        alive = self.life[:count] > 0
+        if alive.all():
+            return
+
+        # pack the live particles back to the front of the arrays
+        alive_count = int(np.count_nonzero(alive))
+        for array in (
+            self.pos,
+            self.vel,
+            self.life,
+            self.max_life,
+            self.gravity,
+            self.drag,
+            self.color,
+        ):
+            array[:alive_count] = array[:count][alive]
+        self.count = alive_count
+
+    def sprite(self, color: int, fade: int) -> pygame.Surface:
+        """Gets the cached sprite for a palette color and fade step.
+
+        :param color: The palette index of the color.
+        :type color: int
+        :param fade: The fade step, 0 being the most faded.
+        :type fade: int
+        :return: The sprite.
+        :rtype: pygame.Surface
+        """
+
+        key = (color, fade)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((self.size, self.size))
+            sprite.fill(self.palette[color])
+            sprite.set_alpha(255 * (fade + 1) // FADE_STEPS)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            self._sprites[key] = sprite
+        return sprite
+
+    def queue(
+        self,
+        render_queue: RenderQueue,
+        offset: Tuple[int, int] = (0, 0),
+        layer: int = LAYER_EFFECTS,
+    ) -> None:
+        """Queues every particle to be drawn with one batched blit.
+
+        The positions are copied, so the particles can keep updating while a
+        render thread draws the queue.
+
+        :param render_queue: The queue to draw with.
+        :type render_queue: RenderQueue
+        :param offset: The amount to shift the particles by, from the camera.
+        :type offset: Tuple[int, int], optional
+        :param layer: The layer to draw the particles on.
+        :type layer: int, optional
+        """
+
+        count = self.count
+        if not count:
+            return
+
+        positions = (self.pos[:count] + offset).astype(np.int32)
+        fades = np.minimum(
+            (self.life[:count] / self.max_life[:count] * FADE_STEPS).astype(np.int32),
+            FADE_STEPS - 1,
+        )
+        # one sprite index per particle, decoded in _draw
+        kinds = self.color[:count].astype(np.int32) * FADE_STEPS + fades
+
+        # skip the particles outside the screen
+        visible = (
+            (positions[:, 0] > -self.size)
+            & (positions[:, 0] < SCREEN_WIDTH)
+            & (positions[:, 1] > -self.size)
+            & (positions[:, 1] < SCREEN_HEIGHT)
+        )
+        if not visible.all():
+            positions = positions[visible]
+            kinds = kinds[visible]
+
+        render_queue.call(functools.partial(self._draw, positions, kinds), layer)
+
+    def _draw(
+        self, positions: np.ndarray, kinds: np.ndarray, surface: pygame.Surface, scale: float = 1
+    ) -> None:
+        """Internal method that blits a copied set of particles onto the surface.
+
+        :param positions: The screen positions of the particles.
+        :type positions: np.ndarray
+        :param kinds: The sprite index of each particle, color * FADE_STEPS + fade.
+        :type kinds: np.ndarray
+        :param surface: The surface to draw on.
+        :type surface: pygame.Surface
+        :param scale: The render scale of the surface.
+        :type scale: float, optional
+        """
+
+        if scale != 1:
+            positions = np.rint(positions * scale).astype(np.int32)
+
+        sprites = [
+            scaled_sprite(self.sprite(kind // FADE_STEPS, kind % FADE_STEPS), scale)
+            for kind in range(len(self.palette) * FADE_STEPS)
+        ]
+        surface.blits(zip(map(sprites.__getitem__, kinds.tolist()), positions.tolist()), False)
@@ -1,7 +1,9 @@
 """GUI
 
 GUI is a collection of GUI related functionality such as
-the player healthbar.
+the player healthbar, the retained-mode HUD and the world map.
 """
 
+from .hud import HUD, Widget
+from .minimap import THUMBNAIL_VERSION, WorldMap, render_thumbnail, stage_key
 from .player_ui import HealthBar
@@ -0,0 +1,173 @@
+"""GUI.hud.py
+
+hud contains the retained-mode HUD. Widgets keep a cached
+surface and only re-render it when one of the values they
+watch changes, so drawing an unchanged HUD is just a blit
+per widget.
+"""
+
+from typing import Any, Callable, Dict, List
+
+import pygame
+
+from ..Internal import check_type
+from ..Render import LAYER_HUD, RenderQueue
+
+
+class Widget:
+    """Base class for HUD widgets with a cached surface."""
+
+    def __init__(self, xcor: int | float, ycor: int | float, width: int, height: int) -> None:
+        """Initializer for a Widget object.
+
+        :param xcor: The x-coordinate of the Widget.
+        :type xcor: int | float
+        :param ycor: The y-coordinate of the Widget.
+        :type ycor: int | float
+        :param width: The width of the Widget.
+        :type width: int
+        :param height: The height of the Widget.
+        :type height: int
+        """
+
+        check_type(width, int)
+        check_type(height, int)
+
+        self.rect: pygame.Rect = pygame.Rect(xcor, ycor, width, height)
+        self.surface: pygame.Surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.visible: bool = True
+
+        # name -> function that gets the current value
+        self._sources: Dict[str, Callable[[], Any]] = {}
+        # the values the cached surface was rendered with
+        self.values: Dict[str, Any] = {}
+        self._stale: bool = True
+
+    def watch(self, name: str, source: Callable[[], Any]) -> None:
+        """Subscribes the Widget to a value. The Widget re-renders when it changes.
+
+        :param name: The name of the value, used as its key in values.
+        :type name: str
+        :param source: Function that gets the current value.
+        :type source: Callable[[], Any]
+        """
+
+        check_type(name, str)
+
+        self._sources[name] = source
+        self._stale = True
+
+    def invalidate(self) -> None:
+        """Forces the Widget to re-render on the next poll."""
+
+        self._stale = True
+
+    def poll(self) -> bool:
+        """Checks the watched values and re-renders the cached surface if any changed.
+
+        :return: Whether the Widget was re-rendered.
+        :rtype: bool
+        """
+
+        changed = self._stale
+        for name, source in self._sources.items():
+            value = source()
+            if not changed and self.values.get(name) != value:
+                changed = True
+            self.values[name] = value
+
+        if changed:
+            self._stale = False
+            # render into a new surface, the old one may still be queued on the render thread
+            self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            self.render(self.surface)
+        return changed
+
+    def render(self, surface: pygame.Surface) -> None:
+        """Renders the Widget onto its cached surface. Overridden by subclasses.
+
+        :param surface: The cached surface, empty before each render.
+        :type surface: pygame.Surface
+        """
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draws the cached surface onto the screen.
+
+        :param screen: The screen to draw on.
+        :type screen: pygame.Surface
+        """
+
+        if self.visible:
+            screen.blit(self.surface, self.rect)
+
+
+class HUD:
+    """Collection of widgets drawn on top of the stage."""
+
+    def __init__(self) -> None:
+        """Initializer for a HUD object."""
+
+        self.widgets: List[Widget] = []
+        # the rects of the widgets that changed in the last update
+        self.dirty: List[pygame.Rect] = []
+
+    def add(self, widget: Widget) -> Widget:
+        """Adds a widget to the HUD. Widgets added later are drawn on top.
+
+        :param widget: The widget to add.
+        :type widget: Widget
+        :return: The widget.
+        :rtype: Widget
+        """
+
+        check_type(widget, Widget)
+
+        self.widgets.append(widget)
+        return widget
+
+    def remove(self, widget: Widget) -> None:
+        """Removes a widget from the HUD.
+
+        :param widget: The widget to remove.
+        :type widget: Widget
+        """
+
+        self.widgets.remove(widget)
+        self.dirty.append(widget.rect.copy())
+
+    def update(self) -> List[pygame.Rect]:
+        """Polls every widget and re-renders the ones whose values changed.
+
+        :return: The rects of the screen that need to be presented again.
+        :rtype: List[pygame.Rect]
+        """
+
+        dirty = self.dirty
+        self.dirty = []
+        for widget in self.widgets:
+            if widget.poll():
+                dirty.append(widget.rect.copy())
+        return dirty
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draws every widget onto the screen.
+
+        :param screen: The screen to draw on.
+        :type screen: pygame.Surface
+        """
+
+        for widget in self.widgets:
+            widget.draw(screen)
+
+    def queue(self, render_queue: RenderQueue, layer: int = LAYER_HUD) -> None:
+        """Queues every visible widget to be drawn.
+
+        :param render_queue: The queue to add the widgets to.
+        :type render_queue: RenderQueue
+        :param layer: The layer to draw the widgets on.
+        :type layer: int, optional
+        """
+
+        for widget in self.widgets:
+            if widget.visible:
+                render_queue.sprite(widget.surface, widget.rect.topleft, layer)
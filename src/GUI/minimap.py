@@ -0,0 +1,290 @@
+"""GUI.minimap.py
+
+minimap contains the world map, which shows every stage at its grid
+location.
+
+Each stage is drawn as a small thumbnail of its platforms, spikes and
+lava on a worker thread, and the thumbnails are kept on disk under a
+hash of the stage's content, so a stage is only drawn again after it
+changes. The thumbnails are assembled into one surface as they arrive,
+so opening the map is a single blit however large the world is.
+"""
+
+import hashlib
+import os
+import queue
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import pygame
+
+from ..Internal import SCREEN_HEIGHT, SCREEN_WIDTH, check_type
+from ..Render import LAYER_HUD, RenderQueue, png_bytes
+from ..Stages import GRID_LOCATIONS, STAGES, Stage, room_size
+
+THUMBNAIL_VERSION = 1
+'''The version of the thumbnail drawing, part of every cache key.
+'''
+
+
+def stage_key(stage: Stage, size: Tuple[int, int], cell_size: Tuple[int, int]) -> str:
+    """Hashes everything a stage's thumbnail is drawn from.
+
+    :param stage: The stage.
+    :type stage: Stage
+    :param size: The width and height of the stage's room.
+    :type size: Tuple[int, int]
+    :param cell_size: The width and height of the thumbnail.
+    :type cell_size: Tuple[int, int]
+    :return: The hex digest of the stage's content.
+    :rtype: str
+    """
+
+    digest = hashlib.sha1()
+    digest.update(repr((THUMBNAIL_VERSION, tuple(size), tuple(cell_size))).encode())
+    for group in stage[1:4]:
+        if group is None:
+            digest.update(b"-")
+            continue
+        for obj in group:
+            digest.update(repr((type(obj).__name__, tuple(obj), obj.color)).encode())
+        digest.update(b";")
+    return digest.hexdigest()
+
+
+def render_thumbnail(
+    stage: Stage, size: Tuple[int, int], cell_size: Tuple[int, int]
+) -> pygame.Surface:
+    """Draws the platforms, spikes and lava of a stage scaled down to a thumbnail.
+
+    :param stage: The stage.
+    :type stage: Stage
+    :param size: The width and height of the stage's room.
+    :type size: Tuple[int, int]
+    :param cell_size: The width and height of the thumbnail.
+    :type cell_size: Tuple[int, int]
+    :return: The thumbnail.
+    :rtype: pygame.Surface
+    """
+
+    thumbnail = pygame.Surface(cell_size)
+    thumbnail.fill((20, 20, 28))
+    scale_x = cell_size[0] / size[0]
+    scale_y = cell_size[1] / size[1]
+
+    for group in stage[1:4]:
+        if group is None:
+            continue
+        for obj in group:
+            # objects are at least a pixel wide, so thin ledges do not disappear
+            rect = pygame.Rect(
+                int(obj.x * scale_x),
+                int(obj.y * scale_y),
+                max(1, round(obj.width * scale_x)),
+                max(1, round(obj.height * scale_y)),
+            )
+            thumbnail.fill(obj.color, rect)
+    return thumbnail
+
+
+class WorldMap:  # pylint: disable=too-many-instance-attributes
+    """The map of every stage, with thumbnails drawn and cached on a worker thread."""
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        names: Iterable[int | str] | None = None,
+        cell_size: Tuple[int, int] = (96, 54),
+        gap: int = 6,
+    ) -> None:
+        """Initializer for a WorldMap object. Starts drawing the thumbnails.
+
+        :param cache_dir: The directory the thumbnails are cached in, or None to not keep
+            them on disk.
+        :type cache_dir: str | None, optional
+        :param names: The names of the stages on the map. Defaults to every regular stage.
+        :type names: Iterable[int | str] | None, optional
+        :param cell_size: The width and height of each stage's thumbnail.
+        :type cell_size: Tuple[int, int], optional
+        :param gap: The space between thumbnails, in pixels.
+        :type gap: int, optional
+        """
+
+        check_type(gap, int)
+
+        self.cache_dir: str | None = cache_dir
+        self.names: List[int | str] = (
+            [name for name in GRID_LOCATIONS if isinstance(name, int)]
+            if names is None
+            else list(names)
+        )
+        self.cell_size: Tuple[int, int] = (int(cell_size[0]), int(cell_size[1]))
+        self.gap: int = gap
+        self.visible: bool = False
+
+        # the top left of each stage's cell on the map, grid rows count down the screen
+        self.cells: Dict[int | str, Tuple[int, int]] = {}
+        columns = [GRID_LOCATIONS[name][0] for name in self.names] or [0]
+        rows = [GRID_LOCATIONS[name][1] for name in self.names] or [0]
+        for name in self.names:
+            grid_x, grid_y = GRID_LOCATIONS[name]
+            self.cells[name] = (
+                gap + (grid_x - min(columns)) * (self.cell_size[0] + gap),
+                gap + (grid_y - min(rows)) * (self.cell_size[1] + gap),
+            )
+
+        self.surface: pygame.Surface = pygame.Surface(
+            (
+                gap + (max(columns) - min(columns) + 1) * (self.cell_size[0] + gap),
+                gap + (max(rows) - min(rows) + 1) * (self.cell_size[1] + gap),
+            ),
+            pygame.SRCALPHA,
+        )
+        self.surface.fill((0, 0, 0, 200))
+        for cell in self.cells.values():
+            # outlines the stages whose thumbnails have not arrived yet
+            pygame.draw.rect(self.surface, (80, 80, 80), pygame.Rect(cell, self.cell_size), 1)
+
+        self.thumbnails: Dict[int | str, pygame.Surface] = {}
+        self.current: int | str | None = None
+
+        # thumbnails go from the worker thread to the gameloop through the queue
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed: bool = False
+        self._thread = threading.Thread(target=self._run, name="WorldMap", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Internal method that runs on the worker thread and draws or loads every thumbnail."""
+
+        for name in self.names:
+            if self._closed:
+                return
+
+            # the stage is built separately, the one in STAGES belongs to the gameloop
+            stage = STAGES.builders[name]()
+            size = room_size(name)
+
+            path = None
+            if self.cache_dir is not None:
+                path = os.path.join(
+                    self.cache_dir, stage_key(stage, size, self.cell_size) + ".png"
+                )
+                try:
+                    self._done.put((name, pygame.image.load(path)))
+                    continue
+                except (OSError, pygame.error):
+                    pass
+
+            thumbnail = render_thumbnail(stage, size, self.cell_size)
+            self._done.put((name, thumbnail))
+            if path is not None:
+                self._save(path, thumbnail)
+
+    def _save(self, path: str, thumbnail: pygame.Surface) -> None:
+        """Internal method that atomically writes a thumbnail to the cache.
+
+        :param path: The path of the thumbnail.
+        :type path: str
+        :param thumbnail: The thumbnail.
+        :type thumbnail: pygame.Surface
+        """
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(png_bytes(thumbnail))
+            os.replace(temp_path, path)
+        except OSError:
+            # the thumbnail is drawn again next time
+            pass
+
+    @property
+    def ready(self) -> bool:
+        """Whether every thumbnail is on the map."""
+
+        return len(self.thumbnails) == len(self.names)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Waits for the worker thread to finish, then puts its thumbnails on the map.
+
+        :param timeout: The maximum time to wait in seconds.
+        :type timeout: float | None, optional
+        :return: Whether every thumbnail is on the map.
+        :rtype: bool
+        """
+
+        self._thread.join(timeout)
+        self.update(self.current)
+        return self.ready
+
+    def close(self) -> None:
+        """Stops the worker thread after the thumbnail it is drawing."""
+
+        self._closed = True
+        self._thread.join()
+
+    def toggle(self) -> None:
+        """Opens the map if it is closed and closes it if it is open."""
+
+        self.visible = not self.visible
+
+    def update(self, current: int | str | None) -> int:
+        """Puts the thumbnails that arrived on the map and marks the player's stage.
+
+        :param current: The name of the stage the player is in.
+        :type current: int | str | None
+        :return: The number of thumbnails that arrived.
+        :rtype: int
+        """
+
+        arrived: List[Tuple[int | str, pygame.Surface]] = []
+        while True:
+            try:
+                arrived.append(self._done.get_nowait())
+            except queue.Empty:
+                break
+
+        if not arrived and current == self.current:
+            return 0
+
+        # the map is drawn onto a copy, the old one may still be queued on the render thread
+        self.surface = self.surface.copy()
+        for name, thumbnail in arrived:
+            if pygame.display.get_surface() is not None:
+                thumbnail = thumbnail.convert()
+            self.thumbnails[name] = thumbnail
+            self.surface.blit(thumbnail, self.cells[name])
+
+        # covering the old stage with its thumbnail removes its marker
+        previous = self.thumbnails.get(self.current)
+        if previous is not None and current != self.current:
+            self.surface.blit(previous, self.cells[self.current])
+        self.current = current
+        if current in self.cells:
+            pygame.draw.rect(
+                self.surface, (255, 0, 255), pygame.Rect(self.cells[current], self.cell_size), 2
+            )
+        return len(arrived)
+
+    def queue(self, render_queue: RenderQueue, layer: int = LAYER_HUD) -> None:
+        """Queues the map to be drawn in the middle of the screen if it is open.
+
+        :param render_queue: The queue to add the map to.
+        :type render_queue: RenderQueue
+        :param layer: The layer to draw the map on.
+        :type layer: int, optional
+        """
+
+        if not self.visible:
+            return
+
+        render_queue.sprite(
+            self.surface,
+            (
+                (SCREEN_WIDTH - self.surface.get_width()) // 2,
+                (SCREEN_HEIGHT - self.surface.get_height()) // 2,
+            ),
+            layer,
+        )
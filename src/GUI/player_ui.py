@@ -6,13 +6,17 @@ all times outside of menus.
 """
 
 import pygame
+from ..Internal import FONT, Assets
 from ..Player import Player
+from .hud import Widget
 
 
-class HealthBar:
+class HealthBar(Widget):
     """Class for displaying the player healthbar."""
 
-    def __init__(self, xcor: int | float, ycor: int | float, plr: Player) -> None:
+    def __init__(
+        self, xcor: int | float, ycor: int | float, plr: Player, assets: Assets | None = None
+    ) -> None:
         """Initializer for the HealthBar object.
 
         :param xcor: The x-coordinate of the HealthBar object.
@@ -21,32 +25,48 @@ class HealthBar:
         :type ycor: int | float
         :param plr: The Player object to which the HealthBar object belongs.
         :type plr: Player
+        :param assets: The asset manager to get the font from.
+        :type assets: Assets | None, optional
         """
 
+        super().__init__(xcor, ycor, 300, 60)
+
         self.xcor: int | float = xcor
         self.ycor: int | float = ycor
         self.plr: Player = plr
 
-    def update(self, screen: pygame.Surface) -> None:
-        """Runs update checks on the HealthBar.
+        # creating the font is slow, so it is only done once
+        self.font: pygame.font.Font = (
+            assets.font(75) if assets is not None else pygame.font.SysFont(FONT, 75)
+        )
 
-        :param screen: _description_
-        :type screen: pygame.Surface
+        self.watch("health", lambda: self.plr.health)
+        self.watch("max_health", lambda: self.plr.max_health)
+
+    def render(self, surface: pygame.Surface) -> None:
+        """Renders the healthbar onto its cached surface.
+
+        :param surface: The cached surface.
+        :type surface: pygame.Surface
         """
 
+        health = self.values["health"]
+        max_health = self.values["max_health"]
+
+        surface.fill((255, 0, 0))
         pygame.draw.rect(
-            screen, (255, 0, 0), pygame.Rect(self.xcor, self.ycor, 300, 60)
-        )
-        pygame.draw.rect(
-            screen,
-            (0, 255, 0),
-            pygame.Rect(
-                self.xcor, self.ycor, 300 * (self.plr.health / self.plr.max_health), 60
-            ),
+            surface, (0, 255, 0), pygame.Rect(0, 0, 300 * (health / max_health), 60)
         )
-        screen.blit(
-            pygame.font.SysFont("8514oem", 75).render(
-                f"{round(self.plr.health)} / {self.plr.max_health}", False, (0, 0, 0)
-            ),
-            (self.xcor + 60, self.ycor + 10),
+        surface.blit(
+            self.font.render(f"{round(health)} / {max_health}", False, (0, 0, 0)), (60, 10)
         )
+
+    def update(self, screen: pygame.Surface) -> None:
+        """Runs update checks on the HealthBar and draws it.
+
+        :param screen: The screen to draw on.
+        :type screen: pygame.Surface
+        """
+
+        self.poll()
+        self.draw(screen)
@@ -4,6 +4,36 @@ Internal is a collection of internal functions and values used to assist other s
 """
 
 from . import interp
+from .allocations import AllocationBudgetError, AllocationTracker, FrameStats
+from .assets import Assets
 from .checks import check_range, check_type, check_value
-from .constants import GRAVITY_ACCELERATION, SCREEN_HEIGHT, SCREEN_WIDTH
+from .constants import (
+    ALLOCATION_BUDGET,
+    AUTO_RENDER_SCALE,
+    FONT,
+    FRAME_CAPTURE,
+    GHOST_ADDRESS,
+    GHOST_RECORD,
+    GHOST_SEND_ADDRESS,
+    GRAVITY_ACCELERATION,
+    MAX_PARTICLES,
+    PIPELINED_RENDERING,
+    PLAYER_FRAME_SIZE,
+    PLAYER_SPRITE_SHEET,
+    PROFILE_INPUT,
+    PROFILE_STAGE_MEMORY,
+    PROFILE_STARTUP,
+    RENDER_SCALE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SMOOTH_SCALING,
+    STAGE_MEMORY_BUDGET,
+    TILE_SIZE,
+    TRACK_ALLOCATIONS,
+    USE_TILEMAPS,
+    WINDOW_POSITION,
+)
 from .hitboxes import Hitbox
+from .latency import LatencyTracker
+from .startup import StartupTimer
+from .timers import Timer, TimerService
@@ -0,0 +1,209 @@
+"""Internal.allocations.py
+
+Module containing the allocation tracker, a diagnostic mode for
+finding allocations and garbage collection pauses in the gameloop.
+
+tracemalloc only sees memory that is still allocated, so objects made
+and freed within a frame do not show up when snapshots are compared.
+They do raise the peak of traced memory, so each frame records both:
+the peak above the memory at the start of the frame, which counts
+short-lived objects, and the call sites whose memory grew, which shows
+where the objects that outlive the frame come from. Garbage collector
+callbacks time every collection that runs during the frame.
+"""
+
+import collections
+import gc
+import time
+import tracemalloc
+from typing import Any, Deque, Dict, List, Tuple
+
+from .checks import check_type
+
+
+class AllocationBudgetError(Exception):
+    pass
+
+
+class FrameStats:  # pylint: disable=too-few-public-methods
+    """The allocations and garbage collections of one frame."""
+
+    def __init__(self, frame: int) -> None:
+        """Initializer for a FrameStats object.
+
+        :param frame: The index of the frame.
+        :type frame: int
+        """
+
+        self.frame: int = frame
+        # bytes allocated above the start of the frame at its peak, and still allocated at its end
+        self.peak: int = 0
+        self.net: int = 0
+        self.collections: int = 0
+        # the time spent in the garbage collector in milliseconds
+        self.gc_time: float = 0
+        # (file:line, bytes, blocks) of the call sites whose memory grew, largest first
+        self.sites: List[Tuple[str, int, int]] = []
+
+    def __str__(self) -> str:
+        """Formats the stats as a short report.
+
+        :return: The report.
+        :rtype: str
+        """
+
+        lines = [
+            f"frame {self.frame}: peak {self.peak} B, net {self.net:+} B, "
+            f"{self.collections} gc ({self.gc_time:.2f} ms)"
+        ]
+        lines.extend(
+            f"    {size:+8} B {count:+5} blocks  {site}" for site, size, count in self.sites
+        )
+        return "\n".join(lines)
+
+
+class AllocationTracker:  # pylint: disable=too-many-instance-attributes
+    """Tracks the allocations and garbage collections of each frame."""
+
+    def __init__(
+        self,
+        budget: int | None = None,
+        top: int = 5,
+        depth: int = 1,
+        history: int = 600,
+    ) -> None:
+        """Initializer for an AllocationTracker object.
+
+        :param budget: The most bytes a frame may allocate at its peak, or None for no budget.
+        :type budget: int | None, optional
+        :param top: The number of call sites recorded for each frame. 0 skips the
+            snapshots, which are slow, and only records totals.
+        :type top: int, optional
+        :param depth: The number of stack frames tracemalloc keeps for each allocation.
+        :type depth: int, optional
+        :param history: The number of frames whose stats are kept.
+        :type history: int, optional
+        """
+
+        check_type(top, int)
+        check_type(depth, int)
+
+        self.budget: int | None = budget
+        self.top: int = top
+        self.depth: int = depth
+
+        self.frames: Deque[FrameStats] = collections.deque(maxlen=history)
+        # every frame that went over the budget since the last check
+        self.over_budget: List[FrameStats] = []
+
+        self._current: FrameStats | None = None
+        self._start: int = 0
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._gc_start: float = 0
+        self._frame: int = 0
+        self._started_tracing: bool = False
+
+    def start(self) -> None:
+        """Starts tracing allocations and garbage collections."""
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self._started_tracing = True
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    def stop(self) -> None:
+        """Stops tracing, unless tracemalloc was already tracing before start."""
+
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Internal method that takes a snapshot without the tracker's own allocations.
+
+        :return: The snapshot.
+        :rtype: tracemalloc.Snapshot
+        """
+
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+    def begin_frame(self) -> None:
+        """Marks the start of a frame."""
+
+        if self.top:
+            self._snapshot = self._take_snapshot()
+
+        self._current = FrameStats(self._frame)
+        self._frame += 1
+        self._start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end_frame(self) -> FrameStats:
+        """Marks the end of a frame and records its stats.
+
+        :return: The stats of the frame.
+        :rtype: FrameStats
+        """
+
+        if self._current is None:
+            raise RuntimeError("end_frame was called without begin_frame.")
+
+        current, peak = tracemalloc.get_traced_memory()
+        stats = self._current
+        self._current = None
+        stats.peak = peak - self._start
+        stats.net = current - self._start
+
+        if self._snapshot is not None:
+            diff = self._take_snapshot().compare_to(self._snapshot, "lineno")
+            self._snapshot = None
+            stats.sites = [
+                (str(stat.traceback), stat.size_diff, stat.count_diff)
+                for stat in diff
+                if stat.size_diff > 0
+            ][: self.top]
+
+        self.frames.append(stats)
+        if self.budget is not None and stats.peak > self.budget:
+            self.over_budget.append(stats)
+        return stats
+
+    def check(self) -> None:
+        """Raises if any frame went over the budget since the last check.
+
+        :raises AllocationBudgetError: If a frame went over the budget.
+        """
+
+        if not self.over_budget:
+            return
+
+        over = self.over_budget
+        self.over_budget = []
+        worst = max(over, key=lambda stats: stats.peak)
+        raise AllocationBudgetError(
+            f"{len(over)} frame(s) went over the allocation budget of {self.budget} B, "
+            f"the worst was:\n{worst}"
+        )
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:  # pylint: disable=unused-argument
+        """Internal method called by the garbage collector before and after each collection.
+
+        :param phase: "start" or "stop".
+        :type phase: str
+        :param info: The collection info from the garbage collector.
+        :type info: Dict[str, Any]
+        """
+
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._current is not None:
+            self._current.collections += 1
+            self._current.gc_time += (time.perf_counter() - self._gc_start) * 1000
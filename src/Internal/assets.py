@@ -0,0 +1,255 @@
+"""Internal.assets.py
+
+Module containing the asset manager.
+
+Resolving a system font by name makes pygame scan every installed
+font, which can take a long time on machines with many fonts. The
+asset manager resolves each font once, remembers the result in an
+on-disk cache that is thrown away when the font directories change,
+and keeps the loaded fonts and rendered text in memory.
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import pygame
+
+from .checks import check_type
+from .constants import FONT
+
+CACHE_VERSION = 1
+'''The version of the font cache format.
+'''
+
+FontSpec = Tuple[str, int, bool, bool]
+'''A font as its name, size, bold and italic.
+'''
+
+
+def font_directories() -> List[str]:
+    """Gets the directories the system fonts are installed in.
+
+    :return: The existing font directories and their direct subdirectories.
+    :rtype: List[str]
+    """
+
+    if sys.platform == "win32":
+        roots = [
+            os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+        ]
+    elif sys.platform == "darwin":
+        roots = [
+            "/Library/Fonts",
+            "/System/Library/Fonts",
+            os.path.expanduser("~/Library/Fonts"),
+        ]
+    else:
+        roots = [
+            "/usr/share/fonts",
+            "/usr/local/share/fonts",
+            os.path.expanduser("~/.fonts"),
+            os.path.expanduser("~/.local/share/fonts"),
+        ]
+
+    directories = []
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        directories.append(root)
+        try:
+            with os.scandir(root) as entries:
+                directories.extend(entry.path for entry in entries if entry.is_dir())
+        except OSError:
+            pass
+
+    return sorted(directories)
+
+
+def font_directories_key() -> Dict[str, float]:
+    """Gets the modification times of the font directories, used to invalidate the cache.
+
+    :return: The modification time of each font directory.
+    :rtype: Dict[str, float]
+    """
+
+    key = {}
+    for directory in font_directories():
+        try:
+            key[directory] = os.stat(directory).st_mtime
+        except OSError:
+            pass
+    return key
+
+
+class Assets:
+    """Loads and caches fonts and rendered text."""
+
+    def __init__(self, cache_path: str | None = None) -> None:
+        """Initializer for an Assets object. Loads the font cache if there is one.
+
+        :param cache_path: The path of the font cache, or None to not keep one on disk.
+        :type cache_path: str | None, optional
+        """
+
+        self.cache_path: str | None = cache_path
+
+        # "name|bold|italic" -> the path of the font file, or None for pygame's default font
+        self.font_paths: Dict[str, str | None] = {}
+        self.fonts: Dict[FontSpec, pygame.font.Font] = {}
+        self.texts: Dict[Tuple[str, int, str, Tuple[int, int, int]], pygame.Surface] = {}
+
+        # whether font_paths has entries that are not in the cache file yet
+        self._unsaved: bool = False
+        self._key: Dict[str, float] | None = None
+
+        if cache_path is not None:
+            self._load_cache()
+
+    def _load_cache(self) -> None:
+        """Internal method that loads the font cache if it is still valid."""
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        self._key = font_directories_key()
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != CACHE_VERSION
+            or cache.get("key") != self._key
+            or not isinstance(cache.get("fonts"), dict)
+        ):
+            return
+
+        # drop fonts that were removed without the directories changing
+        self.font_paths = {
+            name: path
+            for name, path in cache["fonts"].items()
+            if path is None or os.path.isfile(path)
+        }
+
+    def save_cache(self) -> None:
+        """Writes the font cache to disk if new fonts were resolved since it was loaded."""
+
+        if self.cache_path is None or not self._unsaved:
+            return
+
+        if self._key is None:
+            self._key = font_directories_key()
+
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"version": CACHE_VERSION, "key": self._key, "fonts": self.font_paths}, file
+            )
+        os.replace(temp_path, self.cache_path)
+        self._unsaved = False
+
+    def font_path(self, name: str = FONT, bold: bool = False, italic: bool = False) -> str | None:
+        """Resolves a system font to its file, scanning the system fonts only on a cache miss.
+
+        :param name: The name of the system font.
+        :type name: str, optional
+        :param bold: Whether to get the bold style.
+        :type bold: bool, optional
+        :param italic: Whether to get the italic style.
+        :type italic: bool, optional
+        :return: The path of the font file, or None if the font is not installed.
+        :rtype: str | None
+        """
+
+        key = f"{name}|{int(bold)}|{int(italic)}"
+        if key not in self.font_paths:
+            self.font_paths[key] = pygame.font.match_font(name, bold, italic)
+            self._unsaved = True
+        return self.font_paths[key]
+
+    def font(
+        self, size: int, name: str = FONT, bold: bool = False, italic: bool = False
+    ) -> pygame.font.Font:
+        """Gets a loaded font.
+
+        :param size: The size of the font.
+        :type size: int
+        :param name: The name of the system font.
+        :type name: str, optional
+        :param bold: Whether to get the bold style.
+        :type bold: bool, optional
+        :param italic: Whether to get the italic style.
+        :type italic: bool, optional
+        :return: The font.
+        :rtype: pygame.font.Font
+        """
+
+        spec = (name, size, bold, italic)
+        font = self.fonts.get(spec)
+        if font is None:
+            check_type(size, int)
+
+            path = self.font_path(name, bold, italic)
+            font = pygame.font.Font(path, size)
+            # fake the style like SysFont does if the font has no file for it
+            if (bold or italic) and (path is None or path == self.font_path(name)):
+                font.bold = bold
+                font.italic = italic
+            self.fonts[spec] = font
+
+        return font
+
+    def text(
+        self,
+        msg: str,
+        size: int,
+        color: Tuple[int, int, int] = (255, 255, 255),
+        name: str = FONT,
+    ) -> pygame.Surface:
+        """Gets rendered text, rendering it only the first time it is requested.
+
+        :param msg: The text.
+        :type msg: str
+        :param size: The size of the font.
+        :type size: int
+        :param color: The color of the text.
+        :type color: Tuple[int, int, int], optional
+        :param name: The name of the system font.
+        :type name: str, optional
+        :return: The rendered text.
+        :rtype: pygame.Surface
+        """
+
+        key = (name, size, msg, tuple(color))
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = self.texts[key] = self.font(size, name).render(msg, False, color)
+        return surface
+
+    def release_text(
+        self,
+        msg: str,
+        size: int,
+        color: Tuple[int, int, int] = (255, 255, 255),
+        name: str = FONT,
+    ) -> None:
+        """Drops rendered text from the cache, so it is rendered again the next time it is
+        requested.
+
+        :param msg: The text.
+        :type msg: str
+        :param size: The size of the font.
+        :type size: int
+        :param color: The color of the text.
+        :type color: Tuple[int, int, int], optional
+        :param name: The name of the system font.
+        :type name: str, optional
+        """
+
+        self.texts.pop((name, size, msg, tuple(color)), None)
@@ -3,6 +3,8 @@
 Module containing useful constants to be used throughout the project.
 """
 
+from typing import Tuple
+
 SCREEN_WIDTH = 1600
 '''The width of the screen.
 '''
@@ -13,3 +15,100 @@ SCREEN_HEIGHT = 900
 GRAVITY_ACCELERATION: int | float = 1000
 '''Acceleration due to gravity in pixels per second squared (px/sec^2)
 '''
+
+TILE_SIZE = 50
+'''The size of one tile of the level lattice in pixels.
+'''
+
+USE_TILEMAPS: bool = False
+'''Whether stages are collided with and drawn through their tilemaps
+instead of their object Groups.
+'''
+
+RENDER_SCALE: float = 1
+'''The resolution the world is drawn at as a fraction of the screen's,
+e.g. 0.5 to draw at 800x450 and scale up to 1600x900.
+'''
+
+SMOOTH_SCALING: bool = False
+'''Whether the world is scaled to the screen with smoothscale instead of
+nearest-neighbour scaling.
+'''
+
+AUTO_RENDER_SCALE: bool = False
+'''Whether the render scale is lowered automatically while frames take longer
+than 1/60th of a second.
+'''
+
+PIPELINED_RENDERING: bool = False
+'''Whether frames are drawn on a render thread while the next frame is simulated.
+Adds one frame of latency.
+'''
+
+TRACK_ALLOCATIONS: bool = False
+'''Whether the allocations and garbage collections of every frame are traced,
+and frames that go over ALLOCATION_BUDGET are reported. Slows the game down.
+'''
+
+ALLOCATION_BUDGET: int = 16384
+'''The most bytes a steady-state frame should allocate at its peak.
+'''
+
+PROFILE_STARTUP: bool = False
+'''Whether the time taken by each phase of startup is printed once the first frame is shown.
+'''
+
+PROFILE_INPUT: bool = False
+'''Whether percentiles of the time from each input to the frame that shows it are printed
+when the game quits.
+'''
+
+WINDOW_POSITION: Tuple[int, int] | None = None
+'''The position of the window's top left corner on the screen, or None to center it.
+'''
+
+FRAME_CAPTURE: str | None = None
+'''How frames are recorded to the captures folder: "raw", "png", "pipe" to encode
+with ffmpeg, or None to not record.
+'''
+
+STAGE_MEMORY_BUDGET: int = 16 * 1024 * 1024
+'''The most bytes of resources that no loaded stage uses, kept for when their stages are
+loaded again. The ones used longest ago are freed past it.
+'''
+
+PROFILE_STAGE_MEMORY: bool = False
+'''Whether what each loaded stage holds is printed every time the player changes rooms.
+'''
+
+GHOST_ADDRESS: Tuple[str, int] | None = None
+'''The host and port the ghost of another run is received on, e.g. ("127.0.0.1", 47800),
+or None to not show a ghost.
+'''
+
+GHOST_SEND_ADDRESS: Tuple[str, int] | None = None
+'''The host and port snapshots of the player are sent to, so another local game can race
+against it, or None to not send them.
+'''
+
+GHOST_RECORD: bool = False
+'''Whether snapshots of the player are recorded to the ghosts folder, to be played back
+as a ghost later.
+'''
+
+MAX_PARTICLES: int = 16384
+'''The most particles that can be alive at once. New particles are dropped past it.
+'''
+
+PLAYER_SPRITE_SHEET: str | None = None
+'''The path of the player's sprite sheet, with one row of frames for each animation
+state, or None to draw placeholder frames.
+'''
+
+PLAYER_FRAME_SIZE: Tuple[int, int] = (50, 80)
+'''The width and height of a frame in the player's sprite sheet.
+'''
+
+FONT = "8514oem"
+'''The name of the system font used for all text.
+'''
@@ -119,16 +119,18 @@ class Coordinates:
 
         return (2 * self.xcor + self.width) / 2, (2 * self.ycor + self.height) / 2
 
-    def is_off_screen_right(self, dist: int = 0) -> bool:
+    def is_off_screen_right(self, dist: int = 0, room_width: int = SCREEN_WIDTH) -> bool:
         """Checks if the entity is off-screen to the right by the specified distance.
 
         :param dist: The distance from the edge of the screen.
         :type dist: int
+        :param room_width: The width of the room, for rooms wider than the screen.
+        :type room_width: int, optional
         :return: Whether the entity is off-screen to the right.
         :rtype: bool
         """
 
-        if self.xcor + self.width > SCREEN_WIDTH + dist:
+        if self.xcor + self.width > room_width + dist:
             return True
         return False
 
@@ -158,16 +160,18 @@ class Coordinates:
             return True
         return False
 
-    def is_off_screen_down(self, dist: int = 0) -> bool:
+    def is_off_screen_down(self, dist: int = 0, room_height: int = SCREEN_HEIGHT) -> bool:
         """Checks if the entity is off-screen below by the specified distance.
 
         :param dist: The distance from the edge of the screen.
         :type dist: int
+        :param room_height: The height of the room, for rooms taller than the screen.
+        :type room_height: int, optional
         :return: Whether the entity is off-screen below.
         :rtype: bool
         """
 
-        if self.ycor + self.height > SCREEN_HEIGHT + dist:
+        if self.ycor + self.height > room_height + dist:
             return True
         return False
 
@@ -356,15 +360,19 @@ class Hitbox(pygame.Rect):
                     t_eased,
                 )
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the hitbox to the screen.
 
         :param screen: The screen to draw on.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         check_type(screen, pygame.Surface)
 
         pygame.draw.rect(
-            screen, self.color, (self.xcor, self.ycor, self.width, self.height)
+            screen,
+            self.color,
+            (self.xcor + offset[0], self.ycor + offset[1], self.width, self.height),
         )
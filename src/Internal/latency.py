@@ -0,0 +1,90 @@
+"""Internal.latency.py
+
+Module containing the latency tracker, which records how long each
+input took to show up on the screen and reports the percentiles.
+"""
+
+import collections
+from typing import Deque, Dict, Iterable, Tuple
+
+from .checks import check_type
+
+
+class LatencyTracker:
+    """Records input-to-present latencies over a window of recent inputs."""
+
+    def __init__(self, history: int = 3600) -> None:
+        """Initializer for a LatencyTracker object.
+
+        :param history: The number of most recent inputs kept.
+        :type history: int, optional
+        """
+
+        check_type(history, int)
+
+        # the latency of each input in milliseconds
+        self.samples: Deque[float] = collections.deque(maxlen=history)
+
+    def __len__(self) -> int:
+        """Gets the number of recorded latencies.
+
+        :return: The number of latencies.
+        :rtype: int
+        """
+
+        return len(self.samples)
+
+    def record(self, input_times: Iterable[float], present_time: float) -> None:
+        """Records the inputs shown by a frame.
+
+        :param input_times: The time.perf_counter value each input was received at.
+        :type input_times: Iterable[float]
+        :param present_time: The time.perf_counter value the frame was presented at.
+        :type present_time: float
+        """
+
+        self.samples.extend((present_time - input_time) * 1000 for input_time in input_times)
+
+    def percentile(self, percent: float) -> float:
+        """Gets a percentile of the recorded latencies, by the nearest rank.
+
+        :param percent: The percentile, from 0 to 100.
+        :type percent: float
+        :return: The latency in milliseconds, 0 if nothing was recorded.
+        :rtype: float
+        """
+
+        return self.percentiles((percent,))[percent]
+
+    def percentiles(self, percents: Tuple[float, ...] = (50, 90, 99)) -> Dict[float, float]:
+        """Gets several percentiles of the recorded latencies, sorting them once.
+
+        :param percents: The percentiles, from 0 to 100.
+        :type percents: Tuple[float, ...], optional
+        :return: The latency in milliseconds of each percentile, 0 if nothing was recorded.
+        :rtype: Dict[float, float]
+        """
+
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {percent: 0.0 for percent in percents}
+
+        last = len(ordered) - 1
+        return {
+            percent: ordered[min(last, max(0, round(percent / 100 * len(ordered)) - 1))]
+            for percent in percents
+        }
+
+    def report(self) -> str:
+        """Formats the percentiles as one line.
+
+        :return: The report.
+        :rtype: str
+        """
+
+        values = self.percentiles((50, 90, 99, 100))
+        return (
+            f"input to present over {len(self.samples)} inputs: "
+            + ", ".join(f"p{percent} {values[percent]:.2f} ms" for percent in (50, 90, 99))
+            + f", max {values[100]:.2f} ms"
+        )
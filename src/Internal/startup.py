@@ -0,0 +1,62 @@
+"""Internal.startup.py
+
+Module containing the startup timer, which measures how long each
+phase of starting the game takes until the first frame is shown.
+"""
+
+import time
+from typing import List, Tuple
+
+from .checks import check_type
+
+
+class StartupTimer:
+    """Records the time taken by each startup phase."""
+
+    def __init__(self, start: float | None = None) -> None:
+        """Initializer for a StartupTimer object.
+
+        :param start: The time.perf_counter value startup began at. Defaults to now.
+        :type start: float | None, optional
+        """
+
+        self.start: float = time.perf_counter() if start is None else start
+        self._last: float = self.start
+
+        # (name, milliseconds) of each phase in the order they finished
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        """Ends a phase that started at the end of the previous one.
+
+        :param name: The name of the phase.
+        :type name: str
+        :return: The time the phase took in milliseconds.
+        :rtype: float
+        """
+
+        check_type(name, str)
+
+        now = time.perf_counter()
+        duration = (now - self._last) * 1000
+        self._last = now
+        self.phases.append((name, duration))
+        return duration
+
+    @property
+    def total(self) -> float:
+        """The time from the start to the end of the last phase in milliseconds."""
+
+        return (self._last - self.start) * 1000
+
+    def report(self) -> str:
+        """Formats the phases as a table.
+
+        :return: The table.
+        :rtype: str
+        """
+
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = [f"{name:<{width}} {duration:9.2f} ms" for name, duration in self.phases]
+        lines.append(f"{'total':<{width}} {self.total:9.2f} ms")
+        return "\n".join(lines)
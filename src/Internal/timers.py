@@ -0,0 +1,187 @@
+"""Internal.timers.py
+
+Module containing the timer service, which runs every cooldown, buff
+and scheduled callback of the game.
+
+Time is counted in simulated frames, not read from a clock, so timers
+stop while the game is paused and run the same way in a replay. Timers
+are kept in a min-heap ordered by the frame they are due on, so
+advancing only looks at the timers that expire: each costs O(log n),
+and timers that are not due are never touched. Cancelled timers are
+left in the heap and skipped when they come up, and the heap is rebuilt
+once they make up most of it.
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, List, Tuple
+
+from .checks import check_type
+
+
+class Timer:
+    """A handle to a scheduled timer."""
+
+    def __init__(
+        self,
+        service: "TimerService",
+        due: int,
+        callback: Callable[..., None] | None,
+        args: Tuple[Any, ...],
+        repeat: int,
+    ) -> None:
+        """Initializer for a Timer object. Use TimerService.schedule to create timers.
+
+        :param service: The service the timer runs on.
+        :type service: TimerService
+        :param due: The frame the timer expires on.
+        :type due: int
+        :param callback: Called with args when the timer expires, or None for a cooldown.
+        :type callback: Callable[..., None] | None
+        :param args: The arguments to call the callback with.
+        :type args: Tuple[Any, ...]
+        :param repeat: How many frames apart the timer repeats, or 0 to only run once.
+        :type repeat: int
+        """
+
+        self.service: TimerService = service
+        self.due: int = due
+        self.callback: Callable[..., None] | None = callback
+        self.args: Tuple[Any, ...] = args
+        self.repeat: int = repeat
+        self.cancelled: bool = False
+        self.expired: bool = False
+
+    @property
+    def remaining(self) -> int:
+        """The number of frames until the timer expires, 0 once it has."""
+
+        if self.cancelled:
+            return 0
+        return max(0, self.due - self.service.now)
+
+    @property
+    def active(self) -> bool:
+        """Whether the timer has not expired or been cancelled yet."""
+
+        return self.remaining > 0
+
+    def cancel(self) -> None:
+        """Stops the timer. Cancelling a timer that already expired does nothing."""
+
+        if not self.cancelled and not self.expired:
+            self.cancelled = True
+            self.service.cancelled += 1
+            self.service.collect()
+
+
+class TimerService:
+    """Runs timers on game time."""
+
+    def __init__(self) -> None:
+        """Initializer for a TimerService object."""
+
+        # the number of frames advanced so far
+        self.now: int = 0
+
+        # (due, order, timer), timers due on the same frame run in the order they were made
+        self._heap: List[Tuple[int, int, Timer]] = []
+        self._order = itertools.count()
+
+        # cancelled timers still in the heap
+        self.cancelled: int = 0
+
+    def __len__(self) -> int:
+        """Gets the number of timers that are still running.
+
+        :return: The number of timers.
+        :rtype: int
+        """
+
+        return len(self._heap) - self.cancelled
+
+    def schedule(
+        self,
+        delay: int,
+        callback: Callable[..., None] | None = None,
+        args: Tuple[Any, ...] = (),
+        repeat: int = 0,
+    ) -> Timer:
+        """Starts a timer.
+
+        :param delay: The number of frames until the timer expires, at least 1.
+        :type delay: int
+        :param callback: Called with args when the timer expires. Leave it out for cooldowns,
+            which are only checked with Timer.active.
+        :type callback: Callable[..., None] | None, optional
+        :param args: The arguments to call the callback with.
+        :type args: Tuple[Any, ...], optional
+        :param repeat: How many frames apart the timer repeats after it first expires,
+            or 0 to only run once.
+        :type repeat: int, optional
+        :raises ValueError: If the delay or repeat is not positive.
+        :return: The timer.
+        :rtype: Timer
+        """
+
+        check_type(delay, int)
+        check_type(repeat, int)
+        if delay < 1:
+            raise ValueError("Timers must be at least 1 frame long.")
+        if repeat < 0:
+            raise ValueError("Timers cannot repeat a negative number of frames apart.")
+
+        timer = Timer(self, self.now + delay, callback, args, repeat)
+        heapq.heappush(self._heap, (timer.due, next(self._order), timer))
+        return timer
+
+    def advance(self, frames: int = 1) -> int:
+        """Moves game time forward and runs the callbacks of the timers that expired.
+
+        Callbacks run in the order their timers expire in, with now set to
+        the frame each timer was due on.
+
+        :param frames: The number of frames to advance.
+        :type frames: int, optional
+        :return: The number of timers that expired.
+        :rtype: int
+        """
+
+        end = self.now + frames
+        expired = 0
+        heap = self._heap
+        while heap and heap[0][0] <= end:
+            due, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                self.cancelled -= 1
+                continue
+
+            self.now = due
+            expired += 1
+            if timer.repeat:
+                timer.due = due + timer.repeat
+                heapq.heappush(heap, (timer.due, next(self._order), timer))
+            else:
+                timer.expired = True
+            if timer.callback is not None:
+                timer.callback(*timer.args)
+
+        self.now = end
+        return expired
+
+    def collect(self) -> None:
+        """Removes the cancelled timers from the heap once they make up most of it."""
+
+        if self.cancelled > 64 and self.cancelled * 2 > len(self._heap):
+            # in place, so a collection from a callback does not lose the heap advance is using
+            self._heap[:] = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self.cancelled = 0
+
+    def clear(self) -> None:
+        """Cancels every timer."""
+
+        for _, _, timer in self._heap:
+            timer.cancelled = True
+        self._heap.clear()
+        self.cancelled = 0
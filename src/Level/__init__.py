@@ -3,4 +3,6 @@
 The Level package contains functionality for level objects such as platforms.
 """
 
+from .navigation import DOUBLE_JUMP, DROP, JUMP, WALK, NavEdge, NavGraph, NavNode
 from .objects import Group, Lava, Platform, Spike
+from .tilemap import TileMap
@@ -0,0 +1,675 @@
+"""Level.navigation.py
+
+Module containing the navigation graph enemies use to find their way
+through a stage.
+
+Searching the platforms of a stage every frame is too slow, so the
+walkable surfaces are extracted once: the top of every platform that
+has room for the agent above it and no hazard on it becomes a node.
+Nodes are linked with walk edges where surfaces touch, drop edges where
+the agent can walk off one surface and fall onto another, and jump
+and double jump edges where a jump with the player's physics reaches
+another surface without hitting a platform on the way. Paths are found
+with A* over the nodes and cached by their start and goal.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any, Dict, List, Tuple
+
+import pygame
+
+from ..Internal import GRAVITY_ACCELERATION, SCREEN_HEIGHT, SCREEN_WIDTH, check_type
+from .objects import Group, Lava, Platform, Spike
+
+WALK = "walk"
+'''Edge kind for walking from a surface onto a touching surface at the same height.
+'''
+DROP = "drop"
+'''Edge kind for walking off the end of a surface and falling onto a lower one.
+'''
+JUMP = "jump"
+'''Edge kind for jumping from a surface onto another one.
+'''
+DOUBLE_JUMP = "double_jump"
+'''Edge kind for jumping, then double jumping at the top of the jump, onto another surface.
+'''
+
+# the edge kind of a flight with each number of jumps
+_FLIGHTS = (DROP, JUMP, DOUBLE_JUMP)
+
+# the time between the points of a flight that are checked for collisions, one frame
+_FLIGHT_STEP = 1 / 60
+
+
+class NavNode:
+    """A walkable surface on top of a platform."""
+
+    def __init__(self, index: int, left: int, right: int, ycor: int) -> None:
+        """Initializer for a NavNode object.
+
+        :param index: The index of the node in its graph.
+        :type index: int
+        :param left: The x-coordinate of the left end of the surface.
+        :type left: int
+        :param right: The x-coordinate of the right end of the surface, exclusive.
+        :type right: int
+        :param ycor: The y-coordinate of the surface, where the agent's feet are.
+        :type ycor: int
+        """
+
+        self.index: int = index
+        self.left: int = left
+        self.right: int = right
+        self.ycor: int = ycor
+
+        # the edges leaving the node
+        self.edges: List["NavEdge"] = []
+
+    @property
+    def center(self) -> float:
+        """The x-coordinate of the middle of the surface."""
+
+        return (self.left + self.right) / 2
+
+    def __repr__(self) -> str:
+        """Gets the representation of the node.
+
+        :return: The representation.
+        :rtype: str
+        """
+
+        return f"NavNode({self.index}, {self.left}, {self.right}, {self.ycor})"
+
+
+class NavEdge:
+    """A way to get from one surface to another."""
+
+    def __init__(
+        self, source: int, target: int, kind: str, cost: float, takeoff: float, landing: float
+    ) -> None:
+        """Initializer for a NavEdge object.
+
+        :param source: The index of the node the edge starts at.
+        :type source: int
+        :param target: The index of the node the edge ends at.
+        :type target: int
+        :param kind: How the edge is traversed, WALK, DROP, JUMP or DOUBLE_JUMP.
+        :type kind: str
+        :param cost: The time the edge takes in seconds, from the center of the source
+            to the center of the target.
+        :type cost: float
+        :param takeoff: The x-coordinate of the agent's left side when it leaves the source.
+        :type takeoff: float
+        :param landing: The x-coordinate of the agent's left side when it reaches the target.
+        :type landing: float
+        """
+
+        self.source: int = source
+        self.target: int = target
+        self.kind: str = kind
+        self.cost: float = cost
+        self.takeoff: float = takeoff
+        self.landing: float = landing
+
+        # the time after takeoff to double jump at in seconds, for DOUBLE_JUMP edges
+        self.double_jump_at: float = 0
+
+    def __repr__(self) -> str:
+        """Gets the representation of the edge.
+
+        :return: The representation.
+        :rtype: str
+        """
+
+        return (
+            f"NavEdge({self.source} -> {self.target}, {self.kind}, {self.cost:.3f}s, "
+            f"{self.takeoff:.0f} -> {self.landing:.0f})"
+        )
+
+
+def _subtract(
+    intervals: List[Tuple[int, int]], start: int, end: int
+) -> List[Tuple[int, int]]:
+    """Internal function that removes a range from a list of intervals.
+
+    :param intervals: The intervals as (start, end), end exclusive.
+    :type intervals: List[Tuple[int, int]]
+    :param start: The start of the range to remove.
+    :type start: int
+    :param end: The end of the range to remove, exclusive.
+    :type end: int
+    :return: The remaining intervals.
+    :rtype: List[Tuple[int, int]]
+    """
+
+    remaining = []
+    for left, right in intervals:
+        if end <= left or start >= right:
+            remaining.append((left, right))
+            continue
+        if left < start:
+            remaining.append((left, start))
+        if end < right:
+            remaining.append((end, right))
+    return remaining
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """Internal function that limits a value to a range.
+
+    :param value: The value.
+    :type value: float
+    :param low: The lowest allowed value.
+    :type low: float
+    :param high: The highest allowed value.
+    :type high: float
+    :return: The limited value.
+    :rtype: float
+    """
+
+    return max(low, min(high, value))
+
+
+class NavGraph:
+    """The walkable surfaces of a stage and the ways between them."""
+
+    def __init__(
+        self,
+        agent_size: Tuple[int, int] = (50, 80),
+        speed: float = 250,
+        jump_speed: float = 500,
+        gravity: float = GRAVITY_ACCELERATION,
+        double_jump: bool = True,
+    ) -> None:
+        """Initializer for a NavGraph object. The defaults match the player's physics.
+
+        :param agent_size: The width and height of the agents that use the graph.
+        :type agent_size: Tuple[int, int], optional
+        :param speed: The horizontal speed of the agents in pixels per second.
+        :type speed: float, optional
+        :param jump_speed: The upwards velocity a jump gives in pixels per second.
+        :type jump_speed: float, optional
+        :param gravity: The acceleration due to gravity in pixels per second squared.
+        :type gravity: float, optional
+        :param double_jump: Whether the agents can jump again in the air.
+        :type double_jump: bool, optional
+        """
+
+        self.agent_width: int
+        self.agent_height: int
+        self.agent_width, self.agent_height = agent_size
+        self.speed: float = speed
+        self.jump_speed: float = jump_speed
+        self.gravity: float = gravity
+        self.double_jump: bool = double_jump
+
+        self.nodes: List[NavNode] = []
+
+        # the solid rects agents collide with while moving between nodes
+        self.solids: List[pygame.Rect] = []
+
+        # (start, goal) -> the edges of the path, or None if there is no path
+        self._paths: Dict[Tuple[int, int], Tuple[NavEdge, ...] | None] = {}
+
+    @classmethod
+    def from_groups(
+        cls,
+        platforms: Group,
+        spikes: Group | None = None,
+        lavas: Group | None = None,
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+        **physics: Any,
+    ) -> "NavGraph":
+        """Builds the graph of a stage from its object Groups.
+
+        :param platforms: The Group of Platform objects.
+        :type platforms: Group
+        :param spikes: The Group of Spike objects.
+        :type spikes: Group | None, optional
+        :param lavas: The Group of Lava objects.
+        :type lavas: Group | None, optional
+        :param width: The width of the room in pixels.
+        :type width: int, optional
+        :param height: The height of the room in pixels.
+        :type height: int, optional
+        :param physics: The agent size and physics, passed on to NavGraph.
+        :type physics: Any
+        :return: The built graph.
+        :rtype: NavGraph
+        """
+
+        check_type(platforms, Group)
+
+        graph = cls(**physics)
+        graph.solids = [
+            pygame.Rect(obj) for obj in platforms if isinstance(obj, Platform) and obj.has_collision
+        ]
+
+        hazards = []
+        for group, obj_type in ((spikes, Spike), (lavas, Lava)):
+            if group is not None:
+                check_type(group, Group)
+                hazards.extend(
+                    pygame.Rect(obj)
+                    for obj in group
+                    if isinstance(obj, obj_type) and obj.has_collision
+                )
+
+        graph.extract_surfaces(hazards, width, height)
+        graph.link()
+        return graph
+
+    @classmethod
+    def from_stage(
+        cls,
+        stage: Tuple[Any, ...],
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+        **physics: Any,
+    ) -> "NavGraph":
+        """Builds the graph of a stage tuple in the format used by Stages.
+
+        :param stage: The stage.
+        :type stage: Tuple[Any, ...]
+        :param width: The width of the room in pixels.
+        :type width: int, optional
+        :param height: The height of the room in pixels.
+        :type height: int, optional
+        :param physics: The agent size and physics, passed on to NavGraph.
+        :type physics: Any
+        :return: The built graph.
+        :rtype: NavGraph
+        """
+
+        return cls.from_groups(stage[1], stage[2], stage[3], width, height, **physics)
+
+    # building
+
+    def extract_surfaces(self, hazards: List[pygame.Rect], width: int, height: int) -> None:
+        """Creates a node for every part of a platform top the agent can stand on.
+
+        A surface is cut where another platform leaves no room for the agent
+        above it, or where a spike or lava touches it.
+
+        :param hazards: The rects of the spikes and lava of the stage.
+        :type hazards: List[pygame.Rect]
+        :param width: The width of the room in pixels.
+        :type width: int
+        :param height: The height of the room in pixels.
+        :type height: int
+        """
+
+        self.nodes = []
+        surfaces = set()
+        for solid in self.solids:
+            # the tops of platforms outside the room cannot be stood on
+            if not 0 < solid.top <= height:
+                continue
+
+            intervals = [(max(0, solid.left), min(width, solid.right))]
+
+            # the space the agent takes up while standing on the platform
+            above = pygame.Rect(
+                solid.left, solid.top - self.agent_height, solid.width, self.agent_height
+            )
+            for other in self.solids:
+                if other is not solid and other.colliderect(above):
+                    intervals = _subtract(intervals, other.left, other.right)
+
+            # hazards lying on the platform also count
+            above.height += 1
+            for hazard in hazards:
+                if hazard.colliderect(above):
+                    intervals = _subtract(intervals, hazard.left, hazard.right)
+
+            for left, right in intervals:
+                if right - left >= self.agent_width:
+                    surfaces.add((left, right, solid.top))
+
+        for left, right, ycor in sorted(surfaces, key=lambda surface: (surface[2], surface[0])):
+            self.nodes.append(NavNode(len(self.nodes), left, right, ycor))
+
+    def _height(self, now: float, jumps: int, double_jump_at: float = 0) -> float:
+        """Internal method that gets how far above its start the agent is during a flight.
+
+        :param now: The time since the start of the flight in seconds.
+        :type now: float
+        :param jumps: 0 for walking off an edge, 1 for a jump and 2 for a jump followed by a
+            double jump.
+        :type jumps: int
+        :param double_jump_at: The time of the double jump in seconds.
+        :type double_jump_at: float, optional
+        :return: The height in pixels, negative below the start.
+        :rtype: float
+        """
+
+        if jumps == 2 and now > double_jump_at:
+            # the double jump starts over from wherever the first jump got to
+            return self._height(double_jump_at, 1) + self._height(now - double_jump_at, 1)
+
+        speed = self.jump_speed if jumps else 0
+        return speed * now - self.gravity * now * now / 2
+
+    @property
+    def _apex(self) -> float:
+        """The height a single jump reaches in pixels."""
+
+        return self.jump_speed * self.jump_speed / (2 * self.gravity)
+
+    def _flight_time(self, drop: float, jumps: int) -> Tuple[float, float] | None:
+        """Internal method that gets how long a flight takes to end some distance lower.
+
+        A double jump is timed for the longest flight, which is on the way down
+        from the first jump once the agent has fallen to halfway between the start
+        and the end, or at the top of the first jump if the end is too high for that.
+
+        :param drop: How far below the start the flight ends, negative for higher.
+        :type drop: float
+        :param jumps: 0 for walking off an edge, 1 for a jump and 2 for a double jump.
+        :type jumps: int
+        :return: The time of the flight and of the double jump in seconds, or None if
+            the end cannot be reached.
+        :rtype: Tuple[float, float] | None
+        """
+
+        double_jump_at = 0.0
+        if jumps == 2:
+            switch = min(self._apex, -drop / 2)
+            double_jump_at = (
+                self.jump_speed
+                + math.sqrt(self.jump_speed * self.jump_speed - 2 * self.gravity * switch)
+            ) / self.gravity
+            drop += switch
+
+        speed = self.jump_speed if jumps else 0
+        discriminant = speed * speed + 2 * self.gravity * drop
+        if discriminant < 0:
+            return None
+
+        # the later root, so the agent lands on the surface while falling
+        time = double_jump_at + (speed + math.sqrt(discriminant)) / self.gravity
+        return (time, double_jump_at) if time > 0 else None
+
+    def _flight_clear(
+        self,
+        source: NavNode,
+        takeoff: float,
+        landing: float,
+        flight: Tuple[float, float],
+        jumps: int,
+        profile: int,
+    ) -> bool:
+        """Internal method that checks that the agent hits no platform during a flight.
+
+        :param source: The node the flight starts from.
+        :type source: NavNode
+        :param takeoff: The x-coordinate of the agent's left side at the start.
+        :type takeoff: float
+        :param landing: The x-coordinate of the agent's left side at the end.
+        :type landing: float
+        :param flight: The length of the flight and the time of the double jump in seconds.
+        :type flight: Tuple[float, float]
+        :param jumps: 0 for walking off an edge, 1 for a jump and 2 for a double jump.
+        :type jumps: int
+        :param profile: When the agent moves sideways: -1 as early as possible, 1 as late as
+            possible and 0 evenly throughout the flight.
+        :type profile: int
+        :return: Whether the flight is clear.
+        :rtype: bool
+        """
+
+        time, double_jump_at = flight
+        distance = landing - takeoff
+        moving = abs(distance) / self.speed if profile else time
+        start = time - moving if profile > 0 else 0
+
+        # only the platforms near the flight can be hit
+        apex = self._apex * jumps
+        bounds = pygame.Rect(
+            min(takeoff, landing),
+            source.ycor - self.agent_height - apex,
+            abs(distance) + self.agent_width,
+            self.agent_height + apex + self.gravity * time * time,
+        )
+        solids = [solid for solid in self.solids if solid.colliderect(bounds)]
+        if not solids:
+            return True
+
+        agent = pygame.Rect(0, 0, self.agent_width, self.agent_height)
+        steps = max(1, math.ceil(time / _FLIGHT_STEP))
+        for step in range(1, steps):
+            now = time * step / steps
+            progress = _clamp((now - start) / moving, 0, 1) if moving else 1
+            agent.left = round(takeoff + distance * progress)
+            agent.bottom = round(source.ycor - self._height(now, jumps, double_jump_at))
+            if agent.collidelist(solids) != -1:
+                return False
+        return True
+
+    def _flight(self, source: NavNode, target: NavNode, jumps: int) -> NavEdge | None:
+        """Internal method that finds the cheapest clear flight between two nodes.
+
+        :param source: The node to start from.
+        :type source: NavNode
+        :param target: The node to land on.
+        :type target: NavNode
+        :param jumps: 0 for walking off an edge, 1 for a jump and 2 for a double jump.
+        :type jumps: int
+        :return: The edge, or None if the target cannot be reached this way.
+        :rtype: NavEdge | None
+        """
+
+        flight = self._flight_time(target.ycor - source.ycor, jumps)
+        if flight is None:
+            return None
+        time, double_jump_at = flight
+        reach = self.speed * time
+
+        # the x-coordinates the agent's left side can have while standing on each node
+        source_low, source_high = source.left, source.right - self.agent_width
+        target_low, target_high = target.left, target.right - self.agent_width
+        if max(target_low - source_high, source_low - target_high) > reach:
+            return None
+
+        if jumps:
+            takeoffs = {
+                source_low,
+                source_high,
+                _clamp(target_low, source_low, source_high),
+                _clamp(target_high, source_low, source_high),
+                # just clear of the sides of the target, to get around it when it is above
+                _clamp(target.left - self.agent_width - 1, source_low, source_high),
+                _clamp(target.right + 1, source_low, source_high),
+            }
+        else:
+            # walking off an edge, the agent has just stopped touching the surface
+            takeoffs = {source.left - self.agent_width, source.right}
+
+        best = None
+        for takeoff in takeoffs:
+            landings = {target_low, target_high, _clamp(takeoff, target_low, target_high)}
+            for landing in landings:
+                if abs(landing - takeoff) > reach:
+                    continue
+                if not jumps and source_low - self.agent_width < landing < source.right:
+                    # the agent would still be on the source
+                    continue
+
+                cost = (
+                    abs(takeoff - source.center + self.agent_width / 2) / self.speed
+                    + time
+                    + abs(target.center - self.agent_width / 2 - landing) / self.speed
+                )
+                if best is not None and cost >= best.cost:
+                    continue
+                if any(
+                    self._flight_clear(source, takeoff, landing, flight, jumps, profile)
+                    for profile in (0, 1, -1)
+                ):
+                    best = NavEdge(
+                        source.index, target.index, _FLIGHTS[jumps], cost, takeoff, landing
+                    )
+                    best.double_jump_at = double_jump_at
+        return best
+
+    def link(self) -> None:
+        """Creates the walk, drop, jump and double jump edges between the nodes."""
+
+        self._paths.clear()
+        for node in self.nodes:
+            node.edges = []
+
+        for source, target in itertools.permutations(self.nodes, 2):
+            if source.ycor == target.ycor and (
+                source.right == target.left or target.right == source.left
+            ):
+                # the agent crosses the seam between the surfaces halfway
+                seam = target.left if target.left > source.left else target.right
+                seam -= self.agent_width / 2
+                source.edges.append(
+                    NavEdge(
+                        source.index,
+                        target.index,
+                        WALK,
+                        abs(target.center - source.center) / self.speed,
+                        seam,
+                        seam,
+                    )
+                )
+                continue
+
+            # a flight that reaches the target with fewer jumps is preferred when it is clear
+            for jumps in range(0 if target.ycor > source.ycor else 1, 3 if self.double_jump else 2):
+                edge = self._flight(source, target, jumps)
+                if edge is not None:
+                    source.edges.append(edge)
+                    break
+
+    # queries
+
+    def node_at(self, rect: pygame.Rect | Tuple[Any, ...], tolerance: int = 1) -> NavNode | None:
+        """Finds the node an agent is standing on.
+
+        :param rect: The hitbox of the agent.
+        :type rect: pygame.Rect | Tuple[Any, ...]
+        :param tolerance: How many pixels the agent's feet can be off the surface.
+        :type tolerance: int, optional
+        :return: The node, or None if the agent is not on one.
+        :rtype: NavNode | None
+        """
+
+        rect = pygame.Rect(rect)
+        for node in self.nodes:
+            if (
+                abs(rect.bottom - node.ycor) <= tolerance
+                and rect.right > node.left
+                and rect.left < node.right
+            ):
+                return node
+        return None
+
+    def _heuristic(self, node: NavNode, goal: NavNode) -> float:
+        """Internal method that estimates the time between two nodes, never overestimating.
+
+        :param node: The node to estimate from.
+        :type node: NavNode
+        :param goal: The node to estimate to.
+        :type goal: NavNode
+        :return: The estimate in seconds.
+        :rtype: float
+        """
+
+        return abs(goal.center - node.center) / self.speed
+
+    def path(self, start: int, goal: int) -> Tuple[NavEdge, ...] | None:
+        """Finds the fastest path between two nodes with A*. Results are cached.
+
+        :param start: The index of the node to start at.
+        :type start: int
+        :param goal: The index of the node to reach.
+        :type goal: int
+        :return: The edges to follow in order, empty if already at the goal,
+            or None if the goal cannot be reached.
+        :rtype: Tuple[NavEdge, ...] | None
+        """
+
+        key = (start, goal)
+        if key in self._paths:
+            return self._paths[key]
+
+        goal_node = self.nodes[goal]
+        costs: Dict[int, float] = {start: 0}
+        came_from: Dict[int, NavEdge] = {}
+
+        # (estimate, tiebreak, node), the tiebreak keeps the order of equal estimates stable
+        tiebreak = itertools.count()
+        frontier = [(self._heuristic(self.nodes[start], goal_node), next(tiebreak), start)]
+        closed = set()
+
+        found = None
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if current == goal:
+                found = current
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+
+            for edge in self.nodes[current].edges:
+                cost = costs[current] + edge.cost
+                if cost < costs.get(edge.target, math.inf):
+                    costs[edge.target] = cost
+                    came_from[edge.target] = edge
+                    heapq.heappush(
+                        frontier,
+                        (
+                            cost + self._heuristic(self.nodes[edge.target], goal_node),
+                            next(tiebreak),
+                            edge.target,
+                        ),
+                    )
+
+        result = None
+        if found is not None:
+            edges = []
+            while found != start:
+                edge = came_from[found]
+                edges.append(edge)
+                found = edge.source
+            result = tuple(reversed(edges))
+
+        self._paths[key] = result
+        return result
+
+    def find_path(
+        self, start: pygame.Rect | Tuple[Any, ...], goal: pygame.Rect | Tuple[Any, ...]
+    ) -> Tuple[NavEdge, ...] | None:
+        """Finds the fastest path between the surfaces two hitboxes are standing on.
+
+        :param start: The hitbox of the agent.
+        :type start: pygame.Rect | Tuple[Any, ...]
+        :param goal: The hitbox to reach, e.g. the player's.
+        :type goal: pygame.Rect | Tuple[Any, ...]
+        :return: The edges to follow in order, or None if either hitbox is not on a
+            surface or the goal cannot be reached.
+        :rtype: Tuple[NavEdge, ...] | None
+        """
+
+        start_node = self.node_at(start)
+        goal_node = self.node_at(goal)
+        if start_node is None or goal_node is None:
+            return None
+        return self.path(start_node.index, goal_node.index)
+
+    def __len__(self) -> int:
+        """Gets the number of nodes.
+
+        :return: The number of nodes.
+        :rtype: int
+        """
+
+        return len(self.nodes)
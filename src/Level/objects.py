@@ -40,16 +40,20 @@ class Platform(Hitbox):
 
         super().__init__(xcor, ycor, width, height, has_collision, color)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the platform to the screen.
 
         :param screen: The screen to draw the platform.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         check_type(screen, pygame.Surface)
         pygame.draw.rect(
-            screen, self.color, (self.left, self.top, self.width, self.height)
+            screen,
+            self.color,
+            (self.left + offset[0], self.top + offset[1], self.width, self.height),
         )
 
 
@@ -89,39 +93,46 @@ class Spike(Hitbox):
             2 * self.height // 3,
         )
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the spike to the screen.
 
         :param screen: The screen to draw the spike.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         check_type(screen, pygame.Surface)
 
+        xcor = self.xcor + offset[0]
+        ycor = self.ycor + offset[1]
+
         # calculate the points of the spike
         p1: Tuple[Union[int, float], Union[int, float]] = (
-            self.xcor,
-            self.ycor + self.height,
+            xcor,
+            ycor + self.height,
         )
         p2: Tuple[Union[int, float], Union[int, float]] = (
-            self.xcor + self.width / 2,
-            self.ycor,
+            xcor + self.width / 2,
+            ycor,
         )
         p3: Tuple[Union[int, float], Union[int, float]] = (
-            self.xcor + self.width,
-            self.ycor + self.height,
+            xcor + self.width,
+            ycor + self.height,
         )
 
         pygame.draw.polygon(screen, self.color, (p1, p2, p3))
 
-    def draw_hitbox(self, screen: pygame.Surface) -> None:
+    def draw_hitbox(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the Spike's hitbox to the screen. Used for debugging.
 
         :param screen: The screen to draw to.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
-        pygame.draw.rect(screen, (255, 255, 255), self.hitbox)
+        pygame.draw.rect(screen, (255, 255, 255), self.hitbox.move(offset))
 
 
 class Lava(Hitbox):
@@ -154,17 +165,21 @@ class Lava(Hitbox):
 
         super().__init__(xcor, ycor, width, height, has_collision, color)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the Lava to the screen.
 
         :param screen: The screen to draw the Lava.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         check_type(screen, pygame.Surface)
 
         pygame.draw.rect(
-            screen, self.color, (self.left, self.top, self.width, self.height)
+            screen,
+            self.color,
+            (self.left + offset[0], self.top + offset[1], self.width, self.height),
         )
 
 
@@ -276,13 +291,15 @@ class Group:
                 if hasattr(obj, k):
                     setattr(obj, k, v)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws all drawable objects in the group to the screen.
 
         :param screen: The screen to draw the objects on.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the objects by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         for obj in self.objects.values():
             if hasattr(obj, "draw") and callable(obj.draw):
-                obj.draw(screen)
+                obj.draw(screen, offset)
@@ -0,0 +1,520 @@
+"""Level.tilemap.py
+
+Module containing the tile-grid representation of a stage.
+
+A TileMap stores one byte per lattice cell, so finding what a rect
+touches is a direct lookup of the cells under it instead of a loop
+over every object in the stage. Each cell also records which object
+it came from, so collisions still see the exact rects of the stage.
+"""
+
+import math
+import sys
+from array import array
+from typing import Any, Dict, List, Tuple
+
+import pygame
+
+from ..Internal import SCREEN_HEIGHT, SCREEN_WIDTH, TILE_SIZE, check_type
+from .objects import Group, Lava, Platform, Spike
+
+EMPTY = 0
+'''Tile code for an empty cell.
+'''
+PLATFORM = 1
+'''Tile code for a solid platform cell.
+'''
+SPIKE = 2
+'''Tile code for a spike cell.
+'''
+LAVA = 3
+'''Tile code for a lava cell.
+'''
+
+# when objects overlap, the tile with the higher priority wins the cell
+_PRIORITY: Dict[int, int] = {EMPTY: 0, SPIKE: 1, LAVA: 2, PLATFORM: 3}
+
+# the number of cells along each side of a rendering chunk
+CHUNK_CELLS = 8
+
+
+def _spike_hitbox(rect: pygame.Rect) -> pygame.Rect:
+    """Internal function that gets the damaging area of a spike, matching Spike.hitbox.
+
+    :param rect: The area of the spike.
+    :type rect: pygame.Rect
+    :return: The hitbox of the spike.
+    :rtype: pygame.Rect
+    """
+
+    return pygame.Rect(
+        rect.x + rect.width // 3,
+        rect.y + rect.height // 3,
+        rect.width // 3,
+        2 * rect.height // 3,
+    )
+
+
+def _draw_tile(
+    surface: pygame.Surface,
+    tile: int,
+    color: Tuple[int, int, int],
+    rect: pygame.Rect,
+) -> None:
+    """Internal function that draws one tile the same way its object draws itself.
+
+    :param surface: The surface to draw on.
+    :type surface: pygame.Surface
+    :param tile: The tile code to draw.
+    :type tile: int
+    :param color: The color of the tile.
+    :type color: Tuple[int, int, int]
+    :param rect: The area of the tile on the surface.
+    :type rect: pygame.Rect
+    """
+
+    if tile == SPIKE:
+        pygame.draw.polygon(
+            surface, color, (rect.bottomleft, (rect.centerx, rect.top), rect.bottomright)
+        )
+    else:
+        surface.fill(color, rect)
+
+
+class TileMap:
+    """Compact byte-per-cell representation of a stage."""
+
+    def __init__(
+        self,
+        columns: int,
+        rows: int,
+        tile_size: int = TILE_SIZE,
+    ) -> None:
+        """Initializer for a TileMap object.
+
+        :param columns: The number of cells along the x-axis.
+        :type columns: int
+        :param rows: The number of cells along the y-axis.
+        :type rows: int
+        :param tile_size: The size of one cell in pixels.
+        :type tile_size: int, optional
+        """
+
+        check_type(columns, int)
+        check_type(rows, int)
+        check_type(tile_size, int)
+
+        self.columns: int = columns
+        self.rows: int = rows
+        self.tile_size: int = tile_size
+
+        # the tile code of each cell, and the id of the object that owns it (0 for none), in
+        # 4 bytes so a map can hold up to 4,294,967,295 objects, where 2 bytes stopped at 65,535
+        self.cells: bytearray = bytearray(columns * rows)
+        self.owners: array = array("I", bytes(columns * rows * array("I").itemsize))
+
+        # the objects of the map as (tile, rect, color), an object's id is its index + 1
+        self.objects: List[Tuple[int, pygame.Rect, Tuple[int, int, int]]] = []
+
+        # ids of objects that are checked directly instead of through their cells
+        self.overflow: List[int] = []
+
+        self.palette: Dict[int, Tuple[int, int, int]] = {
+            PLATFORM: (0, 0, 255),
+            SPIKE: (255, 128, 0),
+            LAVA: (255, 0, 0),
+        }
+
+        # chunk -> render scale -> the rendered chunk at that scale
+        self._chunks: Dict[Tuple[int, int], Dict[float, pygame.Surface | None]] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the map's cells, object list and rendered chunks, in bytes."""
+
+        size = len(self.cells) + self.owners.itemsize * len(self.owners)
+        size += sys.getsizeof(self.objects) + sys.getsizeof(self.overflow)
+        for scales in self._chunks.values():
+            for chunk in scales.values():
+                if chunk is not None:
+                    size += chunk.get_pitch() * chunk.get_height()
+        return size
+
+    @classmethod
+    def from_groups(
+        cls,
+        platforms: Group,
+        spikes: Group | None = None,
+        lavas: Group | None = None,
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+        tile_size: int = TILE_SIZE,
+    ) -> "TileMap":
+        """Creates a TileMap from the object Groups of a stage.
+
+        :param platforms: The Group of Platform objects.
+        :type platforms: Group
+        :param spikes: The Group of Spike objects.
+        :type spikes: Group | None, optional
+        :param lavas: The Group of Lava objects.
+        :type lavas: Group | None, optional
+        :param width: The width of the room in pixels.
+        :type width: int, optional
+        :param height: The height of the room in pixels.
+        :type height: int, optional
+        :param tile_size: The size of one cell in pixels.
+        :type tile_size: int, optional
+        :return: The created TileMap.
+        :rtype: TileMap
+        """
+
+        tilemap = cls(-(-width // tile_size), -(-height // tile_size), tile_size)
+
+        for group, obj_type, tile in (
+            (platforms, Platform, PLATFORM),
+            (spikes, Spike, SPIKE),
+            (lavas, Lava, LAVA),
+        ):
+            if group is None:
+                continue
+
+            check_type(group, Group)
+            for obj in group:
+                check_type(obj, obj_type)
+                if obj.has_collision:
+                    tilemap.add(obj, tile, obj.color)
+
+        return tilemap
+
+    @classmethod
+    def from_stage(
+        cls, stage: Tuple[Any, ...], width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT
+    ) -> "TileMap":
+        """Creates a TileMap from a stage tuple in the format used by Stages.
+
+        :param stage: The stage to convert.
+        :type stage: Tuple[Any, ...]
+        :param width: The width of the room in pixels.
+        :type width: int, optional
+        :param height: The height of the room in pixels.
+        :type height: int, optional
+        :return: The created TileMap.
+        :rtype: TileMap
+        """
+
+        return cls.from_groups(stage[1], stage[2], stage[3], width, height)
+
+    # cell access
+
+    def get(self, column: int, row: int) -> int:
+        """Gets the tile at the given cell. Cells outside the map are empty.
+
+        :param column: The column of the cell.
+        :type column: int
+        :param row: The row of the cell.
+        :type row: int
+        :return: The tile code of the cell.
+        :rtype: int
+        """
+
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return self.cells[row * self.columns + column]
+        return EMPTY
+
+    def set(self, column: int, row: int, tile: int) -> None:
+        """Sets the tile at the given cell. The cell no longer belongs to any object.
+
+        :param column: The column of the cell.
+        :type column: int
+        :param row: The row of the cell.
+        :type row: int
+        :param tile: The tile code to set.
+        :type tile: int
+        """
+
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            raise IndexError(f"Cell ({column}, {row}) is outside the tilemap.")
+
+        index = row * self.columns + column
+        self.cells[index] = tile
+        self.owners[index] = 0
+        self._chunks.pop((column // CHUNK_CELLS, row // CHUNK_CELLS), None)
+
+    def cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Gets the range of cells covered by the rect, clipped to the map.
+
+        :param rect: The rect to look up.
+        :type rect: pygame.Rect
+        :return: The first column, first row, last column + 1 and last row + 1.
+        :rtype: Tuple[int, int, int, int]
+        """
+
+        size = self.tile_size
+        return (
+            max(rect.left // size, 0),
+            max(rect.top // size, 0),
+            min(-(-rect.right // size), self.columns),
+            min(-(-rect.bottom // size), self.rows),
+        )
+
+    def is_aligned(self, rect: pygame.Rect) -> bool:
+        """Checks if the rect lies exactly on the lattice.
+
+        :param rect: The rect to check.
+        :type rect: pygame.Rect
+        :return: Whether every side of the rect is on a cell boundary.
+        :rtype: bool
+        """
+
+        size = self.tile_size
+        return not (rect.x % size or rect.y % size or rect.width % size or rect.height % size)
+
+    def add(
+        self,
+        rect: pygame.Rect,
+        tile: int,
+        color: Tuple[int, int, int] | None = None,
+    ) -> None:
+        """Adds an object to the map.
+
+        Objects aligned to the lattice are written onto every cell they cover.
+        Objects that are not aligned or that stick out of the map are kept in
+        the overflow list and checked directly. A map holds at most
+        4,294,967,295 objects.
+
+        :param rect: The area of the object.
+        :type rect: pygame.Rect
+        :param tile: The tile code of the object.
+        :type tile: int
+        :param color: The color of the object, defaults to the palette color of the tile.
+        :type color: Tuple[int, int, int] | None, optional
+        """
+
+        self.objects.append((tile, pygame.Rect(rect), color or self.palette[tile]))
+        obj_id = len(self.objects)
+
+        size = self.tile_size
+        if not pygame.Rect(0, 0, self.columns * size, self.rows * size).contains(rect):
+            self.overflow.append(obj_id)
+
+        if not self.is_aligned(rect):
+            if obj_id not in self.overflow:
+                self.overflow.append(obj_id)
+            self._chunks.clear()
+            return
+
+        col_start, row_start, col_end, row_end = self.cell_range(rect)
+        for row in range(row_start, row_end):
+            for column in range(col_start, col_end):
+                index = row * self.columns + column
+                if _PRIORITY[tile] >= _PRIORITY[self.cells[index]]:
+                    self.cells[index] = tile
+                    self.owners[index] = obj_id
+
+        self._chunks.clear()
+
+    # collision
+
+    def candidates(self, rect: pygame.Rect, tile: int) -> List[pygame.Rect]:
+        """Gets the rects of the objects of the given tile type near the rect.
+
+        Only the cells under the rect are looked at. The rects are returned
+        in the order their objects were added to the map.
+
+        :param rect: The rect to look up.
+        :type rect: pygame.Rect
+        :param tile: The tile code to look for.
+        :type tile: int
+        :return: The rects of the matching objects.
+        :rtype: List[pygame.Rect]
+        """
+
+        ids = set()
+        col_start, row_start, col_end, row_end = self.cell_range(rect)
+        for row in range(row_start, row_end):
+            offset = row * self.columns
+            for column in range(col_start, col_end):
+                if self.cells[offset + column] == tile:
+                    ids.add(self.owners[offset + column])
+
+        for obj_id in self.overflow:
+            if self.objects[obj_id - 1][0] == tile:
+                ids.add(obj_id)
+
+        size = self.tile_size
+        rects: List[pygame.Rect] = []
+        for obj_id in sorted(ids):
+            if obj_id:
+                rects.append(self.objects[obj_id - 1][1])
+
+        # cells that were set by hand have no object and collide as single cells
+        if 0 in ids:
+            for row in range(row_start, row_end):
+                offset = row * self.columns
+                for column in range(col_start, col_end):
+                    if self.cells[offset + column] == tile and not self.owners[offset + column]:
+                        rects.append(pygame.Rect(column * size, row * size, size, size))
+
+        return rects
+
+    def solid_rects(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Gets the solid areas that may collide with the rect.
+
+        :param rect: The rect to look up.
+        :type rect: pygame.Rect
+        :return: The solid rects near the rect.
+        :rtype: List[pygame.Rect]
+        """
+
+        return self.candidates(rect, PLATFORM)
+
+    def touches_spike(self, rect: pygame.Rect) -> bool:
+        """Checks if the rect collides with the hitbox of any spike.
+
+        :param rect: The rect to check.
+        :type rect: pygame.Rect
+        :return: Whether the rect collides with a spike.
+        :rtype: bool
+        """
+
+        for spike in self.candidates(rect, SPIKE):
+            if rect.colliderect(_spike_hitbox(spike)):
+                return True
+        return False
+
+    def touches_lava(self, rect: pygame.Rect) -> bool:
+        """Checks if the rect collides with any lava.
+
+        :param rect: The rect to check.
+        :type rect: pygame.Rect
+        :return: Whether the rect collides with lava.
+        :rtype: bool
+        """
+
+        for lava in self.candidates(rect, LAVA):
+            if rect.colliderect(lava):
+                return True
+        return False
+
+    # rendering
+
+    def _render_chunk(self, chunk_x: int, chunk_y: int) -> pygame.Surface | None:
+        """Internal method that pre-renders one chunk of the map.
+
+        :param chunk_x: The x index of the chunk.
+        :type chunk_x: int
+        :param chunk_y: The y index of the chunk.
+        :type chunk_y: int
+        :return: The rendered chunk, or None if the chunk is empty.
+        :rtype: pygame.Surface | None
+        """
+
+        size = self.tile_size
+        chunk_size = CHUNK_CELLS * size
+        chunk_rect = pygame.Rect(
+            chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size
+        )
+
+        # objects are drawn whole and in the order they were added,
+        # so the chunk looks the same as drawing the objects one by one
+        ids = set(self.overflow)
+        loose_cells: List[Tuple[int, int, int]] = []
+        col_start, row_start, col_end, row_end = self.cell_range(chunk_rect)
+        for row in range(row_start, row_end):
+            for column in range(col_start, col_end):
+                index = row * self.columns + column
+                if self.owners[index]:
+                    ids.add(self.owners[index])
+                elif self.cells[index]:
+                    loose_cells.append((column, row, self.cells[index]))
+
+        surface = pygame.Surface((chunk_size, chunk_size), pygame.SRCALPHA)
+        empty = True
+
+        for obj_id in sorted(ids):
+            tile, rect, color = self.objects[obj_id - 1]
+            if chunk_rect.colliderect(rect):
+                empty = False
+                _draw_tile(surface, tile, color, rect.move(-chunk_rect.x, -chunk_rect.y))
+
+        for column, row, tile in loose_cells:
+            empty = False
+            _draw_tile(
+                surface,
+                tile,
+                self.palette[tile],
+                pygame.Rect(column * size - chunk_rect.x, row * size - chunk_rect.y, size, size),
+            )
+
+        return None if empty else surface
+
+    def _chunk(self, chunk_x: int, chunk_y: int, scale: float) -> pygame.Surface | None:
+        """Internal method that gets a rendered chunk, rendering and scaling it if needed.
+
+        :param chunk_x: The x index of the chunk.
+        :type chunk_x: int
+        :param chunk_y: The y index of the chunk.
+        :type chunk_y: int
+        :param scale: The render scale.
+        :type scale: float
+        :return: The chunk at the scale, or None if the chunk is empty.
+        :rtype: pygame.Surface | None
+        """
+
+        scales = self._chunks.setdefault((chunk_x, chunk_y), {})
+        if scale not in scales:
+            if 1 not in scales:
+                scales[1] = self._render_chunk(chunk_x, chunk_y)
+
+            chunk = scales[1]
+            if chunk is not None and scale != 1:
+                # rounded up so neighbouring chunks never leave a gap between them
+                size = math.ceil(chunk.get_width() * scale)
+                chunk = pygame.transform.scale(chunk, (size, size))
+            scales[scale] = chunk
+
+        return scales[scale]
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        offset: Tuple[int, int] = (0, 0),
+        viewport: pygame.Rect | None = None,
+        scale: float = 1,
+    ) -> None:
+        """Draws the map to the screen one pre-rendered chunk at a time.
+
+        :param screen: The screen to draw on.
+        :type screen: pygame.Surface
+        :param offset: The amount to shift the map by, from the camera.
+        :type offset: Tuple[int, int], optional
+        :param viewport: The visible part of the room. Chunks outside it are skipped.
+        :type viewport: pygame.Rect | None, optional
+        :param scale: The render scale of the screen, 1 for full resolution.
+        :type scale: float, optional
+        """
+
+        check_type(screen, pygame.Surface)
+
+        chunk_size = CHUNK_CELLS * self.tile_size
+        chunks_x = -(-self.columns // CHUNK_CELLS)
+        chunks_y = -(-self.rows // CHUNK_CELLS)
+
+        x_start, y_start, x_end, y_end = 0, 0, chunks_x, chunks_y
+        if viewport is not None:
+            x_start = max(viewport.left // chunk_size, 0)
+            y_start = max(viewport.top // chunk_size, 0)
+            x_end = min(-(-viewport.right // chunk_size), chunks_x)
+            y_end = min(-(-viewport.bottom // chunk_size), chunks_y)
+
+        for chunk_y in range(y_start, y_end):
+            for chunk_x in range(x_start, x_end):
+                chunk = self._chunk(chunk_x, chunk_y, scale)
+                if chunk is not None:
+                    screen.blit(
+                        chunk,
+                        (
+                            round((chunk_x * chunk_size + offset[0]) * scale),
+                            round((chunk_y * chunk_size + offset[1]) * scale),
+                        ),
+                    )
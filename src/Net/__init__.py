@@ -0,0 +1,18 @@
+"""Net
+
+The Net package contains the ghost stream, which sends snapshots of the
+player to another local game or a recording and draws the ghost of a
+run received from one.
+"""
+
+from .codec import POSITION_SCALE, GhostDecoder, GhostEncoder, GhostState
+from .ghost import (
+    DELAY,
+    KEY_INTERVAL,
+    SEND_INTERVAL,
+    TIMEOUT,
+    GhostReceiver,
+    GhostSender,
+    load_recording,
+    play_recording,
+)
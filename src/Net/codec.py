@@ -0,0 +1,244 @@
+"""Net.codec.py
+
+Module containing the packet format of ghost state.
+
+Every packet carries one snapshot of the ghost: the bottom center of the
+player, the way it faces and the grid location of its room. Positions
+are quantized to POSITION_SCALE steps per pixel. A key packet holds the
+whole snapshot, a delta packet only the change since the last key
+packet, written as zigzag varints, which is a byte or two for each value.
+
+    header   flags, session, sequence
+    key      frame, x, y, grid x, grid y
+    delta    packets since the key, then the change in frame, x and y since it
+
+Deltas are taken from the last key instead of the packet before them, so
+a lost delta only loses its own snapshot. A lost key drops the deltas
+after it until the next key, which the encoder sends every few packets
+and whenever the ghost changes rooms.
+"""
+
+import struct
+from typing import NamedTuple, Tuple
+
+from ..Internal import check_range, check_type
+
+POSITION_SCALE = 2
+'''The number of quantization steps in a pixel.
+'''
+
+KEY = 1
+'''The flag of a packet that holds a whole snapshot.
+'''
+FACING_RIGHT = 2
+'''The flag of a snapshot that faces right.
+'''
+
+_HEADER = struct.Struct("<BBH")
+_KEY = struct.Struct("<Iiibb")
+
+
+class GhostState(NamedTuple):
+    """One snapshot of a ghost."""
+
+    frame: int
+    '''The frame of the run the snapshot was taken on.
+    '''
+    xcor: float
+    '''The x position of the bottom center of the player.
+    '''
+    ycor: float
+    '''The y position of the bottom center of the player.
+    '''
+    facing_right: bool  # pylint: disable=invalid-name
+    '''Whether the player faces right.
+    '''
+    grid: Tuple[int, int]
+    '''The grid location of the player's room.
+    '''
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Internal function that appends a signed value as a zigzag varint.
+
+    :param out: The bytes to append to.
+    :type out: bytearray
+    :param value: The value.
+    :type value: int
+    """
+
+    value = value * 2 if value >= 0 else -value * 2 - 1
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Internal function that reads a zigzag varint.
+
+    :param data: The bytes to read from.
+    :type data: bytes
+    :param offset: The index of the first byte of the varint.
+    :type offset: int
+    :raises ValueError: If the data ends inside the varint.
+    :return: The value and the index after the varint.
+    :rtype: Tuple[int, int]
+    """
+
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Ghost packet is truncated.")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (value >> 1) ^ -(value & 1), offset
+
+
+class GhostEncoder:
+    """Turns the snapshots of one run into packets."""
+
+    def __init__(self, session: int, key_interval: int = 10) -> None:
+        """Initializer for a GhostEncoder object.
+
+        :param session: The id of the run, so a receiver can tell a new run from an old one.
+        :type session: int
+        :param key_interval: The number of packets between key packets.
+        :type key_interval: int, optional
+        """
+
+        check_type(session, int)
+        check_range(session, 0, 255)
+        check_type(key_interval, int)
+        check_range(key_interval, 1, 0xFFFF)
+
+        self.session: int = session
+        self.key_interval: int = key_interval
+        self.sequence: int = 0
+
+        # the sequence and quantized snapshot of the last key, which deltas are taken from
+        self._key_sequence: int = 0
+        self._key: Tuple[int, int, int, Tuple[int, int]] | None = None
+
+    def encode(self, state: GhostState) -> bytes:
+        """Encodes a snapshot as a key or delta packet.
+
+        :param state: The snapshot, taken later than the last one encoded.
+        :type state: GhostState
+        :return: The packet.
+        :rtype: bytes
+        """
+
+        check_type(state, GhostState)
+
+        quantized = (
+            state.frame,
+            round(state.xcor * POSITION_SCALE),
+            round(state.ycor * POSITION_SCALE),
+            state.grid,
+        )
+        base = self._key
+        key = (
+            base is None
+            or (self.sequence - self._key_sequence) & 0xFFFF >= self.key_interval
+            or quantized[3] != base[3]
+            or quantized[0] < base[0]
+        )
+
+        flags = (KEY if key else 0) | (FACING_RIGHT if state.facing_right else 0)
+        packet = bytearray(_HEADER.pack(flags, self.session, self.sequence))
+        if key:
+            packet += _KEY.pack(*quantized[:3], *state.grid)
+            self._key_sequence = self.sequence
+            self._key = quantized
+        else:
+            _write_varint(packet, (self.sequence - self._key_sequence) & 0xFFFF)
+            _write_varint(packet, quantized[0] - base[0])
+            _write_varint(packet, quantized[1] - base[1])
+            _write_varint(packet, quantized[2] - base[2])
+
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        return bytes(packet)
+
+
+class GhostDecoder:
+    """Turns the packets of a run back into snapshots."""
+
+    def __init__(self) -> None:
+        """Initializer for a GhostDecoder object."""
+
+        self.session: int | None = None
+        self.sequence: int = 0
+
+        # the sequence and quantized snapshot of the last key, which deltas are taken from
+        self._key_sequence: int = 0
+        self._key: Tuple[int, int, int, Tuple[int, int]] | None = None
+
+        # the packets that arrived late, or whose key was lost
+        self.dropped: int = 0
+
+    def decode(self, packet: bytes) -> GhostState | None:
+        """Decodes a packet.
+
+        :param packet: The packet.
+        :type packet: bytes
+        :raises ValueError: If the packet is not a ghost packet.
+        :return: The snapshot, or None if the packet is late or its key was lost.
+        :rtype: GhostState | None
+        """
+
+        if len(packet) < _HEADER.size:
+            raise ValueError("Ghost packet is truncated.")
+        flags, session, sequence = _HEADER.unpack_from(packet)
+
+        # a packet that is not newer than the last one decoded arrived out of order,
+        # unless it is the key of a new session
+        late = (
+            self._key is not None
+            and session == self.session
+            and (sequence - self.sequence - 1) & 0xFFFF >= 0x8000
+        )
+
+        if flags & KEY:
+            if len(packet) != _HEADER.size + _KEY.size:
+                raise ValueError("Ghost key packet has the wrong size.")
+            if late:
+                self.dropped += 1
+                return None
+            frame, xcor, ycor, grid_x, grid_y = _KEY.unpack_from(packet, _HEADER.size)
+            self.session = session
+            self._key_sequence = sequence
+            self._key = (frame, xcor, ycor, (grid_x, grid_y))
+            snapshot = self._key
+        else:
+            since_key, offset = _read_varint(packet, _HEADER.size)
+            frames, offset = _read_varint(packet, offset)
+            delta_x, offset = _read_varint(packet, offset)
+            delta_y, offset = _read_varint(packet, offset)
+            if offset != len(packet):
+                raise ValueError("Ghost delta packet has trailing bytes.")
+            if (
+                late
+                or session != self.session
+                or self._key is None
+                or (sequence - since_key) & 0xFFFF != self._key_sequence
+            ):
+                self.dropped += 1
+                return None
+            frame, xcor, ycor, grid = self._key
+            snapshot = (frame + frames, xcor + delta_x, ycor + delta_y, grid)
+
+        self.sequence = sequence
+        frame, xcor, ycor, grid = snapshot
+        return GhostState(
+            frame,
+            xcor / POSITION_SCALE,
+            ycor / POSITION_SCALE,
+            bool(flags & FACING_RIGHT),
+            grid,
+        )
@@ -0,0 +1,381 @@
+"""Net.ghost.py
+
+Module containing the ghost sender and receiver, which show another run
+next to the player.
+
+The sender sends a snapshot of the player every SEND_INTERVAL frames
+over UDP, and can write the same packets to a recording. The receiver
+reads the packets without blocking and shows the ghost DELAY frames
+behind the newest snapshot, interpolating between the snapshots on
+either side, so it moves smoothly although snapshots are sparse and
+some are lost. At the default interval the stream is about 10 packets of
+9 bytes a second, a few hundred bytes a second with the UDP headers.
+"""
+
+import collections
+import os
+import random
+import socket
+import struct
+import time
+from typing import IO, Deque, List, Tuple
+
+import pygame
+
+from ..Internal import check_type, interp
+from ..Player import Player
+from ..Render import LAYER_PLAYER, RenderQueue
+from .codec import GhostDecoder, GhostEncoder, GhostState
+
+SEND_INTERVAL = 6
+'''The number of frames between snapshots sent.
+'''
+KEY_INTERVAL = 10
+'''The number of packets between key packets, which a receiver can recover from a loss at.
+'''
+DELAY = 15
+'''The number of frames the ghost is shown behind the newest snapshot received.
+'''
+TIMEOUT = 120
+'''The number of frames without a snapshot after which the ghost is hidden.
+'''
+MAX_PACKET = 64
+'''The size of the largest packet read, which is larger than any ghost packet.
+'''
+
+MAGIC = b"UMGH"
+'''The bytes every ghost recording starts with.
+'''
+VERSION = 1
+'''The version of the recording format written by this module.
+'''
+
+_RECORDING_HEADER = struct.Struct("<4sH")
+_RECORDED_PACKET = struct.Struct("<IB")
+
+Address = Tuple[str, int]
+
+
+class GhostSender:
+    """Sends snapshots of the player to a receiver and to a recording."""
+
+    def __init__(
+        self,
+        address: Address | None,
+        recording: str | None = None,
+        interval: int = SEND_INTERVAL,
+        key_interval: int = KEY_INTERVAL,
+    ) -> None:
+        """Initializer for a GhostSender object.
+
+        :param address: The host and port to send to, or None to only record.
+        :type address: Address | None
+        :param recording: The path of the recording to write, or None to not record.
+        :type recording: str | None, optional
+        :param interval: The number of frames between snapshots.
+        :type interval: int, optional
+        :param key_interval: The number of packets between key packets.
+        :type key_interval: int, optional
+        """
+
+        check_type(interval, int)
+
+        self.address: Address | None = address
+        self.interval: int = interval
+        self.encoder: GhostEncoder = GhostEncoder(random.randrange(256), key_interval)
+
+        self.socket: socket.socket | None = None
+        if address is not None:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setblocking(False)
+
+        self.recording: IO[bytes] | None = None
+        if recording is not None:
+            directory = os.path.dirname(recording)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # pylint: disable-next=consider-using-with
+            self.recording = open(recording, "wb")
+            self.recording.write(_RECORDING_HEADER.pack(MAGIC, VERSION))
+
+        self.frame: int = 0
+        self._grid: Tuple[int, int] | None = None
+
+        self.packets_sent: int = 0
+        self.bytes_sent: int = 0
+
+    def update(self, plr: Player) -> None:
+        """Counts a frame and sends a snapshot of the player if one is due.
+
+        A snapshot is also sent right away when the player changes rooms.
+        Call it once per frame, after the player has updated.
+
+        :param plr: The player.
+        :type plr: Player
+        """
+
+        grid = (plr.grid_xcor, plr.grid_ycor)
+        due = self.frame % self.interval == 0 or grid != self._grid
+        self.frame += 1
+        if not due:
+            return
+
+        self._grid = grid
+        self.send(
+            self.encoder.encode(
+                GhostState(
+                    self.frame,
+                    plr.xcor + plr.width / 2,
+                    plr.ycor + plr.height,
+                    plr.facing_right,
+                    grid,
+                )
+            )
+        )
+
+    def send(self, packet: bytes) -> None:
+        """Sends a packet and writes it to the recording.
+
+        :param packet: The packet.
+        :type packet: bytes
+        """
+
+        if self.recording is not None:
+            self.recording.write(_RECORDED_PACKET.pack(self.frame, len(packet)) + packet)
+
+        if self.socket is not None:
+            try:
+                self.socket.sendto(packet, self.address)
+            except OSError:
+                # nothing listening, or the buffer is full, the ghost recovers at the next key
+                return
+        self.packets_sent += 1
+        self.bytes_sent += len(packet)
+
+    def close(self) -> None:
+        """Closes the socket and the recording."""
+
+        if self.socket is not None:
+            self.socket.close()
+        if self.recording is not None:
+            self.recording.close()
+
+
+def load_recording(path: str) -> List[Tuple[int, bytes]]:
+    """Reads the packets of a ghost recording.
+
+    :param path: The path of the recording.
+    :type path: str
+    :raises ValueError: If the file is not a ghost recording.
+    :return: The frame each packet was sent on, and the packet.
+    :rtype: List[Tuple[int, bytes]]
+    """
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < _RECORDING_HEADER.size:
+        raise ValueError("Ghost recording is truncated.")
+    magic, version = _RECORDING_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a ghost recording, or an unsupported version.")
+
+    packets = []
+    offset = _RECORDING_HEADER.size
+    # a recording cut short by a crash keeps every packet written before it
+    while offset + _RECORDED_PACKET.size <= len(data):
+        frame, size = _RECORDED_PACKET.unpack_from(data, offset)
+        offset += _RECORDED_PACKET.size
+        if offset + size > len(data):
+            break
+        packets.append((frame, data[offset : offset + size]))
+        offset += size
+    return packets
+
+
+def play_recording(path: str, address: Address, fps: float = 60) -> None:
+    """Sends the packets of a recording to a receiver at the pace they were recorded.
+
+    :param path: The path of the recording.
+    :type path: str
+    :param address: The host and port to send to.
+    :type address: Address
+    :param fps: The frame rate the recording was made at.
+    :type fps: float, optional
+    """
+
+    packets = load_recording(path)
+    if not packets:
+        return
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        start = time.perf_counter() - packets[0][0] / fps
+        for frame, packet in packets:
+            delay = start + frame / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sock.sendto(packet, address)
+
+
+# pylint: disable=too-many-instance-attributes
+class GhostReceiver:
+    """Receives the snapshots of another run and draws its ghost."""
+
+    def __init__(
+        self,
+        address: Address,
+        sprite: pygame.Surface,
+        delay: int = DELAY,
+        timeout: int = TIMEOUT,
+    ) -> None:
+        """Initializer for a GhostReceiver object.
+
+        :param address: The host and port to listen on. Port 0 picks a free port.
+        :type address: Address
+        :param sprite: The ghost facing right. It is drawn with its bottom center on the
+            ghost's position.
+        :type sprite: pygame.Surface
+        :param delay: The number of frames the ghost is shown behind the newest snapshot.
+        :type delay: int, optional
+        :param timeout: The number of frames without a snapshot after which the ghost is
+            hidden.
+        :type timeout: int, optional
+        """
+
+        check_type(sprite, pygame.Surface)
+        check_type(delay, int)
+        check_type(timeout, int)
+
+        self.socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(address)
+        self.socket.setblocking(False)
+
+        self.sprites: Tuple[pygame.Surface, pygame.Surface] = (
+            pygame.transform.flip(sprite, True, False),
+            sprite,
+        )
+        self.delay: int = delay
+        self.timeout: int = timeout
+
+        self.decoder: GhostDecoder = GhostDecoder()
+        self.snapshots: Deque[GhostState] = collections.deque(maxlen=64)
+
+        # the frame of the other run that is shown, and the ghost at that frame
+        self.clock: int | None = None
+        self.state: GhostState | None = None
+        self._idle: int = 0
+
+        self.bytes_received: int = 0
+        self.invalid: int = 0
+
+    @property
+    def address(self) -> Address:
+        """The host and port the receiver listens on."""
+
+        return self.socket.getsockname()
+
+    def poll(self) -> None:
+        """Reads every packet that has arrived, without blocking."""
+
+        while True:
+            try:
+                packet = self.socket.recv(MAX_PACKET)
+            except OSError:
+                # nothing left to read, or an error from an earlier send on windows
+                break
+
+            self.bytes_received += len(packet)
+            try:
+                state = self.decoder.decode(packet)
+            except ValueError:
+                self.invalid += 1
+                continue
+            if state is None:
+                continue
+
+            # a frame that is not later than the last one is a new run
+            if self.snapshots and state.frame <= self.snapshots[-1].frame:
+                self.snapshots.clear()
+                self.clock = None
+            self.snapshots.append(state)
+            self._idle = 0
+
+    def update(self) -> None:
+        """Advances the ghost by a frame and interpolates its position.
+
+        Call it once per frame, after poll.
+        """
+
+        self._idle += 1
+        snapshots = self.snapshots
+        if not snapshots or self._idle > self.timeout:
+            self.state = None
+            return
+
+        newest = snapshots[-1].frame
+        clock = newest - self.delay if self.clock is None else self.clock + 1
+        # catch up after a hitch, and wait at the newest snapshot when they stop coming
+        if newest - clock > self.delay * 2:
+            clock = newest - self.delay
+        clock = min(clock, newest)
+        self.clock = clock
+
+        # the snapshots before the one the clock is in are no longer needed
+        while len(snapshots) > 1 and snapshots[1].frame <= clock:
+            snapshots.popleft()
+
+        before = snapshots[0]
+        if len(snapshots) == 1 or clock <= before.frame:
+            self.state = before
+            return
+
+        after = snapshots[1]
+        if after.grid != before.grid:
+            # never slide the ghost across the screen when it changes rooms
+            self.state = before
+            return
+
+        t = (clock - before.frame) / (after.frame - before.frame)
+        self.state = GhostState(
+            clock,
+            interp.lerp(before.xcor, after.xcor, t),
+            interp.lerp(before.ycor, after.ycor, t),
+            before.facing_right,
+            before.grid,
+        )
+
+    def queue(
+        self,
+        render_queue: RenderQueue,
+        grid: Tuple[int, int],
+        offset: Tuple[int, int] = (0, 0),
+        layer: int = LAYER_PLAYER,
+    ) -> None:
+        """Queues the ghost if it is in the room being shown.
+
+        :param render_queue: The queue to draw with.
+        :type render_queue: RenderQueue
+        :param grid: The grid location of the room being shown.
+        :type grid: Tuple[int, int]
+        :param offset: The amount to shift the ghost by, from the camera.
+        :type offset: Tuple[int, int], optional
+        :param layer: The layer of the ghost.
+        :type layer: int, optional
+        """
+
+        state = self.state
+        if state is None or state.grid != grid:
+            return
+
+        sprite = self.sprites[state.facing_right]
+        width, height = sprite.get_size()
+        render_queue.sprite(
+            sprite,
+            (int(state.xcor - width / 2) + offset[0], int(state.ycor - height) + offset[1]),
+            layer,
+        )
+
+    def close(self) -> None:
+        """Closes the socket."""
+
+        self.socket.close()
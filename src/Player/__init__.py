@@ -3,4 +3,7 @@
 Package containing player functionality.
 """
 
-from .player import Player
+from . import snapshot
+from .controls import KEY_ACTIONS, Controls, actions_from_keys
+from .inputs import InputFrame, InputSampler
+from .player import Player, new_player
@@ -0,0 +1,145 @@
+"""Player/controls.py
+
+Module containing the player controls, which turn input into player
+actions. Jumps and dashes happen on the frame their key is pressed,
+found from the actions held on the previous frame, so holding a key
+does not repeat them.
+"""
+
+from typing import Callable, Dict
+
+import pygame
+
+from ..Internal import Timer, check_type, interp
+from .player import Player
+
+# action bits, combined into one int for each frame of input
+LEFT = 1
+'''Action bit for walking left.
+'''
+RIGHT = 2
+'''Action bit for walking right.
+'''
+JUMP = 4
+'''Action bit for jumping and double jumping.
+'''
+DASH = 8
+'''Action bit for dashing.
+'''
+RESTART = 16
+'''Action bit for restarting after dying.
+'''
+MAP = 32
+'''Action bit for opening and closing the world map.
+'''
+
+DASH_COOLDOWN = 24
+'''The number of frames after a dash before the next one, once the player is on the ground.
+'''
+
+KEY_ACTIONS: Dict[int, int] = {
+    pygame.K_a: LEFT,
+    pygame.K_LEFT: LEFT,
+    pygame.K_d: RIGHT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_w: JUMP,
+    pygame.K_UP: JUMP,
+    pygame.K_SPACE: JUMP,
+    pygame.K_LSHIFT: DASH,
+    pygame.K_r: RESTART,
+    pygame.K_m: MAP,
+}
+'''The action bit of each bound key.
+'''
+
+
+def actions_from_keys(keys: pygame.key.ScancodeWrapper) -> int:
+    """Gets the action bits for the currently pressed keys.
+
+    :param keys: The pressed keys, from pygame.key.get_pressed.
+    :type keys: pygame.key.ScancodeWrapper
+    :return: The action bits of the pressed keys.
+    :rtype: int
+    """
+
+    actions = 0
+    for key, action in KEY_ACTIONS.items():
+        if keys[key]:
+            actions |= action
+    return actions
+
+
+class Controls:
+    """Applies actions to a Player and keeps track of the dash cooldown."""
+
+    def __init__(self) -> None:
+        """Initializer for a Controls object."""
+
+        # the action bits held on the previous frame, to find the keys pressed this frame
+        self.previous: int = 0
+
+        # the dash recharges once its cooldown is over and the player is on the ground
+        self.dash_charged: bool = True
+        self.dash_timer: Timer | None = None
+
+        # called with the player when a dash starts
+        self.on_dash: Callable[[Player], None] | None = None
+
+    def apply(self, plr: Player, actions: int, dt: float, pressed: int | None = None) -> None:
+        """Applies the actions of one frame to the player. Runs before the player update.
+
+        :param plr: The player to control.
+        :type plr: Player
+        :param actions: The action bits held this frame.
+        :type actions: int
+        :param dt: Delta time.
+        :type dt: float
+        :param pressed: The action bits pressed since the last frame, from key events, so
+            presses released before the frame are not missed. Defaults to the actions
+            held this frame that were not held on the previous one.
+        :type pressed: int | None, optional
+        """
+
+        check_type(actions, int)
+
+        if pressed is None:
+            pressed = actions & ~self.previous
+        self.previous = actions
+
+        # walking
+        if actions & LEFT:
+            plr.move_left(dt)
+        if actions & RIGHT:
+            plr.move_right(dt)
+
+        # jumping, a press in the air is the double jump
+        if pressed & JUMP:
+            if plr.on_ground:
+                plr.jump()
+            else:
+                plr.double_jump()
+
+        # dashing
+        if pressed & DASH and self.dash_charged:
+            if plr.facing_right:
+                plr.moveto(plr.xcor + 150, plr.ycor, 0.2, interp.ease_out_circ, False)
+            if plr.facing_left:
+                plr.moveto(plr.xcor - 150, plr.ycor, 0.2, interp.ease_out_circ, False)
+            self.dash_timer = plr.timers.schedule(DASH_COOLDOWN)
+            self.dash_charged = False
+
+            if self.on_dash is not None:
+                self.on_dash(plr)
+
+    def release(self, plr: Player) -> None:
+        """Recharges the dash once its cooldown is over. Runs after the player update.
+
+        :param plr: The player being controlled.
+        :type plr: Player
+        """
+
+        if self.dash_charged or not plr.on_ground:
+            return
+        if self.dash_timer is None or not self.dash_timer.active:
+            self.dash_charged = True
+            self.dash_timer = None
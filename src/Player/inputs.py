@@ -0,0 +1,138 @@
+"""Player/inputs.py
+
+Module containing the input sampler, which reads the keyboard for the
+gameloop.
+
+Events are polled throughout the wait for the next frame instead of
+once at its start, so each key event is timestamped close to when it
+arrived. The held keys are read at the last moment before the frame
+is simulated, and presses come from the key events, so a key tapped
+and released between two frames still counts as pressed.
+"""
+
+import time
+from typing import List
+
+import pygame
+
+from .controls import KEY_ACTIONS, actions_from_keys
+
+
+class InputFrame:  # pylint: disable=too-few-public-methods
+    """The input of one frame."""
+
+    def __init__(
+        self,
+        held: int,
+        pressed: int,
+        keys: pygame.key.ScancodeWrapper,
+        times: List[float],
+        quit_requested: bool,
+    ) -> None:
+        """Initializer for an InputFrame object.
+
+        :param held: The action bits held when the input was sampled.
+        :type held: int
+        :param pressed: The action bits pressed since the previous frame.
+        :type pressed: int
+        :param keys: The pressed keys, from pygame.key.get_pressed.
+        :type keys: pygame.key.ScancodeWrapper
+        :param times: The time.perf_counter value each bound key event was received at.
+        :type times: List[float]
+        :param quit_requested: Whether the window was asked to close.
+        :type quit_requested: bool
+        """
+
+        self.held: int = held
+        self.pressed: int = pressed
+        self.keys: pygame.key.ScancodeWrapper = keys
+        self.times: List[float] = times
+        self.quit_requested: bool = quit_requested
+
+
+class InputSampler:
+    """Polls and timestamps input events, and paces the frames while it waits."""
+
+    def __init__(self, poll_interval: float = 0.0005) -> None:
+        """Initializer for an InputSampler object.
+
+        :param poll_interval: The time between polls while waiting for the next frame,
+            in seconds.
+        :type poll_interval: float, optional
+        """
+
+        self.poll_interval: float = poll_interval
+
+        # what arrived since the last sample
+        self._pressed: int = 0
+        self._times: List[float] = []
+        self._quit: bool = False
+
+        self._held: int = 0
+        self._last_frame: float | None = None
+
+    def poll(self) -> None:
+        """Takes the waiting events off the queue and timestamps them."""
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self._quit = True
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                action = KEY_ACTIONS.get(event.key)
+                if action is None:
+                    continue
+                self._times.append(time.perf_counter())
+                if event.type == pygame.KEYDOWN:
+                    self._pressed |= action
+
+    def wait(self, fps: float) -> float:
+        """Waits for the next frame while polling events, the same as Clock.tick_busy_loop.
+
+        :param fps: The frame rate to keep to.
+        :type fps: float
+        :return: The time since the last frame in seconds, 0 on the first frame.
+        :rtype: float
+        """
+
+        now = time.perf_counter()
+        if self._last_frame is None:
+            self._last_frame = now
+            return 0
+
+        deadline = self._last_frame + 1 / fps
+        while now < deadline:
+            self.poll()
+            now = time.perf_counter()
+            if deadline - now > self.poll_interval:
+                time.sleep(self.poll_interval)
+                now = time.perf_counter()
+
+        dt = now - self._last_frame
+        self._last_frame = now
+        return dt
+
+    def sample(self) -> InputFrame:
+        """Latches the input of the frame. Call it right before the frame is simulated.
+
+        :return: The input since the last sample.
+        :rtype: InputFrame
+        """
+
+        self.poll()
+        keys = pygame.key.get_pressed()
+        held = actions_from_keys(keys)
+
+        # presses from events catch taps, the held keys catch presses without an event
+        frame = InputFrame(
+            held,
+            self._pressed | (held & ~self._held),
+            keys,
+            self._times,
+            self._quit,
+        )
+
+        self._held = held
+        self._pressed = 0
+        self._times = []
+        self._quit = False
+        return frame
@@ -3,13 +3,20 @@
 Module containing player related functionality.
 """
 
-from typing import Tuple
+from typing import Callable, Tuple
 
 import pygame
 
-from ..Internal import GRAVITY_ACCELERATION, Hitbox, check_type
-from ..Level import Group, Lava, Platform, Spike
-from ..Stages import grid_to_stage, TextInfo
+from ..Internal import (
+    GRAVITY_ACCELERATION,
+    SCREEN_WIDTH,
+    Hitbox,
+    Timer,
+    TimerService,
+    check_type,
+)
+from ..Level import Group, Lava, Platform, Spike, TileMap
+from ..Stages import TextInfo, grid_to_stage, room_size
 
 
 # pylint: disable=too-many-instance-attributes
@@ -71,8 +78,31 @@ class Player(Hitbox):
         self.grid_ycor: int = 1
         self.stage: int | str = 1
 
-        # i-frames used when taking damage
-        self.i_frames: int = 0
+        # the timers of the player's cooldowns, advanced once per simulated frame
+        self.timers: TimerService = TimerService()
+        self._i_frames_timer: Timer | None = None
+
+        # called with the kind of hazard and its rect when the player touches a spike or lava
+        self.on_hazard: Callable[[str, pygame.Rect], None] | None = None
+
+    @property
+    def i_frames(self) -> int:
+        """The number of frames the player cannot take damage for, after being hit."""
+
+        timer = self._i_frames_timer
+        return 0 if timer is None else timer.remaining
+
+    @i_frames.setter
+    def i_frames(self, frames: int) -> None:
+        """Sets the number of frames the player cannot take damage for.
+
+        :param frames: The number of frames.
+        :type frames: int
+        """
+
+        if self._i_frames_timer is not None:
+            self._i_frames_timer.cancel()
+        self._i_frames_timer = self.timers.schedule(frames) if frames > 0 else None
 
     # movement
 
@@ -150,58 +180,65 @@ class Player(Hitbox):
         for platform in platforms:
             check_type(platform, Platform)
 
-            # vvv welcome to hell vvv
+            if platform.has_collision:
+                self._resolve_solid_collision(platform)
 
-            if (
-                self.has_collision
-                and platform.has_collision
-                and self.colliderect(platform)
-            ):
-                collision_area = self.clip(platform)
-
-                # horizontal collisions checks (left and right walls)
-                if collision_area.height > collision_area.width - 3:
-                    if (
-                        self.coords.right() > platform.coords.left()
-                        and self.coords.right() < platform.coords.center_x()
-                    ):
-                        # reset interp data to stop movement if a collision is detected
-                        self.interp_data.moving = False
-                        self.interp_data.target_pos = (self.xcor, self.ycor)
-
-                        if self.facing_right:
-                            self.xcor = platform.coords.left() - self.width
-                        elif self.facing_left:
-                            self.xcor = platform.coords.right()
-
-                    elif (
-                        self.coords.left() < platform.coords.right()
-                        and self.coords.left() > platform.coords.center_x()
-                    ):
-                        # reset interp data to stop movement if a collision is detected
-                        self.interp_data.moving = False
-                        self.interp_data.target_pos = (self.xcor, self.ycor)
-
-                        self.xcor = platform.coords.right()
-
-                # vertical collisions checks (floor and ceiling)
-                if collision_area.width - 3 > collision_area.height:
-                    # top of platform collision
-                    if (
-                        self.coords.bottom() > platform.coords.top()
-                        and self.coords.top() < platform.coords.top()
-                    ):
-                        self.ycor = platform.coords.top() - self.height
-                        self.y_vel = 0
-                        self.on_ground = True
-
-                    # bottom of platform collision
-                    elif (
-                        self.coords.top() < platform.coords.bottom()
-                        and self.coords.bottom() > platform.coords.bottom()
-                    ):
-                        self.ycor = platform.coords.bottom()
-                        self.y_vel = 0
+    def _resolve_solid_collision(self, solid: pygame.Rect) -> None:
+        """Internal method that pushes the player out of a solid rect.
+
+        :param solid: The solid area to collide with.
+        :type solid: pygame.Rect
+        """
+
+        # vvv welcome to hell vvv
+
+        if self.has_collision and self.colliderect(solid):
+            collision_area = self.clip(solid)
+            solid_center_x = solid.x + solid.width / 2
+
+            # horizontal collisions checks (left and right walls)
+            if collision_area.height > collision_area.width - 3:
+                if (
+                    self.coords.right() > solid.left
+                    and self.coords.right() < solid_center_x
+                ):
+                    # reset interp data to stop movement if a collision is detected
+                    self.interp_data.moving = False
+                    self.interp_data.target_pos = (self.xcor, self.ycor)
+
+                    if self.facing_right:
+                        self.xcor = solid.left - self.width
+                    elif self.facing_left:
+                        self.xcor = solid.right
+
+                elif (
+                    self.coords.left() < solid.right
+                    and self.coords.left() > solid_center_x
+                ):
+                    # reset interp data to stop movement if a collision is detected
+                    self.interp_data.moving = False
+                    self.interp_data.target_pos = (self.xcor, self.ycor)
+
+                    self.xcor = solid.right
+
+            # vertical collisions checks (floor and ceiling)
+            if collision_area.width - 3 > collision_area.height:
+                # top of platform collision
+                if (
+                    self.coords.bottom() > solid.top
+                    and self.coords.top() < solid.top
+                ):
+                    self.ycor = solid.top - self.height
+                    self.y_vel = 0
+                    self.on_ground = True
+
+                # bottom of platform collision
+                elif (
+                    self.coords.top() < solid.bottom
+                    and self.coords.bottom() > solid.bottom
+                ):
+                    self.ycor = solid.bottom
+                    self.y_vel = 0
 
     def check_spike_collisions(self, spikes: Group | None) -> None:
         """Checks for collisions between the player and the given Spikes.
@@ -223,8 +260,7 @@ class Player(Hitbox):
                 and spike.has_collision
                 and self.colliderect(spike.hitbox)
             ):
-                self.y_vel = -500
-                self.take_damage(1)
+                self._hit_hazard("spike", spike.hitbox, 1)
 
     def check_lava_collisions(self, lavas: Group | None) -> None:
         """Checks for collisions between the player and the given Lavas.
@@ -242,8 +278,49 @@ class Player(Hitbox):
             check_type(lava, Lava)
 
             if self.has_collision and lava.has_collision and self.colliderect(lava):
-                self.y_vel = -500
-                self.take_damage(5)
+                self._hit_hazard("lava", lava, 5)
+
+    def check_tilemap_collisions(self, tilemap: TileMap) -> None:
+        """Checks for collisions between the player and the cells of a TileMap.
+
+        Only the cells around the player are looked at, so the cost does not
+        depend on the number of objects in the stage.
+
+        :param tilemap: The TileMap of the current stage.
+        :type tilemap: TileMap
+        """
+
+        check_type(tilemap, TileMap)
+
+        for solid in tilemap.solid_rects(self):
+            self._resolve_solid_collision(solid)
+
+        if not self.has_collision:
+            return
+
+        # the tilemap does not keep the hazards themselves, so the player rect stands in for them
+        if tilemap.touches_spike(self):
+            self._hit_hazard("spike", pygame.Rect(self), 1)
+
+        if tilemap.touches_lava(self):
+            self._hit_hazard("lava", pygame.Rect(self), 5)
+
+    def _hit_hazard(self, kind: str, rect: pygame.Rect, dmg: int) -> None:
+        """Internal method that bounces the player off a hazard and damages it.
+
+        :param kind: The kind of hazard, "spike" or "lava".
+        :type kind: str
+        :param rect: The rect of the hazard.
+        :type rect: pygame.Rect
+        :param dmg: The amount of damage the hazard deals.
+        :type dmg: int
+        """
+
+        self.y_vel = -500
+        self.take_damage(dmg)
+
+        if self.on_hazard is not None:
+            self.on_hazard(kind, rect)
 
     def update_(
         self,
@@ -255,6 +332,7 @@ class Player(Hitbox):
             Group | None,
             Tuple[TextInfo, ...] | None,
         ],
+        tilemap: TileMap | None = None,
     ) -> None:
         """Runs update checks on the player.
 
@@ -262,6 +340,8 @@ class Player(Hitbox):
         :type dt: float
         :param objects: A list of objects necessary for collision checks.
         :type objects: Tuple[Group, Group | None, Group | None, TextInfo | None]
+        :param tilemap: The TileMap of the stage, used for collisions instead of objects if given.
+        :type tilemap: TileMap | None, optional
         """
 
         self.y_vel += GRAVITY_ACCELERATION * dt
@@ -276,12 +356,16 @@ class Player(Hitbox):
         self.interp(dt)
 
         # collision detection
-        self.check_platform_collisions(objects[1])
-        self.check_spike_collisions(objects[2])
-        self.check_lava_collisions(objects[3])
+        if tilemap is not None:
+            self.check_tilemap_collisions(tilemap)
+        else:
+            self.check_platform_collisions(objects[1])
+            self.check_spike_collisions(objects[2])
+            self.check_lava_collisions(objects[3])
 
         # room transitions
-        if self.coords.is_off_screen_right(self.width):
+        room_width, room_height = room_size(self.stage)
+        if self.coords.is_off_screen_right(self.width, room_width):
             # disable interp to prevent bugs
             self.interp_data.moving = False
 
@@ -291,15 +375,17 @@ class Player(Hitbox):
             # disable interp to prevent bugs
             self.interp_data.moving = False
 
-            self.xcor = 1600 - self.width
             self.grid_xcor -= 1
+            self.xcor = room_size(grid_to_stage((self.grid_xcor, self.grid_ycor)))[0] - self.width
         elif self.coords.is_off_screen_up(self.width):
             # disable interp to prevent bugs
             self.interp_data.moving = False
 
-            self.ycor = 800 - self.height
             self.grid_ycor -= 1
-        elif self.coords.is_off_screen_down(self.width):
+            self.ycor = (
+                room_size(grid_to_stage((self.grid_xcor, self.grid_ycor)))[1] - 100 - self.height
+            )
+        elif self.coords.is_off_screen_down(self.width, room_height):
             # disable interp to prevent bugs
             self.interp_data.moving = False
 
@@ -308,15 +394,44 @@ class Player(Hitbox):
 
         self.stage = grid_to_stage((self.grid_xcor, self.grid_ycor))
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
         """Draws the player to the screen.
 
         :param screen: The screen to draw on.
         :type screen: pygame.Surface
+        :param offset: The amount to shift the drawing by, from the camera.
+        :type offset: Tuple[int, int], optional
         """
 
         check_type(screen, pygame.Surface)
 
         pygame.draw.rect(
-            screen, self.color, (self.xcor, self.ycor, self.width, self.height)
+            screen,
+            self.color,
+            (self.xcor + offset[0], self.ycor + offset[1], self.width, self.height),
         )
+
+
+def new_player(timers: TimerService | None = None) -> Player:
+    """Creates the player a new game starts with.
+
+    :param timers: The timer service of the game, or None for the player to have its own.
+    :type timers: TimerService | None, optional
+    :return: The player, in stage 1.
+    :rtype: Player
+    """
+
+    plr = Player(
+        SCREEN_WIDTH / 2 - 25,
+        730,
+        width=50,
+        height=80,
+        speed=250,
+        health=10,
+        max_health=10,
+        has_collision=True,
+        color=(255, 0, 255),
+    )
+    if timers is not None:
+        plr.timers = timers
+    return plr
@@ -0,0 +1,334 @@
+"""Player/snapshot.py
+
+Module containing compact binary snapshots of the simulation state.
+
+A snapshot holds the player, the controls and every object of the
+player's current stage in a fixed little-endian layout, so it can be
+captured and restored in a few microseconds. This is used for instant
+restarts, rewinding and rollback-style lookahead.
+"""
+
+import struct
+from typing import List, Tuple
+
+from ..Internal import Hitbox, check_type, interp
+from ..Internal.hitboxes import EasingFunction
+from ..Stages import STAGES, grid_to_stage
+from .controls import Controls
+from .player import Player
+
+# every easing function in interp, referenced in snapshots by index
+EASINGS: Tuple[EasingFunction, ...] = tuple(
+    getattr(interp, name) for name in sorted(dir(interp)) if name.startswith(("ease_", "linear"))
+)
+
+# position, velocity and moveto tween of one Hitbox
+_HITBOX = struct.Struct("<3d2?6dH")
+
+# player flags, health, i-frames, grid location and controls
+_PLAYER = struct.Struct("<4?2diii?Bi")
+
+# the number of stage object records that follow
+_COUNT = struct.Struct("<H")
+
+PLAYER_SIZE = _HITBOX.size + _PLAYER.size + _COUNT.size
+'''The size in bytes of a snapshot without any stage objects.
+'''
+
+
+def _easing_index(easing_type: EasingFunction) -> int:
+    """Internal function that gets the snapshot index of an easing function.
+
+    :param easing_type: The easing function.
+    :type easing_type: EasingFunction
+    :return: The index of the easing function.
+    :rtype: int
+    """
+
+    try:
+        return EASINGS.index(easing_type)
+    except ValueError as e:
+        raise ValueError(
+            f"{easing_type} is not an easing function from interp and cannot be saved."
+        ) from e
+
+
+def _pack_hitbox(buffer: bytearray, offset: int, hitbox: Hitbox) -> None:
+    """Internal function that writes the state of a Hitbox into the buffer.
+
+    :param buffer: The buffer to write to.
+    :type buffer: bytearray
+    :param offset: The offset to write at.
+    :type offset: int
+    :param hitbox: The Hitbox to write.
+    :type hitbox: Hitbox
+    """
+
+    data = hitbox.interp_data
+    _HITBOX.pack_into(
+        buffer,
+        offset,
+        hitbox.xcor,
+        hitbox.ycor,
+        hitbox.y_vel,
+        hitbox.has_collision,
+        data.moving,
+        *data.initial_pos,
+        *data.target_pos,
+        data.duration,
+        data.elapsed_time,
+        _easing_index(data.easing_type),
+    )
+
+
+def _unpack_hitbox(buffer: bytes, offset: int, hitbox: Hitbox) -> None:
+    """Internal function that reads the state of a Hitbox from the buffer.
+
+    :param buffer: The buffer to read from.
+    :type buffer: bytes
+    :param offset: The offset to read at.
+    :type offset: int
+    :param hitbox: The Hitbox to restore.
+    :type hitbox: Hitbox
+    """
+
+    (
+        hitbox.xcor,
+        hitbox.ycor,
+        hitbox.y_vel,
+        hitbox.has_collision,
+        moving,
+        initial_x,
+        initial_y,
+        target_x,
+        target_y,
+        duration,
+        elapsed_time,
+        easing,
+    ) = _HITBOX.unpack_from(buffer, offset)
+
+    data = hitbox.interp_data
+    data.moving = moving
+    data.initial_pos = (initial_x, initial_y)
+    data.target_pos = (target_x, target_y)
+    data.duration = duration
+    data.elapsed_time = elapsed_time
+    data.easing_type = EASINGS[easing]
+
+
+def stage_objects(plr: Player) -> List[Hitbox]:
+    """Gets the objects of the player's current stage in a stable order.
+
+    :param plr: The player.
+    :type plr: Player
+    :return: The platforms, spikes and lava of the stage.
+    :rtype: List[Hitbox]
+    """
+
+    stage = STAGES[plr.stage]
+    objects: List[Hitbox] = []
+    for group in stage[1:4]:
+        if group is not None:
+            objects.extend(group)
+    return objects
+
+
+def snapshot_size(plr: Player) -> int:
+    """Gets the size in bytes of a snapshot of the player in its current stage.
+
+    :param plr: The player.
+    :type plr: Player
+    :return: The size of the snapshot.
+    :rtype: int
+    """
+
+    return PLAYER_SIZE + len(stage_objects(plr)) * _HITBOX.size
+
+
+def capture_into(buffer: bytearray, plr: Player, controls: Controls, offset: int = 0) -> int:
+    """Writes a snapshot into a preallocated buffer.
+
+    :param buffer: The buffer to write to. Must have room for snapshot_size(plr) bytes.
+    :type buffer: bytearray
+    :param plr: The player to capture.
+    :type plr: Player
+    :param controls: The controls of the player.
+    :type controls: Controls
+    :param offset: The offset to write at.
+    :type offset: int, optional
+    :return: The number of bytes written.
+    :rtype: int
+    """
+
+    _pack_hitbox(buffer, offset, plr)
+    offset += _HITBOX.size
+
+    _PLAYER.pack_into(
+        buffer,
+        offset,
+        plr.on_ground,
+        plr.double_jump_debounce,
+        plr.facing_left,
+        plr.facing_right,
+        plr.health,
+        plr.max_health,
+        plr.i_frames,
+        plr.grid_xcor,
+        plr.grid_ycor,
+        controls.dash_charged,
+        controls.previous,
+        0 if controls.dash_timer is None else controls.dash_timer.remaining,
+    )
+    offset += _PLAYER.size
+
+    objects = stage_objects(plr)
+    _COUNT.pack_into(buffer, offset, len(objects))
+    offset += _COUNT.size
+    for obj in objects:
+        _pack_hitbox(buffer, offset, obj)
+        offset += _HITBOX.size
+
+    return PLAYER_SIZE + len(objects) * _HITBOX.size
+
+
+def capture(plr: Player, controls: Controls) -> bytes:
+    """Captures a snapshot of the simulation state.
+
+    :param plr: The player to capture.
+    :type plr: Player
+    :param controls: The controls of the player.
+    :type controls: Controls
+    :return: The snapshot.
+    :rtype: bytes
+    """
+
+    buffer = bytearray(snapshot_size(plr))
+    capture_into(buffer, plr, controls)
+    return bytes(buffer)
+
+
+def restore(buffer: bytes, plr: Player, controls: Controls, offset: int = 0) -> None:
+    """Restores the simulation state from a snapshot.
+
+    :param buffer: The buffer holding the snapshot.
+    :type buffer: bytes
+    :param plr: The player to restore.
+    :type plr: Player
+    :param controls: The controls of the player.
+    :type controls: Controls
+    :param offset: The offset of the snapshot in the buffer.
+    :type offset: int, optional
+    """
+
+    check_type(plr, Player)
+    check_type(controls, Controls)
+
+    _unpack_hitbox(buffer, offset, plr)
+    offset += _HITBOX.size
+
+    (
+        plr.on_ground,
+        plr.double_jump_debounce,
+        plr.facing_left,
+        plr.facing_right,
+        plr.health,
+        plr.max_health,
+        plr.i_frames,
+        plr.grid_xcor,
+        plr.grid_ycor,
+        controls.dash_charged,
+        controls.previous,
+        dash_cooldown,
+    ) = _PLAYER.unpack_from(buffer, offset)
+    offset += _PLAYER.size
+
+    # timers are saved as the frames they had left, and restarted on the player's timers
+    if controls.dash_timer is not None:
+        controls.dash_timer.cancel()
+    controls.dash_timer = plr.timers.schedule(dash_cooldown) if dash_cooldown > 0 else None
+
+    # keep whole-number health as an int, the same as the Player sets it
+    if plr.health.is_integer():
+        plr.health = int(plr.health)
+    if plr.max_health.is_integer():
+        plr.max_health = int(plr.max_health)
+
+    plr.stage = grid_to_stage((plr.grid_xcor, plr.grid_ycor))
+    # pylint: disable=attribute-defined-outside-init
+    plr.topleft = (int(plr.xcor), int(plr.ycor))
+    # pylint: enable=attribute-defined-outside-init
+    plr.coords.update(plr.xcor, plr.ycor)
+
+    objects = stage_objects(plr)
+    (count,) = _COUNT.unpack_from(buffer, offset)
+    offset += _COUNT.size
+    if count != len(objects):
+        raise ValueError(
+            f"Snapshot has {count} stage objects but stage {plr.stage} has {len(objects)}."
+        )
+
+    for obj in objects:
+        _unpack_hitbox(buffer, offset, obj)
+        offset += _HITBOX.size
+
+
+class SnapshotRing:
+    """Fixed-size history of snapshots used for rewinding."""
+
+    def __init__(self, frames: int, slot_size: int = 4096) -> None:
+        """Initializer for a SnapshotRing object.
+
+        :param frames: The number of snapshots to keep.
+        :type frames: int
+        :param slot_size: The space reserved for each snapshot in bytes.
+        :type slot_size: int, optional
+        """
+
+        check_type(frames, int)
+        check_type(slot_size, int)
+
+        self.frames: int = frames
+        self.slot_size: int = slot_size
+        self.buffer: bytearray = bytearray(frames * slot_size)
+
+        # the index of the next slot to write and the number of stored snapshots
+        self.head: int = 0
+        self.count: int = 0
+
+    def push(self, plr: Player, controls: Controls) -> None:
+        """Captures a snapshot into the next slot, overwriting the oldest one if full.
+
+        :param plr: The player to capture.
+        :type plr: Player
+        :param controls: The controls of the player.
+        :type controls: Controls
+        """
+
+        if snapshot_size(plr) > self.slot_size:
+            raise ValueError(f"Snapshot does not fit in a {self.slot_size} byte slot.")
+
+        capture_into(self.buffer, plr, controls, self.head * self.slot_size)
+        self.head = (self.head + 1) % self.frames
+        self.count = min(self.count + 1, self.frames)
+
+    def rewind(self, plr: Player, controls: Controls, frames: int = 1) -> int:
+        """Restores the snapshot from the given number of pushes ago and drops newer ones.
+
+        :param plr: The player to restore.
+        :type plr: Player
+        :param controls: The controls of the player.
+        :type controls: Controls
+        :param frames: How many snapshots to go back, 1 being the latest.
+        :type frames: int, optional
+        :return: The number of snapshots actually rewound.
+        :rtype: int
+        """
+
+        frames = min(frames, self.count)
+        if frames <= 0:
+            return 0
+
+        self.head = (self.head - frames) % self.frames
+        self.count -= frames
+        restore(self.buffer, plr, controls, self.head * self.slot_size)
+        return frames
@@ -0,0 +1,25 @@
+"""Render
+
+The Render package contains the camera, the helpers used to only draw
+what is in view, and the batched, scaled and pipelined renderers.
+"""
+
+from .camera import Camera
+from .capture import FFMPEG_COMMAND, MODES, FrameCapture, png_bytes
+from .pipeline import RenderPipeline
+from .presenter import SCALES, Presenter
+from .queue import (
+    LAYER_EFFECTS,
+    LAYER_HUD,
+    LAYER_LAVA,
+    LAYER_PLATFORMS,
+    LAYER_PLAYER,
+    LAYER_SPIKES,
+    LAYER_TEXT,
+    RenderQueue,
+    merge_rects,
+    scale_rect,
+    scaled_sprite,
+    spike_sprite,
+)
+from .spatial import SpatialHash
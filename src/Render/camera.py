@@ -0,0 +1,113 @@
+"""Render.camera.py
+
+Module containing the camera, which scrolls rooms larger than the screen.
+"""
+
+from typing import Tuple
+
+import pygame
+
+from ..Internal import SCREEN_HEIGHT, SCREEN_WIDTH, check_type
+
+
+class Camera:
+    """Follows a target around a room and gives the offset to draw the room with."""
+
+    def __init__(
+        self,
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+        smoothing: int | float = 10,
+    ) -> None:
+        """Initializer for a Camera object.
+
+        :param width: The width of the view in pixels.
+        :type width: int, optional
+        :param height: The height of the view in pixels.
+        :type height: int, optional
+        :param smoothing: How fast the camera catches up to its target, 0 to snap instantly.
+        :type smoothing: int | float, optional
+        """
+
+        check_type(width, int)
+        check_type(height, int)
+        check_type(smoothing, int, float)
+
+        self.width: int = width
+        self.height: int = height
+        self.smoothing: int | float = smoothing
+
+        # the top left of the view in room coordinates
+        self.xcor: float = 0
+        self.ycor: float = 0
+
+        self.room_width: int = width
+        self.room_height: int = height
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """The amount to shift room coordinates by to get screen coordinates."""
+
+        return (-int(self.xcor), -int(self.ycor))
+
+    @property
+    def viewport(self) -> pygame.Rect:
+        """The visible part of the room."""
+
+        return pygame.Rect(int(self.xcor), int(self.ycor), self.width, self.height)
+
+    def set_room(self, room_width: int, room_height: int) -> None:
+        """Sets the size of the room the camera is in.
+
+        :param room_width: The width of the room.
+        :type room_width: int
+        :param room_height: The height of the room.
+        :type room_height: int
+        """
+
+        self.room_width = room_width
+        self.room_height = room_height
+
+    def _clamped_target(self, target: pygame.Rect) -> Tuple[float, float]:
+        """Internal method that gets the view position centered on the target.
+
+        :param target: The rect to center on.
+        :type target: pygame.Rect
+        :return: The top left of the view, kept inside the room.
+        :rtype: Tuple[float, float]
+        """
+
+        xcor = target.centerx - self.width / 2
+        ycor = target.centery - self.height / 2
+
+        # rooms smaller than the view stay pinned to the top left
+        xcor = max(0, min(xcor, self.room_width - self.width))
+        ycor = max(0, min(ycor, self.room_height - self.height))
+        return xcor, ycor
+
+    def snap(self, target: pygame.Rect) -> None:
+        """Moves the camera onto the target instantly. Used when entering a room.
+
+        :param target: The rect to center on.
+        :type target: pygame.Rect
+        """
+
+        self.xcor, self.ycor = self._clamped_target(target)
+
+    def follow(self, target: pygame.Rect, dt: float) -> None:
+        """Moves the camera towards the target.
+
+        :param target: The rect to center on.
+        :type target: pygame.Rect
+        :param dt: Delta time.
+        :type dt: float
+        """
+
+        xcor, ycor = self._clamped_target(target)
+        if self.smoothing <= 0:
+            self.xcor, self.ycor = xcor, ycor
+            return
+
+        amount = min(1, self.smoothing * dt)
+        self.xcor += (xcor - self.xcor) * amount
+        self.ycor += (ycor - self.ycor) * amount
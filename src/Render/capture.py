@@ -0,0 +1,293 @@
+"""Render.capture.py
+
+Module containing the frame capture, which records gameplay to disk.
+
+Saving a screenshot on the main thread stalls the frame while the image
+is encoded and written. The capture only copies the finished frame into
+one of a few preallocated surfaces, which is a single same-format blit,
+and a writer thread encodes and writes it. When every surface is still
+waiting to be written the frame is dropped instead of blocking the
+gameloop, so a slow disk or encoder costs frames of the recording, not
+frames of the game.
+"""
+
+import collections
+import json
+import os
+import queue
+import struct
+import subprocess
+import threading
+import zlib
+from typing import IO, Deque, List, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from ..Internal import check_type, check_value
+
+MODES: Tuple[str, ...] = ("raw", "png", "pipe")
+'''The capture modes: raw RGB frames in one file, a PNG sequence, or a pipe to an encoder.
+'''
+
+FFMPEG_COMMAND: Tuple[str, ...] = (
+    "ffmpeg",
+    "-loglevel",
+    "error",
+    "-y",
+    "-f",
+    "rawvideo",
+    "-pix_fmt",
+    "rgb24",
+    "-s",
+    "{width}x{height}",
+    "-r",
+    "{fps}",
+    "-i",
+    "-",
+    "-pix_fmt",
+    "yuv420p",
+    "{path}",
+)
+'''The default encoder command for pipe captures. The placeholders are filled in when
+the first frame is captured.
+'''
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    """Internal function that frames the data of a PNG chunk with its length and checksum.
+
+    :param kind: The four letter chunk type.
+    :type kind: bytes
+    :param data: The data of the chunk.
+    :type data: bytes
+    :return: The chunk.
+    :rtype: bytes
+    """
+
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def png_bytes(frame: pygame.Surface, level: int = 1) -> bytes:
+    """Encodes a surface as a PNG image.
+
+    pygame.image.save keeps the GIL while it encodes, which stalls the
+    gameloop even from another thread. zlib releases it while compressing,
+    so encoding with it lets the gameloop keep running.
+
+    :param frame: The surface to encode.
+    :type frame: pygame.Surface
+    :param level: The zlib compression level, from 0 to 9.
+    :type level: int, optional
+    :return: The PNG file.
+    :rtype: bytes
+    """
+
+    width, height = frame.get_size()
+
+    # every row starts with its filter type, 0 for none
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    rows[:, 1:] = np.frombuffer(pygame.image.tobytes(frame, "RGB"), np.uint8).reshape(
+        height, width * 3
+    )
+
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            # 8 bit rgb, no interlacing
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+class FrameCapture:  # pylint: disable=too-many-instance-attributes
+    """Copies frames into a pool of buffers and writes them to disk on a writer thread."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        mode: str = "png",
+        pool_size: int = 4,
+        every: int = 1,
+        fps: int = 60,
+        command: Sequence[str] = FFMPEG_COMMAND,
+    ) -> None:
+        """Initializer for a FrameCapture object. Starts the writer thread.
+
+        :param path: The directory of a PNG sequence, the file of raw frames, or the
+            output file given to the encoder.
+        :type path: str
+        :param mode: "raw", "png" or "pipe".
+        :type mode: str, optional
+        :param pool_size: The number of frames that can wait to be written before frames
+            are dropped.
+        :type pool_size: int, optional
+        :param every: Only every nth frame is captured.
+        :type every: int, optional
+        :param fps: The frame rate of the recording, passed to the encoder.
+        :type fps: int, optional
+        :param command: The encoder command for pipe captures. It is given raw RGB frames
+            on stdin, and {width}, {height}, {fps} and {path} are filled in.
+        :type command: Sequence[str], optional
+        """
+
+        check_type(path, str)
+        check_value(mode, *MODES)
+        check_type(pool_size, int)
+        check_type(every, int)
+
+        self.path: str = path
+        self.mode: str = mode
+        self.pool_size: int = pool_size
+        self.every: int = every
+        self.fps: int = fps
+        self.command: Tuple[str, ...] = tuple(command)
+
+        # the number of frames seen, copied into the pool, written and dropped
+        self.frames: int = 0
+        self.captured: int = 0
+        self.written: int = 0
+        self.dropped: int = 0
+        self.size: Tuple[int, int] | None = None
+
+        self.error: BaseException | None = None
+        # the buffers are made on the first capture, when the frame size and format are known
+        self._free: Deque[pygame.Surface] = collections.deque()
+        self._pending: "queue.Queue[Tuple[int, pygame.Surface] | None]" = queue.Queue()
+        self._output: IO[bytes] | None = None
+        self._process: subprocess.Popen | None = None
+
+        self._thread = threading.Thread(target=self._run, name="FrameCapture", daemon=True)
+        self._thread.start()
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """Copies a finished frame to be written. Never waits for the writer.
+
+        :param surface: The frame, usually the display surface.
+        :type surface: pygame.Surface
+        :return: Whether the frame was captured, False if it was skipped or dropped.
+        :rtype: bool
+        """
+
+        if self.error is not None:
+            raise RuntimeError("The frame capture failed.") from self.error
+
+        self.frames += 1
+        if (self.frames - 1) % self.every:
+            return False
+
+        if self.size is None:
+            self.size = surface.get_size()
+            self._free.extend(pygame.Surface(self.size, 0, surface) for _ in range(self.pool_size))
+
+        try:
+            buffer = self._free.popleft()
+        except IndexError:
+            # every buffer is still waiting on the writer
+            self.dropped += 1
+            return False
+
+        buffer.blit(surface, (0, 0))
+        self._pending.put((self.captured, buffer))
+        self.captured += 1
+        return True
+
+    def close(self) -> None:
+        """Writes the frames that are still pending and stops the writer thread."""
+
+        self._pending.put(None)
+        self._thread.join()
+
+        if self.error is not None:
+            raise RuntimeError("The frame capture failed.") from self.error
+
+    def _open(self) -> None:
+        """Internal method that opens the output when the first frame arrives."""
+
+        width, height = self.size
+        directory = self.path if self.mode == "png" else os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.mode == "raw":
+            # pylint: disable-next=consider-using-with
+            self._output = open(self.path, "wb")
+        elif self.mode == "pipe":
+            # only every nth frame is written, so the video plays at a lower rate
+            fps = self.fps / self.every
+            args: List[str] = [
+                arg.format(width=width, height=height, fps=fps, path=self.path)
+                for arg in self.command
+            ]
+            # pylint: disable-next=consider-using-with
+            self._process = subprocess.Popen(args, stdin=subprocess.PIPE)
+            self._output = self._process.stdin
+
+    def _write(self, index: int, frame: pygame.Surface) -> None:
+        """Internal method that encodes and writes one frame.
+
+        :param index: The index of the frame in the recording.
+        :type index: int
+        :param frame: The copied frame.
+        :type frame: pygame.Surface
+        """
+
+        if self.mode == "png":
+            with open(os.path.join(self.path, f"frame_{index:06d}.png"), "wb") as file:
+                file.write(png_bytes(frame))
+        else:
+            self._output.write(pygame.image.tobytes(frame, "RGB"))
+
+    def _finish(self) -> None:
+        """Internal method that closes the output and describes raw recordings."""
+
+        if self._output is not None:
+            self._output.close()
+        if self._process is not None:
+            self._process.wait()
+
+        # raw frames have no header, so their format is written next to them
+        if self.mode == "raw" and self.size is not None:
+            with open(self.path + ".json", "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "width": self.size[0],
+                        "height": self.size[1],
+                        "format": "RGB",
+                        "fps": self.fps / self.every,
+                        "frames": self.written,
+                    },
+                    file,
+                )
+
+    def _run(self) -> None:
+        """Internal method that runs on the writer thread and writes pending frames."""
+
+        opened = False
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            index, frame = item
+
+            if self.error is None:
+                try:
+                    if not opened:
+                        self._open()
+                        opened = True
+                    self._write(index, frame)
+                    self.written += 1
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    # raised on the main thread by the next capture
+                    self.error = e
+
+            # the buffer can be reused once it is written
+            self._free.append(frame)
+
+        try:
+            if opened:
+                self._finish()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.error = e
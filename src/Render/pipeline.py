@@ -0,0 +1,120 @@
+"""Render.pipeline.py
+
+Module containing the pipelined renderer.
+
+The simulation fills one RenderQueue with frame N while a render thread
+draws frame N-1 from the other queue. present() waits for the render
+thread, flips the finished frame on the main thread, then hands over the
+new queue and swaps the two. pygame releases the GIL while it fills and
+blits, so on multi-core machines a frame costs about max(simulation,
+drawing) instead of their sum, at the cost of one frame of latency.
+"""
+
+import threading
+from typing import List, Tuple
+
+import pygame
+
+from ..Internal import check_type
+from .presenter import Presenter
+from .queue import RenderQueue
+
+
+class RenderPipeline:  # pylint: disable=too-many-instance-attributes
+    """Draws frames on a render thread from double-buffered render queues."""
+
+    def __init__(self, presenter: Presenter) -> None:
+        """Initializer for a RenderPipeline object. Starts the render thread.
+
+        :param presenter: The presenter that draws the frames onto the display surface.
+        :type presenter: Presenter
+        """
+
+        check_type(presenter, Presenter)
+
+        self.presenter: Presenter = presenter
+
+        # the simulation fills queues[index] while the render thread draws the other one
+        self.queues: Tuple[RenderQueue, RenderQueue] = (RenderQueue(), RenderQueue())
+        self.index: int = 0
+
+        self.error: BaseException | None = None
+        self._submitted: RenderQueue | None = None
+        self._dirty: List[pygame.Rect] | None = None
+        self._rendering: bool = False
+        # whether the screen holds a drawn frame that has not been flipped yet, and the rects
+        # of it that changed, or None if all of it did
+        self._ready: bool = False
+        self._rects: List[pygame.Rect] | None = None
+        self._closed: bool = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="RenderPipeline", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue(self) -> RenderQueue:
+        """The queue to fill with the frame being simulated."""
+
+        return self.queues[self.index]
+
+    def present(self, dirty: List[pygame.Rect] | None = None) -> None:
+        """Shows the previous frame and starts drawing the current one on the render thread.
+
+        :param dirty: The rects of the HUD that changed in the current frame, or None if
+            they are not known.
+        :type dirty: List[pygame.Rect] | None, optional
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: self._submitted is None and not self._rendering)
+            if self.error is not None:
+                raise RuntimeError("The render thread failed.") from self.error
+
+            # the render thread is idle, so the screen can be flipped safely
+            if self._ready:
+                if self._rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(self._rects)
+
+            self._submitted = self.queue
+            self._dirty = dirty
+            self._ready = False
+            self.index = 1 - self.index
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Waits for the frame being drawn and stops the render thread."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Internal method that runs on the render thread and draws submitted frames."""
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._submitted is not None or self._closed)
+                if self._submitted is None:
+                    return
+
+                queue, dirty = self._submitted, self._dirty
+                self._submitted = None
+                self._rendering = True
+
+            rects = None
+            try:
+                rects = self.presenter.draw(queue, dirty)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # handed to the main thread, which raises it on the next present
+                self.error = e
+                queue.clear()
+
+            with self._condition:
+                self._rendering = False
+                self._ready = self.error is None
+                self._rects = rects
+                self._condition.notify_all()
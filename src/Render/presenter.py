@@ -0,0 +1,216 @@
+"""Render.presenter.py
+
+Module containing the presenter, which draws the game at an internal
+render resolution and scales it to the window.
+
+Fill and blit cost grows with the number of pixels drawn, so drawing
+the world at a lower resolution and scaling it up once per frame keeps
+slow machines at full frame rate. The HUD is drawn after scaling, at
+the window's resolution, so it stays sharp. With automatic scaling the
+presenter lowers the resolution while frames go over budget and raises
+it again once there is room to spare.
+
+When the world drawn is the same as the last frame's, only the dirty
+rects of the HUD are drawn again, over a copy of the world, and only
+they need to be sent to the display.
+"""
+
+from typing import Any, List, Tuple
+
+import pygame
+
+from ..Internal import check_type
+from .capture import FrameCapture
+from .queue import LAYER_HUD, RenderQueue
+
+SCALES: Tuple[float, ...] = (1, 0.75, 0.5, 0.375, 0.25)
+'''The render scales automatic scaling steps through, from highest to lowest.
+'''
+
+
+class Presenter:  # pylint: disable=too-many-instance-attributes
+    """Draws render queues at an internal resolution and scales them to the window."""
+
+    def __init__(
+        self,
+        window: pygame.Surface,
+        scale: float = 1,
+        smooth: bool = False,
+        budget: float | None = None,
+        min_scale: float = 0.5,
+        background: Tuple[int, int, int] = (0, 0, 0),
+    ) -> None:
+        """Initializer for a Presenter object.
+
+        :param window: The display surface.
+        :type window: pygame.Surface
+        :param scale: The internal resolution as a fraction of the window's.
+        :type scale: float, optional
+        :param smooth: Whether to scale with smoothscale instead of nearest-neighbour.
+        :type smooth: bool, optional
+        :param budget: The frame time budget in milliseconds for automatic scaling,
+            or None to keep the scale fixed.
+        :type budget: float | None, optional
+        :param min_scale: The lowest scale automatic scaling goes down to.
+        :type min_scale: float, optional
+        :param background: The color the frame is cleared to.
+        :type background: Tuple[int, int, int], optional
+        """
+
+        check_type(window, pygame.Surface)
+        check_type(scale, int, float)
+
+        self.window: pygame.Surface = window
+        self.smooth: bool = smooth
+        self.budget: float | None = budget
+        self.min_scale: float = min_scale
+        self.background: Tuple[int, int, int] = background
+
+        # records every finished frame if set
+        self.capture: FrameCapture | None = None
+
+        # the average frame time and how many frames it has been over or under budget
+        self.frame_time: float = 0
+        self._over: int = 0
+        self._under: int = 0
+
+        # the signature of the last frame, and a copy of its world once it stays the same
+        self._signature: List[Tuple[int, Any, pygame.Rect]] | None = None
+        self._world: pygame.Surface | None = None
+
+        self.scale: float = 1
+        self.target: pygame.Surface = window
+        self.set_scale(scale)
+
+    def set_scale(self, scale: float) -> None:
+        """Changes the internal render resolution.
+
+        :param scale: The internal resolution as a fraction of the window's.
+        :type scale: float
+        """
+
+        if not 0 < scale <= 1:
+            raise ValueError(f"Render scale must be in (0, 1], not {scale}.")
+
+        self.scale = scale
+        self._signature = self._world = None
+        if scale == 1:
+            self.target = self.window
+        else:
+            width, height = self.window.get_size()
+            self.target = pygame.Surface(
+                (round(width * scale), round(height * scale))
+            ).convert(self.window)
+
+    def draw(
+        self, queue: RenderQueue, dirty: List[pygame.Rect] | None = None
+    ) -> List[pygame.Rect] | None:
+        """Draws a frame: the world at the render scale, then the HUD at full resolution.
+
+        :param queue: The queued frame. It is empty afterwards.
+        :type queue: RenderQueue
+        :param dirty: The rects of the HUD that changed since the last frame, or None if
+            they are not known.
+        :type dirty: List[pygame.Rect] | None, optional
+        :return: The rects of the window that changed, to pass to pygame.display.update,
+            or None if the whole window has to be flipped.
+        :rtype: List[pygame.Rect] | None
+        """
+
+        signature = None if dirty is None else queue.signature()
+        unchanged = (
+            signature is not None
+            and self._signature is not None
+            and _without(signature, dirty) == _without(self._signature, dirty)
+        )
+        self._signature = signature
+
+        # read once, since the scale can change on the main thread while a pipeline draws
+        target, scale, world = self.target, self.scale, self._world
+
+        if unchanged and world is not None:
+            rects = [rect.clip(self.window.get_rect()) for rect in dirty]
+            if rects:
+                # only the hud is drawn, over the world it was drawn over last frame
+                area = rects[0].unionall(rects[1:])
+                queue.commands = [command for command in queue.commands if command[0] >= LAYER_HUD]
+                self.window.set_clip(area)
+                self.window.blit(world, area, area)
+                queue.flush(self.window)
+                self.window.set_clip(None)
+            queue.clear()
+            if self.capture is not None:
+                self.capture.capture(self.window)
+            return rects
+
+        target.fill(self.background)
+        queue.flush(target, scale, LAYER_HUD - 1)
+
+        if target is not self.window:
+            if self.smooth:
+                pygame.transform.smoothscale(target, self.window.get_size(), self.window)
+            else:
+                pygame.transform.scale(target, self.window.get_size(), self.window)
+
+        # the world is copied once it has been drawn the same twice in a row
+        if unchanged:
+            self._world = self.window.copy()
+        elif world is not None:
+            self._world = None
+
+        queue.flush(self.window)
+
+        if self.capture is not None:
+            self.capture.capture(self.window)
+        return None
+
+    def record(self, frame_time: float) -> None:
+        """Records how long a frame took and adjusts the scale if it is automatic.
+
+        :param frame_time: The time the frame took to simulate and draw, in milliseconds.
+        :type frame_time: float
+        """
+
+        self.frame_time += (frame_time - self.frame_time) * 0.1
+        if self.budget is None:
+            return
+
+        # a frame is only counted as spare when it would still fit after raising the scale
+        if self.frame_time > self.budget:
+            self._over += 1
+            self._under = 0
+        elif self.frame_time < self.budget * 0.5:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        lower = [scale for scale in SCALES if self.min_scale <= scale < self.scale]
+        higher = [scale for scale in SCALES if scale > self.scale]
+
+        if self._over >= 30 and lower:
+            self.set_scale(lower[0])
+            self._over = 0
+        elif self._under >= 300 and higher:
+            self.set_scale(higher[-1])
+            self._under = 0
+
+
+def _without(
+    signature: List[Tuple[int, Any, pygame.Rect]], dirty: List[pygame.Rect]
+) -> List[Tuple[int, Any, pygame.Rect]]:
+    """Internal function that leaves the HUD commands touching the dirty rects out of a signature.
+
+    :param signature: The signature of a frame, from RenderQueue.signature.
+    :type signature: List[Tuple[int, Any, pygame.Rect]]
+    :param dirty: The dirty rects of the HUD.
+    :type dirty: List[pygame.Rect]
+    :return: The rest of the signature.
+    :rtype: List[Tuple[int, Any, pygame.Rect]]
+    """
+
+    return [
+        command
+        for command in signature
+        if command[0] < LAYER_HUD or command[2].collidelist(dirty) == -1
+    ]
@@ -0,0 +1,382 @@
+"""Render.queue.py
+
+Module containing the render queue, which batches the draw calls of a frame.
+
+Objects are queued instead of drawn one by one. When the queue is
+flushed, the commands are sorted by layer and color, touching rects of
+the same color are merged, and every rect is drawn with Surface.fill.
+Shapes that are not rects, like spikes, are rasterized once into
+cached sprites and drawn with a single Surface.blits call per layer.
+
+Commands of different colors on the same layer may be reordered, so
+objects that overlap and must be drawn in a set order belong on
+different layers.
+"""
+
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import pygame
+
+from ..Level import Group, Lava, Platform, Spike
+
+LAYER_PLATFORMS = 0
+'''Layer for platforms.
+'''
+LAYER_SPIKES = 1
+'''Layer for spikes.
+'''
+LAYER_LAVA = 2
+'''Layer for lava.
+'''
+LAYER_TEXT = 3
+'''Layer for stage text.
+'''
+LAYER_PLAYER = 4
+'''Layer for the player.
+'''
+LAYER_EFFECTS = 5
+'''Layer for particles and other effects.
+'''
+LAYER_HUD = 6
+'''Layer for the HUD, drawn on top of everything.
+'''
+
+# the layer each type of stage object goes on, in the order Groups used to be drawn
+_LAYERS: Dict[type, int] = {Platform: LAYER_PLATFORMS, Spike: LAYER_SPIKES, Lava: LAYER_LAVA}
+
+# command kinds, calls are drawn first, then rects, then sprites on the same layer
+_CALL = 0
+_RECT = 1
+_SPRITE = 2
+
+Color = Tuple[int, int, int]
+
+# pre-rasterized spikes by width, height and color
+_spike_sprites: Dict[Tuple[int, int, Color], pygame.Surface] = {}
+
+# scaled copies of sprites for each render scale, dropped with the sprite
+_scaled_sprites: "weakref.WeakKeyDictionary[pygame.Surface, Dict[float, pygame.Surface]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def spike_sprite(width: int, height: int, color: Color) -> pygame.Surface:
+    """Gets the pre-rasterized sprite of a spike, rendering it the first time.
+
+    :param width: The width of the spike.
+    :type width: int
+    :param height: The height of the spike.
+    :type height: int
+    :param color: The color of the spike.
+    :type color: Color
+    :return: The spike sprite.
+    :rtype: pygame.Surface
+    """
+
+    key = (width, height, tuple(color))
+    sprite = _spike_sprites.get(key)
+    if sprite is None:
+        # spikes are not antialiased, so a colorkey is enough and blits much faster than alpha
+        colorkey = (0, 0, 0) if tuple(color) != (0, 0, 0) else (255, 255, 255)
+        sprite = pygame.Surface((width + 1, height + 1))
+        sprite.fill(colorkey)
+        pygame.draw.polygon(sprite, color, ((0, height), (width / 2, 0), (width, height)))
+        sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        _spike_sprites[key] = sprite
+    return sprite
+
+
+def scaled_sprite(surface: pygame.Surface, scale: float) -> pygame.Surface:
+    """Gets a sprite scaled for a render scale, scaling it the first time.
+
+    :param surface: The sprite at full scale.
+    :type surface: pygame.Surface
+    :param scale: The render scale.
+    :type scale: float
+    :return: The scaled sprite.
+    :rtype: pygame.Surface
+    """
+
+    if scale == 1:
+        return surface
+
+    scaled = _scaled_sprites.setdefault(surface, {})
+    sprite = scaled.get(scale)
+    if sprite is None:
+        width, height = surface.get_size()
+        sprite = pygame.transform.scale(
+            surface, (max(1, round(width * scale)), max(1, round(height * scale)))
+        )
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+        scaled[scale] = sprite
+    return sprite
+
+
+def scale_rect(rect: pygame.Rect, scale: float) -> pygame.Rect:
+    """Scales a rect by a render scale, rounding its edges so neighbouring rects still touch.
+
+    :param rect: The rect at full scale.
+    :type rect: pygame.Rect
+    :param scale: The render scale.
+    :type scale: float
+    :return: The scaled rect.
+    :rtype: pygame.Rect
+    """
+
+    if scale == 1:
+        return rect
+
+    left = round(rect.left * scale)
+    top = round(rect.top * scale)
+    return pygame.Rect(
+        left, top, round(rect.right * scale) - left, round(rect.bottom * scale) - top
+    )
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Merges rects that share a full edge into larger rects.
+
+    Rects in the same row with the same top and height are joined when
+    they touch, then the resulting runs are joined downwards when they
+    have the same left and width.
+
+    :param rects: The rects to merge. They are not modified.
+    :type rects: List[pygame.Rect]
+    :return: The merged rects, covering the same pixels.
+    :rtype: List[pygame.Rect]
+    """
+
+    if len(rects) < 2:
+        return list(rects)
+
+    runs: List[pygame.Rect] = []
+    for rect in sorted(rects, key=lambda r: (r.y, r.height, r.x)):
+        last = runs[-1] if runs else None
+        if (
+            last is not None
+            and last.y == rect.y
+            and last.height == rect.height
+            and last.x <= rect.x <= last.right
+        ):
+            last.width = max(last.right, rect.right) - last.x
+        else:
+            runs.append(pygame.Rect(rect))
+
+    merged: List[pygame.Rect] = []
+    for run in sorted(runs, key=lambda r: (r.x, r.width, r.y)):
+        last = merged[-1] if merged else None
+        if (
+            last is not None
+            and last.x == run.x
+            and last.width == run.width
+            and last.y <= run.y <= last.bottom
+        ):
+            last.height = max(last.bottom, run.bottom) - last.y
+        else:
+            merged.append(run)
+
+    return merged
+
+
+class RenderQueue:
+    """Collects the draw commands of a frame and issues them in batches."""
+
+    def __init__(self) -> None:
+        """Initializer for a RenderQueue object."""
+
+        # (layer, kind, color, order, payload)
+        self.commands: List[Tuple[int, int, Color, int, Any]] = []
+
+        # the number of draw calls made by the last flush
+        self.calls: int = 0
+
+    def __len__(self) -> int:
+        """Gets the number of queued commands.
+
+        :return: The number of commands.
+        :rtype: int
+        """
+
+        return len(self.commands)
+
+    def rect(self, rect: pygame.Rect | Tuple[Any, ...], color: Color, layer: int = 0) -> None:
+        """Queues a filled rect.
+
+        :param rect: The rect to fill.
+        :type rect: pygame.Rect | Tuple[Any, ...]
+        :param color: The color of the rect.
+        :type color: Color
+        :param layer: The layer of the rect. Higher layers are drawn on top.
+        :type layer: int, optional
+        """
+
+        self.commands.append((layer, _RECT, tuple(color), len(self.commands), pygame.Rect(rect)))
+
+    def sprite(self, surface: pygame.Surface, pos: Tuple[int, int], layer: int = 0) -> None:
+        """Queues a surface to be blitted.
+
+        :param surface: The surface to blit.
+        :type surface: pygame.Surface
+        :param pos: The position to blit at.
+        :type pos: Tuple[int, int]
+        :param layer: The layer of the surface. Higher layers are drawn on top.
+        :type layer: int, optional
+        """
+
+        # sprites keep the order they were queued in, so they share one sort color
+        self.commands.append((layer, _SPRITE, (0, 0, 0), len(self.commands), (surface, pos)))
+
+    def call(self, function: Callable[..., None], layer: int = 0) -> None:
+        """Queues a function that draws onto the surface itself, e.g. TileMap.draw.
+
+        The function runs when the queue is flushed, possibly on another
+        thread, so it should only use values that will not change before then.
+        It is called with the surface to draw on and a scale keyword argument.
+
+        :param function: The function, called as function(surface, scale=scale).
+        :type function: Callable[..., None]
+        :param layer: The layer of the drawing. Higher layers are drawn on top.
+        :type layer: int, optional
+        """
+
+        self.commands.append((layer, _CALL, (0, 0, 0), len(self.commands), function))
+
+    def add(self, obj: Any, offset: Tuple[int, int] = (0, 0), layer: int | None = None) -> None:
+        """Queues a stage object or hitbox the same way its draw method would draw it.
+
+        :param obj: The object to queue.
+        :type obj: Any
+        :param offset: The amount to shift the object by, from the camera.
+        :type offset: Tuple[int, int], optional
+        :param layer: The layer of the object. Defaults to the layer of its type.
+        :type layer: int | None, optional
+        """
+
+        if layer is None:
+            layer = _LAYERS.get(type(obj), LAYER_PLAYER)
+
+        if isinstance(obj, Spike):
+            self.sprite(
+                spike_sprite(obj.width, obj.height, obj.color),
+                (int(obj.xcor) + offset[0], int(obj.ycor) + offset[1]),
+                layer,
+            )
+        elif isinstance(obj, (Platform, Lava)):
+            # stage objects are already rects, so skip the conversion in rect
+            self.commands.append(
+                (layer, _RECT, tuple(obj.color), len(self.commands), obj.move(offset))
+            )
+        else:
+            self.rect(
+                (obj.xcor + offset[0], obj.ycor + offset[1], obj.width, obj.height),
+                obj.color,
+                layer,
+            )
+
+    def add_all(
+        self, objects: Iterable[Any] | Group, offset: Tuple[int, int] = (0, 0)
+    ) -> None:
+        """Queues many objects, each on the layer of its type.
+
+        :param objects: The objects to queue.
+        :type objects: Iterable[Any] | Group
+        :param offset: The amount to shift the objects by, from the camera.
+        :type offset: Tuple[int, int], optional
+        """
+
+        for obj in objects:
+            self.add(obj, offset)
+
+    def signature(self) -> List[Tuple[int, Any, pygame.Rect]] | None:
+        """Gets what the queued commands draw, to compare the drawing of two frames.
+
+        :return: The layer, the surface or color and the rect of each command in the order
+            they were queued, or None if a queued function makes the drawing unknown.
+        :rtype: List[Tuple[int, Any, pygame.Rect]] | None
+        """
+
+        signature = []
+        for layer, kind, color, _, payload in self.commands:
+            if kind == _CALL:
+                return None
+            if kind == _SPRITE:
+                # surfaces are compared by identity and kept alive by the signature
+                surface, pos = payload
+                signature.append((layer, surface, surface.get_rect(topleft=pos)))
+            else:
+                signature.append((layer, color, payload))
+        return signature
+
+    def clear(self) -> None:
+        """Drops every queued command without drawing."""
+
+        self.commands.clear()
+
+    def flush(
+        self, screen: pygame.Surface, scale: float = 1, max_layer: int | None = None
+    ) -> int:
+        """Draws the queued commands and removes them from the queue.
+
+        :param screen: The surface to draw on.
+        :type screen: pygame.Surface
+        :param scale: The render scale of the surface, 1 for full resolution.
+        :type scale: float, optional
+        :param max_layer: The highest layer to draw. Higher layers stay queued.
+        :type max_layer: int | None, optional
+        :return: The number of draw calls made.
+        :rtype: int
+        """
+
+        self.commands.sort(key=lambda command: command[:4])
+
+        remaining: List[Tuple[int, int, Color, int, Any]] = []
+        if max_layer is not None:
+            split = len(self.commands)
+            while split > 0 and self.commands[split - 1][0] > max_layer:
+                split -= 1
+            remaining = self.commands[split:]
+            del self.commands[split:]
+
+        # fill does not clip rects that start left of the surface correctly, so clip them here
+        clip = screen.get_clip()
+
+        calls = 0
+        index = 0
+        commands = self.commands
+        while index < len(commands):
+            layer, kind, color = commands[index][:3]
+            end = index
+            while end < len(commands) and commands[end][:3] == (layer, kind, color):
+                end += 1
+
+            if kind == _RECT:
+                for rect in merge_rects([command[4] for command in commands[index:end]]):
+                    rect = scale_rect(rect, scale).clip(clip)
+                    if rect.width and rect.height:
+                        screen.fill(color, rect)
+                        calls += 1
+            elif kind == _SPRITE:
+                if scale == 1:
+                    sprites = [command[4] for command in commands[index:end]]
+                else:
+                    sprites = [
+                        (scaled_sprite(sprite, scale), (round(x * scale), round(y * scale)))
+                        for sprite, (x, y) in (command[4] for command in commands[index:end])
+                    ]
+                screen.blits(sprites, False)
+                calls += 1
+            else:
+                for command in commands[index:end]:
+                    command[4](screen, scale=scale)
+                    calls += 1
+
+            index = end
+
+        self.commands = remaining
+        self.calls = calls
+        return calls
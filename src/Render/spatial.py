@@ -0,0 +1,99 @@
+"""Render.spatial.py
+
+Module containing the spatial hash used to find the objects in view.
+"""
+
+import sys
+from typing import Any, Dict, List, Tuple
+
+import pygame
+
+from ..Internal import check_type
+
+
+class SpatialHash:
+    """Buckets objects by the grid cells their rects cover."""
+
+    def __init__(self, cell_size: int = 400) -> None:
+        """Initializer for a SpatialHash object.
+
+        :param cell_size: The size of one bucket in pixels.
+        :type cell_size: int, optional
+        """
+
+        check_type(cell_size, int)
+
+        self.cell_size: int = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        # objects are stored in insertion order, which is also their draw order
+        self.objects: List[Any] = []
+
+    def __len__(self) -> int:
+        """Gets the number of objects in the SpatialHash.
+
+        :return: The number of objects.
+        :rtype: int
+        """
+
+        return len(self.objects)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the buckets and object list in bytes, not the objects in them."""
+
+        size = sys.getsizeof(self.cells) + sys.getsizeof(self.objects)
+        for cell in self.cells.values():
+            size += sys.getsizeof(cell)
+        return size
+
+    @classmethod
+    def from_stage(cls, stage: Tuple[Any, ...], cell_size: int = 400) -> "SpatialHash":
+        """Creates a SpatialHash of the drawable objects of a stage.
+
+        :param stage: The stage, in the format used by Stages.
+        :type stage: Tuple[Any, ...]
+        :param cell_size: The size of one bucket in pixels.
+        :type cell_size: int, optional
+        :return: The created SpatialHash.
+        :rtype: SpatialHash
+        """
+
+        spatial_hash = cls(cell_size)
+        for group in stage[1:4]:
+            if group is not None:
+                for obj in group:
+                    spatial_hash.insert(obj)
+        return spatial_hash
+
+    def insert(self, obj: pygame.Rect) -> None:
+        """Adds an object to the buckets its rect covers.
+
+        :param obj: The object to add. Must be a rect or a subclass of one.
+        :type obj: pygame.Rect
+        """
+
+        index = len(self.objects)
+        self.objects.append(obj)
+
+        size = self.cell_size
+        for cell_y in range(obj.top // size, (obj.bottom - 1) // size + 1):
+            for cell_x in range(obj.left // size, (obj.right - 1) // size + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(index)
+
+    def query(self, rect: pygame.Rect) -> List[Any]:
+        """Gets the objects whose rects intersect the given rect.
+
+        :param rect: The area to search.
+        :type rect: pygame.Rect
+        :return: The objects in the area, in insertion order.
+        :rtype: List[Any]
+        """
+
+        size = self.cell_size
+        found = set()
+        for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                found.update(self.cells.get((cell_x, cell_y), ()))
+
+        objects = self.objects
+        return [objects[index] for index in sorted(found) if rect.colliderect(objects[index])]
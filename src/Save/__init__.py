@@ -0,0 +1,8 @@
+"""Save
+
+The Save package contains the save file format and the background
+writer used to save progress without blocking the gameloop.
+"""
+
+from .savegame import MIGRATIONS, VERSION, SaveError, SaveGame
+from .writer import SaveWriter
@@ -0,0 +1,282 @@
+"""Save/savegame.py
+
+Module containing the save file format.
+
+A save file is a fixed header followed by two sections. The resume
+section holds only what is needed to put the player back at their last
+checkpoint and is all that load reads by default. The extra section
+holds progress such as the visited rooms and is only read on request,
+or otherwise the first time the visited rooms are used.
+
+    header   magic, version, reserved, crc32 of resume, resume size, extra size
+    resume   checkpoint grid location, position, facing, health, play time, deaths
+    extra    number of visited rooms, then the grid location of each
+
+Older versions are upgraded with the migrations in MIGRATIONS when loaded.
+"""
+
+import struct
+import zlib
+from typing import Callable, Dict, Set, Tuple
+
+from ..Internal import check_type
+from ..Player import Player
+from ..Stages import grid_to_stage
+
+MAGIC = b"UMSV"
+'''The bytes every save file starts with.
+'''
+VERSION = 1
+'''The version of the save format written by this module.
+'''
+
+_HEADER = struct.Struct("<4sHHIII")
+_RESUME = struct.Struct("<ii2d?2ddI")
+_VISITED_COUNT = struct.Struct("<H")
+_GRID = struct.Struct("<ii")
+
+# version -> function that upgrades a resume section of that version to the next version.
+# the first version of the format has nothing to migrate from yet.
+MIGRATIONS: Dict[int, Callable[[bytes], bytes]] = {}
+
+
+class SaveError(Exception):
+    pass
+
+
+# pylint: disable=too-many-instance-attributes
+class SaveGame:
+    """The progress of a playthrough and the checkpoint to resume from."""
+
+    def __init__(self) -> None:
+        """Initializer for a SaveGame object."""
+
+        # the checkpoint, which is where the player entered the last room
+        self.grid: Tuple[int, int] = (1, 1)
+        self.xcor: float = 0
+        self.ycor: float = 0
+        self.facing_right: bool = True
+        self.health: float = 0
+        self.max_health: float = 0
+
+        self.play_time: float = 0
+        self.deaths: int = 0
+
+        # the visited rooms, None until they are read from the save file they were loaded from
+        self._visited: Set[Tuple[int, int]] | None = set()
+
+        # the path, offset and size of the extra section in the save file, if not read yet
+        self._extra: Tuple[str, int, int] | None = None
+
+    @property
+    def visited(self) -> Set[Tuple[int, int]]:
+        """The grid locations of the rooms the player has entered.
+
+        When the save was loaded without its extra section, the section is
+        read from the save file the first time this is used.
+
+        :raises SaveError: If the extra section cannot be read.
+        """
+
+        if self._visited is None:
+            self._visited = set() if self._extra is None else _read_extra(*self._extra)
+            self._extra = None
+        return self._visited
+
+    @visited.setter
+    def visited(self, visited: Set[Tuple[int, int]]) -> None:
+        """Sets the visited rooms.
+
+        :param visited: The grid locations of the visited rooms.
+        :type visited: Set[Tuple[int, int]]
+        """
+
+        self._visited = visited
+        self._extra = None
+
+    def checkpoint(self, plr: Player) -> None:
+        """Records the player's current state as the checkpoint.
+
+        :param plr: The player.
+        :type plr: Player
+        """
+
+        check_type(plr, Player)
+
+        self.grid = (plr.grid_xcor, plr.grid_ycor)
+        self.xcor = plr.xcor
+        self.ycor = plr.ycor
+        self.facing_right = plr.facing_right
+        self.health = plr.health
+        self.max_health = plr.max_health
+
+        self.visited.add(self.grid)
+
+    def apply(self, plr: Player, full_health: bool = False) -> None:
+        """Puts the player back at the checkpoint.
+
+        :param plr: The player.
+        :type plr: Player
+        :param full_health: Whether to restore the player to full health.
+        :type full_health: bool, optional
+        """
+
+        check_type(plr, Player)
+
+        plr.grid_xcor, plr.grid_ycor = self.grid
+        plr.stage = grid_to_stage(self.grid)
+        plr.xcor = self.xcor
+        plr.ycor = self.ycor
+        plr.y_vel = 0
+        plr.interp_data.moving = False
+        plr.facing_right = self.facing_right
+        plr.facing_left = not self.facing_right
+        plr.max_health = _whole(self.max_health)
+        plr.health = plr.max_health if full_health else _whole(self.health)
+
+    # serialization
+
+    def to_bytes(self) -> bytes:
+        """Serializes the save in the current format.
+
+        :return: The contents of a save file.
+        :rtype: bytes
+        """
+
+        resume = _RESUME.pack(
+            *self.grid,
+            self.xcor,
+            self.ycor,
+            self.facing_right,
+            self.health,
+            self.max_health,
+            self.play_time,
+            self.deaths,
+        )
+
+        visited = sorted(self.visited)
+        extra = b"".join(
+            [_VISITED_COUNT.pack(len(visited))] + [_GRID.pack(*grid) for grid in visited]
+        )
+
+        header = _HEADER.pack(
+            MAGIC, VERSION, 0, zlib.crc32(resume), len(resume), len(extra)
+        )
+        return header + resume + extra
+
+    @classmethod
+    def load(cls, path: str, extra: bool = False) -> "SaveGame":
+        """Loads a save file, reading only the resume section unless extra is requested.
+
+        Without extra, the extra section is read the first time the visited
+        rooms are used, so the file should not change until then.
+        :param path: The path of the save file.
+        :type path: str
+        :param extra: Whether to also read the extra section.
+        :type extra: bool, optional
+        :raises SaveError: If the file is not a valid save.
+        :return: The loaded save.
+        :rtype: SaveGame
+        """
+
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise SaveError(f"{path} is too short to be a save file.")
+
+            magic, version, _, crc, resume_size, extra_size = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise SaveError(f"{path} is not a save file.")
+            if version > VERSION:
+                raise SaveError(f"{path} was saved by a newer version ({version}) of the game.")
+
+            resume = file.read(resume_size)
+            if len(resume) != resume_size or zlib.crc32(resume) != crc:
+                raise SaveError(f"{path} is corrupted.")
+
+            extra_data = file.read(extra_size) if extra else None
+
+        while version < VERSION:
+            if version not in MIGRATIONS:
+                raise SaveError(f"There is no migration from save version {version}.")
+            resume = MIGRATIONS[version](resume)
+            version += 1
+
+        save = cls()
+        (
+            grid_x,
+            grid_y,
+            save.xcor,
+            save.ycor,
+            save.facing_right,
+            save.health,
+            save.max_health,
+            save.play_time,
+            save.deaths,
+        ) = _RESUME.unpack(resume)
+        save.grid = (grid_x, grid_y)
+
+        if extra_data is not None:
+            save.visited = _read_visited(extra_data)
+        else:
+            save._visited = None
+            save._extra = (path, _HEADER.size + resume_size, extra_size)
+
+        return save
+
+
+def _read_extra(path: str, offset: int, size: int) -> Set[Tuple[int, int]]:
+    """Internal function that reads the visited rooms from the extra section of a save file.
+
+    :param path: The path of the save file.
+    :type path: str
+    :param offset: Where the extra section starts in the file.
+    :type offset: int
+    :param size: The size of the extra section.
+    :type size: int
+    :raises SaveError: If the file cannot be read or the section is cut off.
+    :return: The grid locations of the visited rooms.
+    :rtype: Set[Tuple[int, int]]
+    """
+
+    try:
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read(size)
+    except OSError as e:
+        raise SaveError(f"Could not read the extra section of {path}: {e}") from e
+    return _read_visited(data)
+
+
+def _read_visited(data: bytes) -> Set[Tuple[int, int]]:
+    """Internal function that reads the visited rooms from the extra section.
+
+    :param data: The extra section.
+    :type data: bytes
+    :raises SaveError: If the section is cut off.
+    :return: The grid locations of the visited rooms.
+    :rtype: Set[Tuple[int, int]]
+    """
+
+    if len(data) < _VISITED_COUNT.size:
+        raise SaveError("The extra section of the save is cut off.")
+
+    (count,) = _VISITED_COUNT.unpack_from(data)
+    if len(data) < _VISITED_COUNT.size + count * _GRID.size:
+        raise SaveError("The extra section of the save is cut off.")
+
+    return {
+        _GRID.unpack_from(data, _VISITED_COUNT.size + i * _GRID.size) for i in range(count)
+    }
+
+
+def _whole(value: float) -> int | float:
+    """Internal function that turns whole-number floats back into ints.
+
+    :param value: The value.
+    :type value: float
+    :return: The value as an int if it is a whole number.
+    :rtype: int | float
+    """
+
+    return int(value) if float(value).is_integer() else value
@@ -0,0 +1,116 @@
+"""Save/writer.py
+
+Module containing the background save writer.
+
+Saves are serialized on the calling thread, which only takes a few
+microseconds, and written to disk on a worker thread so the gameloop
+never waits on the disk. Each write goes to a temporary file that is
+then renamed over the save, so a crash mid-write never leaves a
+half-written save behind.
+"""
+
+import os
+import threading
+
+from .savegame import SaveGame
+
+
+class SaveWriter:
+    """Writes saves to one path on a background thread."""
+
+    def __init__(self, path: str) -> None:
+        """Initializer for a SaveWriter object. Starts the worker thread.
+
+        :param path: The path of the save file.
+        :type path: str
+        """
+
+        self.path: str = path
+        self.error: OSError | None = None
+
+        # only the newest save is kept, older pending ones are never written
+        self._pending: bytes | None = None
+        self._closed: bool = False
+        self._writing: bool = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def save(self, save: SaveGame) -> None:
+        """Queues a save to be written. Returns immediately.
+
+        :param save: The save to write.
+        :type save: SaveGame
+        """
+
+        data = save.to_bytes()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot save with a closed SaveWriter.")
+            self._pending = data
+            self._condition.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Waits until every queued save has been written.
+
+        :param timeout: The maximum time to wait in seconds.
+        :type timeout: float | None, optional
+        :return: Whether everything was written before the timeout.
+        :rtype: bool
+        """
+
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._writing, timeout
+            )
+
+    def close(self) -> None:
+        """Writes any queued save and stops the worker thread."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Internal method that runs on the worker thread and writes queued saves."""
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+
+                data, self._pending = self._pending, None
+                self._writing = True
+
+            try:
+                self._write(data)
+                self.error = None
+            except OSError as e:
+                # keep the game running, the next checkpoint will try again
+                self.error = e
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, data: bytes) -> None:
+        """Internal method that atomically replaces the save file with the data.
+
+        :param data: The contents of the save file.
+        :type data: bytes
+        """
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.path)
@@ -0,0 +1,20 @@
+"""Sim
+
+The Sim package contains the headless game and the tools that run it
+without a window, like the soak runner and the route solver.
+"""
+
+from . import invariants
+from .headless import DT, FPS, HeadlessGame
+from .soak import Failure, InputLog, minimize, random_actions, replay, run_episode, soak
+from .solver import (
+    MOVES,
+    SOLVER_VERSION,
+    Exit,
+    Route,
+    WorldReport,
+    room_exits,
+    search_key,
+    solve_room,
+    solve_world,
+)
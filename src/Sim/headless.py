@@ -0,0 +1,116 @@
+"""Sim.headless.py
+
+Module containing the headless game, which runs the simulation part of
+the gameloop without a window so it can be driven by recorded or
+generated input as fast as possible.
+
+Time is counted in frames instead of read from a clock, so the same
+actions always produce the same game.
+"""
+
+from typing import Dict, Tuple
+
+from ..Internal import USE_TILEMAPS, TimerService
+from ..Level import Group, TileMap
+from ..Player import Controls, Player, new_player, snapshot
+from ..Player.controls import RESTART
+from ..Stages import STAGES, TextInfo, room_size
+
+FPS = 60
+'''The frame rate the headless game simulates.
+'''
+DT = 1 / FPS
+'''The time delta of every frame in seconds.
+'''
+
+
+class HeadlessGame:
+    """The simulation of the gameloop without a window, stepped one frame at a time."""
+
+    def __init__(self, use_tilemaps: bool = USE_TILEMAPS) -> None:
+        """Initializer for a HeadlessGame object. Starts a new game.
+
+        :param use_tilemaps: Whether to collide with tilemaps instead of object Groups.
+        :type use_tilemaps: bool, optional
+        """
+
+        self.timers: TimerService = TimerService()
+        self.plr: Player = new_player(self.timers)
+        self.controls: Controls = Controls()
+        self.use_tilemaps: bool = use_tilemaps
+
+        # the number of frames simulated, which is also the clock of the game
+        self.frame: int = 0
+
+        # the number of frames in a row the player has been inside a platform, counted by
+        # invariants.outside_platforms
+        self.frames_inside: int = 0
+
+        self.objects: Tuple[
+            Tuple[int, int], Group, Group | None, Group | None, Tuple[TextInfo, ...] | None
+        ] = STAGES[self.plr.stage]
+        self.tilemaps: Dict[int | str, TileMap] = {}
+        self.tilemap: TileMap | None = None
+        self._load_stage()
+
+        # the state to go back to when restarting after dying
+        self.spawn: bytes = snapshot.capture(self.plr, self.controls)
+
+    def _load_stage(self) -> None:
+        """Internal method that switches the stage objects to the player's stage."""
+
+        self.objects = STAGES[self.plr.stage]
+        if self.use_tilemaps:
+            if self.plr.stage not in self.tilemaps:
+                self.tilemaps[self.plr.stage] = TileMap.from_stage(
+                    self.objects, *room_size(self.plr.stage)
+                )
+            self.tilemap = self.tilemaps[self.plr.stage]
+
+    def step(self, actions: int) -> None:
+        """Simulates one frame in the same order as the gameloop in main.py.
+
+        :param actions: The action bits of the frame.
+        :type actions: int
+        """
+
+        plr = self.plr
+
+        self.controls.apply(plr, actions, DT)
+
+        if actions & RESTART and plr.stage == "GAME_OVER":
+            snapshot.restore(self.spawn, plr, self.controls)
+            self.frames_inside = 0
+            self._load_stage()
+
+        previous_stage = plr.stage
+        plr.update_(DT, self.objects, self.tilemap)
+        if plr.stage != previous_stage:
+            self._load_stage()
+
+        self.controls.release(plr)
+        self.timers.advance()
+        self.frame += 1
+
+    def capture(self) -> bytes:
+        """Takes a snapshot of the game.
+
+        :return: The snapshot. The frame number is not part of it.
+        :rtype: bytes
+        """
+
+        return snapshot.capture(self.plr, self.controls)
+
+    def restore(self, data: bytes, frame: int) -> None:
+        """Restores the game from a snapshot.
+
+        :param data: The snapshot.
+        :type data: bytes
+        :param frame: The frame the snapshot was taken on.
+        :type frame: int
+        """
+
+        snapshot.restore(data, self.plr, self.controls)
+        self.frame = frame
+        self.frames_inside = 0
+        self._load_stage()
@@ -0,0 +1,138 @@
+"""Sim.invariants.py
+
+Module containing the invariants the soak runner checks after every
+frame. Each check returns a description of the problem, or None if
+the invariant holds.
+"""
+
+import math
+from typing import Callable, Collection, Tuple
+
+import pygame
+
+from ..Level import Platform
+from ..Stages import STAGES
+from .headless import HeadlessGame
+
+INSIDE_TOLERANCE = 2
+'''How many pixels the player may overlap a platform on both axes before it counts as inside.
+'''
+
+INSIDE_FRAMES = 8
+'''How many frames in a row the player may be inside a platform before it counts as stuck.
+'''
+
+
+def known_stage(game: HeadlessGame) -> str | None:
+    """Checks that the player is in a stage that exists.
+
+    :param game: The game to check.
+    :type game: HeadlessGame
+    :return: The problem, or None.
+    :rtype: str | None
+    """
+
+    if game.plr.stage not in STAGES:
+        return f"unknown stage {game.plr.stage!r}"
+    return None
+
+
+def health_in_bounds(game: HeadlessGame) -> str | None:
+    """Checks that the player's health is between 0 and its maximum.
+
+    :param game: The game to check.
+    :type game: HeadlessGame
+    :return: The problem, or None.
+    :rtype: str | None
+    """
+
+    plr = game.plr
+    if not 0 <= plr.health <= plr.max_health:
+        return f"health {plr.health} outside 0..{plr.max_health}"
+    return None
+
+
+def finite_position(game: HeadlessGame) -> str | None:
+    """Checks that the player's position and velocity are finite numbers.
+
+    :param game: The game to check.
+    :type game: HeadlessGame
+    :return: The problem, or None.
+    :rtype: str | None
+    """
+
+    plr = game.plr
+    if not all(math.isfinite(value) for value in (plr.xcor, plr.ycor, plr.y_vel)):
+        return f"position ({plr.xcor}, {plr.ycor}) or velocity {plr.y_vel} is not finite"
+    return None
+
+
+def outside_platforms(game: HeadlessGame) -> str | None:
+    """Checks that the player does not stay inside a solid platform.
+
+    Collisions are resolved against where the player was at the start of
+    its update, so when a dash or a room transition moves it into a
+    platform later in the frame, it is only pushed out over the next few.
+    Random input never kept it inside for more than 4 frames in a row.
+
+    :param game: The game to check.
+    :type game: HeadlessGame
+    :return: The problem, or None.
+    :rtype: str | None
+    """
+
+    plr = game.plr
+    if not plr.has_collision:
+        game.frames_inside = 0
+        return None
+
+    # the rect of the player is only moved at the start of its update, so use its coordinates
+    rect = pygame.Rect(int(plr.xcor), int(plr.ycor), plr.width, plr.height)
+    for platform in game.objects[1]:
+        if not isinstance(platform, Platform) or not platform.has_collision:
+            continue
+
+        overlap = rect.clip(platform)
+        if overlap.width <= INSIDE_TOLERANCE or overlap.height <= INSIDE_TOLERANCE:
+            continue
+
+        game.frames_inside += 1
+        if game.frames_inside > INSIDE_FRAMES:
+            return (
+                f"player at ({plr.xcor:.1f}, {plr.ycor:.1f}) is inside the platform "
+                f"{tuple(platform)} of stage {plr.stage!r} for {game.frames_inside} frames"
+            )
+        return None
+
+    game.frames_inside = 0
+    return None
+
+
+INVARIANTS: Tuple[Callable[[HeadlessGame], str | None], ...] = (
+    known_stage,
+    health_in_bounds,
+    finite_position,
+    outside_platforms,
+)
+'''Every invariant checked by the soak runner, in the order they are checked.
+'''
+
+
+def check(game: HeadlessGame, ignore: Collection[str] = ()) -> str | None:
+    """Checks every invariant.
+
+    :param game: The game to check.
+    :type game: HeadlessGame
+    :param ignore: The names of invariants to skip, e.g. while a known bug is unfixed.
+    :type ignore: Collection[str], optional
+    :return: The first problem found as "invariant: description", or None.
+    :rtype: str | None
+    """
+
+    for invariant in INVARIANTS:
+        if invariant.__name__ in ignore:
+            continue
+        problem = invariant(game)
+        if problem is not None:
+            return f"{invariant.__name__}: {problem}"
+    return None
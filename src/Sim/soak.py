@@ -0,0 +1,472 @@
+"""Sim.soak.py
+
+Module containing the soak runner, which plays many headless games
+with seeded random input in a process pool and checks the invariants
+after every frame.
+
+Every game is independent, so the games are spread over worker
+processes and throughput grows with the number of cores. A snapshot is
+taken every few hundred frames, so when a game fails its input log only
+has to start at the last snapshot before the failure. The log is then
+shrunk by replacing runs of input with no input for as long as the game
+still fails the same way, which leaves a short reproduction.
+"""
+
+import concurrent.futures
+import os
+import random
+import struct
+from typing import Collection, Iterable, Iterator, List, Tuple
+
+from ..Internal import check_type
+from ..Player.controls import DASH, JUMP, LEFT, RESTART, RIGHT
+from . import invariants
+from .headless import HeadlessGame
+
+MAGIC = b"SOAK"
+'''The first bytes of an input log file.
+'''
+VERSION = 3
+'''The version of the input log format.
+'''
+
+# magic, version, tilemaps, seed, start frame, then the lengths of the snapshot, actions and failure
+_HEADER = struct.Struct("<4sH?qqIII")
+
+# the chance each frame that an action is pressed or released, lower for rarer actions
+_TOGGLE_CHANCES: Tuple[Tuple[int, float], ...] = (
+    (LEFT, 0.05),
+    (RIGHT, 0.05),
+    (JUMP, 0.1),
+    (DASH, 0.05),
+    (RESTART, 0.02),
+)
+
+
+class InputLog:
+    """The input of a game from a starting snapshot, enough to replay it exactly."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        seed: int,
+        start_frame: int = 0,
+        start: bytes = b"",
+        actions: bytes | bytearray = b"",
+        use_tilemaps: bool = False,
+        failure: str = "",
+    ) -> None:
+        """Initializer for an InputLog object.
+
+        :param seed: The seed the input was generated from.
+        :type seed: int
+        :param start_frame: The frame the log starts on.
+        :type start_frame: int, optional
+        :param start: The snapshot the log starts from, or empty to start a new game.
+        :type start: bytes, optional
+        :param actions: The action bits of each frame, one byte per frame.
+        :type actions: bytes | bytearray, optional
+        :param use_tilemaps: Whether the game collided with tilemaps.
+        :type use_tilemaps: bool, optional
+        :param failure: The failure the log reproduces, if any.
+        :type failure: str, optional
+        """
+
+        check_type(seed, int)
+        check_type(start_frame, int)
+
+        self.seed: int = seed
+        self.start_frame: int = start_frame
+        self.start: bytes = bytes(start)
+        self.actions: bytearray = bytearray(actions)
+        self.use_tilemaps: bool = use_tilemaps
+        self.failure: str = failure
+
+    def __len__(self) -> int:
+        """Gets the number of frames in the log.
+
+        :return: The number of frames.
+        :rtype: int
+        """
+
+        return len(self.actions)
+
+    def to_bytes(self) -> bytes:
+        """Serializes the log.
+
+        :return: The serialized log.
+        :rtype: bytes
+        """
+
+        failure = self.failure.encode("utf-8")
+        return (
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.use_tilemaps,
+                self.seed,
+                self.start_frame,
+                len(self.start),
+                len(self.actions),
+                len(failure),
+            )
+            + self.start
+            + bytes(self.actions)
+            + failure
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputLog":
+        """Deserializes a log.
+
+        :param data: The serialized log.
+        :type data: bytes
+        :raises ValueError: If the data is not an input log.
+        :return: The log.
+        :rtype: InputLog
+        """
+
+        if len(data) < _HEADER.size:
+            raise ValueError("Input log is truncated.")
+
+        magic, version, use_tilemaps, seed, start_frame, start_len, actions_len, failure_len = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an input log, or an unsupported version.")
+        if len(data) != _HEADER.size + start_len + actions_len + failure_len:
+            raise ValueError("Input log is truncated.")
+
+        offset = _HEADER.size
+        start = data[offset : offset + start_len]
+        offset += start_len
+        actions = data[offset : offset + actions_len]
+        offset += actions_len
+
+        return cls(
+            seed,
+            start_frame,
+            start,
+            actions,
+            use_tilemaps,
+            data[offset:].decode("utf-8"),
+        )
+
+    def save(self, path: str) -> None:
+        """Writes the log to a file.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "InputLog":
+        """Reads a log from a file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The log.
+        :rtype: InputLog
+        """
+
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class Failure:  # pylint: disable=too-few-public-methods
+    """A game that broke an invariant or raised, with the input that reproduces it."""
+
+    def __init__(self, seed: int, frame: int, message: str, log: InputLog) -> None:
+        """Initializer for a Failure object.
+
+        :param seed: The seed of the game.
+        :type seed: int
+        :param frame: The frame the game failed on.
+        :type frame: int
+        :param message: What went wrong.
+        :type message: str
+        :param log: The shortest input found that reproduces the failure.
+        :type log: InputLog
+        """
+
+        self.seed: int = seed
+        self.frame: int = frame
+        self.message: str = message
+        self.log: InputLog = log
+
+    def __str__(self) -> str:
+        """Formats the failure as one line.
+
+        :return: The failure.
+        :rtype: str
+        """
+
+        return (
+            f"seed {self.seed} failed on frame {self.frame} "
+            f"({len(self.log)} frame repro): {self.message}"
+        )
+
+
+def random_actions(rng: random.Random) -> Iterator[int]:
+    """Generates random input like a player mashing keys, holding each key for a while.
+
+    :param rng: The random number generator to use.
+    :type rng: random.Random
+    :return: The action bits of each frame, forever.
+    :rtype: Iterator[int]
+    """
+
+    held = 0
+    while True:
+        for action, chance in _TOGGLE_CHANCES:
+            if rng.random() < chance:
+                held ^= action
+        yield held
+
+
+def _kind(message: str) -> str:
+    """Internal function that gets the kind of a failure, without its details.
+
+    :param message: The failure message.
+    :type message: str
+    :return: The part before the first colon, e.g. the invariant or exception name.
+    :rtype: str
+    """
+
+    return message.split(":", 1)[0]
+
+
+def step_checked(game: HeadlessGame, actions: int, ignore: Collection[str] = ()) -> str | None:
+    """Simulates a frame and checks the invariants.
+
+    :param game: The game.
+    :type game: HeadlessGame
+    :param actions: The action bits of the frame.
+    :type actions: int
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str], optional
+    :return: What went wrong, or None.
+    :rtype: str | None
+    """
+
+    try:
+        game.step(actions)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    return invariants.check(game, ignore)
+
+
+def replay(log: InputLog, ignore: Collection[str] = ()) -> Tuple[int, str] | None:
+    """Replays an input log and checks the invariants after every frame.
+
+    :param log: The input log.
+    :type log: InputLog
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str], optional
+    :return: The index in the log and message of the first failure, or None.
+    :rtype: Tuple[int, str] | None
+    """
+
+    game = HeadlessGame(log.use_tilemaps)
+    if log.start:
+        game.restore(log.start, log.start_frame)
+
+    for index, actions in enumerate(log.actions):
+        message = step_checked(game, actions, ignore)
+        if message is not None:
+            return index, message
+    return None
+
+
+def minimize(log: InputLog, max_replays: int = 200, ignore: Collection[str] = ()) -> InputLog:
+    """Shrinks an input log that fails while it keeps failing the same way.
+
+    The log is cut off after the failing frame, then runs of frames are
+    replaced with no input, from half the log down to single frames.
+
+    :param log: The failing input log.
+    :type log: InputLog
+    :param max_replays: The most replays to spend on shrinking.
+    :type max_replays: int, optional
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str], optional
+    :return: The shrunk log, or the original log if it does not fail.
+    :rtype: InputLog
+    """
+
+    result = replay(log, ignore)
+    if result is None:
+        return log
+    index, message = result
+    kind = _kind(message)
+
+    best = InputLog(
+        log.seed, log.start_frame, log.start, log.actions[: index + 1], log.use_tilemaps, message
+    )
+
+    replays = 1
+    chunk = max(1, len(best) // 2)
+    while replays < max_replays:
+        changed = False
+        start = 0
+        while start < len(best) and replays < max_replays:
+            if not any(best.actions[start : start + chunk]):
+                start += chunk
+                continue
+
+            candidate = InputLog(
+                best.seed, best.start_frame, best.start, best.actions, best.use_tilemaps
+            )
+            # no input for the frames of the chunk
+            end = min(start + chunk, len(best))
+            candidate.actions[start:end] = bytes(end - start)
+            result = replay(candidate, ignore)
+            replays += 1
+
+            if result is not None and _kind(result[1]) == kind:
+                index, message = result
+                candidate.actions = candidate.actions[: index + 1]
+                candidate.failure = message
+                best = candidate
+                changed = True
+            start += chunk
+
+        if chunk == 1 and not changed:
+            break
+        chunk = max(1, chunk // 2)
+
+    return best
+
+
+def run_episode(
+    seed: int,
+    frames: int,
+    use_tilemaps: bool = False,
+    snapshot_every: int = 600,
+    ignore: Collection[str] = (),
+) -> Tuple[Failure | None, int]:
+    """Plays one game with seeded random input until it fails or runs out of frames.
+
+    :param seed: The seed of the random input.
+    :type seed: int
+    :param frames: The number of frames to play.
+    :type frames: int
+    :param use_tilemaps: Whether to collide with tilemaps instead of object Groups.
+    :type use_tilemaps: bool, optional
+    :param snapshot_every: How many frames apart snapshots are taken. A failure's input
+        log starts at the last snapshot before it.
+    :type snapshot_every: int, optional
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str], optional
+    :return: The failure or None, and the number of frames played.
+    :rtype: Tuple[Failure | None, int]
+    """
+
+    game = HeadlessGame(use_tilemaps)
+    inputs = random_actions(random.Random(seed))
+
+    # only the input since the last snapshot is kept
+    snapshot_frame = 0
+    snapshot = b""
+    actions = bytearray()
+
+    for frame in range(frames):
+        if frame % snapshot_every == 0:
+            snapshot_frame, snapshot = frame, game.capture()
+            actions.clear()
+
+        action = next(inputs)
+        actions.append(action)
+        message = step_checked(game, action, ignore)
+        if message is not None:
+            log = minimize(
+                InputLog(seed, snapshot_frame, snapshot, actions, use_tilemaps), ignore=ignore
+            )
+            return Failure(seed, frame, message, log), frame + 1
+
+    return None, frames
+
+
+def _run_batch(
+    seeds: List[int], frames: int, use_tilemaps: bool, ignore: Collection[str]
+) -> Tuple[List[Failure], int]:
+    """Internal function that runs a batch of episodes in a worker process.
+
+    :param seeds: The seeds of the episodes.
+    :type seeds: List[int]
+    :param frames: The number of frames of each episode.
+    :type frames: int
+    :param use_tilemaps: Whether to collide with tilemaps.
+    :type use_tilemaps: bool
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str]
+    :return: The failures and the total number of frames played.
+    :rtype: Tuple[List[Failure], int]
+    """
+
+    failures = []
+    played = 0
+    for seed in seeds:
+        failure, count = run_episode(seed, frames, use_tilemaps, ignore=ignore)
+        played += count
+        if failure is not None:
+            failures.append(failure)
+    return failures, played
+
+
+def soak(  # pylint: disable=too-many-arguments
+    seeds: Iterable[int],
+    frames: int,
+    workers: int | None = None,
+    use_tilemaps: bool = False,
+    out_dir: str | None = None,
+    batch_size: int = 1,
+    ignore: Collection[str] = (),
+) -> Tuple[List[Failure], int]:
+    """Plays a game for each seed in a process pool and collects the failures.
+
+    :param seeds: The seed of each game.
+    :type seeds: Iterable[int]
+    :param frames: The number of frames to play in each game.
+    :type frames: int
+    :param workers: The number of worker processes, defaults to the number of cores.
+    :type workers: int | None, optional
+    :param use_tilemaps: Whether to collide with tilemaps instead of object Groups.
+    :type use_tilemaps: bool, optional
+    :param out_dir: The directory the input log of every failure is saved in, as
+        <seed>.soak, or None to not save them.
+    :type out_dir: str | None, optional
+    :param batch_size: The number of games sent to a worker at once.
+    :type batch_size: int, optional
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str], optional
+    :return: The failures, and the total number of frames played.
+    :rtype: Tuple[List[Failure], int]
+    """
+
+    check_type(frames, int)
+
+    seeds = list(seeds)
+    batches = [seeds[i : i + batch_size] for i in range(0, len(seeds), batch_size)]
+
+    failures: List[Failure] = []
+    played = 0
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_run_batch, batch, frames, use_tilemaps, tuple(ignore))
+            for batch in batches
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            batch_failures, batch_played = future.result()
+            failures.extend(batch_failures)
+            played += batch_played
+
+    failures.sort(key=lambda failure: failure.seed)
+    if out_dir is not None and failures:
+        os.makedirs(out_dir, exist_ok=True)
+        for failure in failures:
+            failure.log.save(os.path.join(out_dir, f"{failure.seed}.soak"))
+
+    return failures, played
@@ -0,0 +1,686 @@
+"""Sim.solver.py
+
+Module containing the route solver, which checks that every stage can
+be reached and finds fast routes through them, using the same physics
+as the game.
+
+Each room is searched from the state the player enters it in. The
+search tries a small set of moves, each held for a few frames, from
+every state it has reached, and restores snapshots to branch instead of
+replaying from the start. States that round to the same position and
+jump and dash charges are only expanded again when they have clearly
+more upward speed, since they can then reach everything the earlier one
+could. This keeps the search small, and when a depth has more states
+than the beam width, the ones closest to an exit not found yet are kept.
+Since every move takes the same number of frames, the first time an
+exit is reached is also the fastest route to it that the search can
+find.
+
+The exits of a room are the openings in its edges, so two ways into
+the same neighbour are kept apart. The room behind every exit that was
+reached is searched next, from the state the player entered it in. The
+searches of a wave run in parallel in a process pool.
+
+A search only depends on the state it starts from and the rooms it
+runs in, which are its own and, on the frame it leaves, the one it
+enters. With a cache directory its routes are kept on disk under a
+hash of them. Running the solver again after editing some stages only
+searches the rooms that changed, the rooms next to them, and the rooms
+after them whose entry states changed with them.
+"""
+
+import concurrent.futures
+import hashlib
+import inspect
+import json
+import math
+import os
+from typing import Any, Collection, Dict, List, Set, Tuple
+
+from ..Internal import check_type
+from ..Player.controls import DASH, JUMP, LEFT, RIGHT
+from ..Stages import GRID_LOCATIONS, STAGES, Stage, StageNotFoundError, grid_to_stage, room_size
+from . import invariants
+from .headless import HeadlessGame
+
+MOVES: Tuple[int, ...] = (
+    0,
+    LEFT,
+    RIGHT,
+    JUMP,
+    LEFT | JUMP,
+    RIGHT | JUMP,
+    LEFT | DASH,
+    RIGHT | DASH,
+)
+'''The action bits of every move the search tries. Jumps and dashes are only pressed
+on the first frame of a move, so a jump right after a jump is a double jump.
+'''
+
+SOLVER_VERSION = 1
+'''The version of the search and the physics it runs, part of every cache key. Bump it when
+either changes, so cached searches are not reused.
+'''
+
+# a searched state as its snapshot, the index of the state it came from and its move
+_Node = Tuple[bytes, int, int]
+
+
+Exit = Tuple[int | str, str, int, int]
+'''An opening in the edge of a room as the stage it leads to, the side of the room it is
+on, and where it starts and ends along that side.
+'''
+
+
+class Route:  # pylint: disable=too-few-public-methods
+    """The fastest way found from entering one stage to leaving it through an exit."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, source: int | str, exit_: Exit, frames: int, actions: bytes, end: bytes
+    ) -> None:
+        """Initializer for a Route object.
+
+        :param source: The name of the stage the route starts in.
+        :type source: int | str
+        :param exit_: The exit the route leaves through.
+        :type exit_: Exit
+        :param frames: The number of frames the route takes.
+        :type frames: int
+        :param actions: The action bits of each frame of the route.
+        :type actions: bytes
+        :param end: The snapshot of the game on entering the next stage.
+        :type end: bytes
+        """
+
+        self.source: int | str = source
+        self.exit: Exit = exit_
+        self.frames: int = frames
+        self.actions: bytes = actions
+        self.end: bytes = end
+
+    @property
+    def target(self) -> int | str:
+        """The name of the stage the route leads to."""
+
+        return self.exit[0]
+
+    def __str__(self) -> str:
+        """Formats the route as one line.
+
+        :return: The route.
+        :rtype: str
+        """
+
+        _, side, start, end = self.exit
+        return (
+            f"{self.source} -> {self.target} through {side} {start}..{end} "
+            f"in {self.frames} frames"
+        )
+
+
+def room_exits(name: int | str, min_size: int = 50, spacing: int = 10) -> List[Exit]:
+    """Finds the openings in the edges of a room that lead to another regular stage.
+
+    :param name: The name of the stage.
+    :type name: int | str
+    :param min_size: The smallest opening the player fits through, in pixels.
+    :type min_size: int, optional
+    :param spacing: The distance between the points checked along each edge, in pixels.
+    :type spacing: int, optional
+    :return: The exits of the room.
+    :rtype: List[Exit]
+    """
+
+    grid_x, grid_y = GRID_LOCATIONS[name]
+    width, height = room_size(name)
+    solids = [platform for platform in STAGES[name][1] if platform.has_collision]
+
+    found: List[Exit] = []
+    for side, grid, length in (
+        ("left", (grid_x - 1, grid_y), height),
+        ("right", (grid_x + 1, grid_y), height),
+        ("up", (grid_x, grid_y - 1), width),
+        ("down", (grid_x, grid_y + 1), width),
+    ):
+        try:
+            target = grid_to_stage(grid)
+        except StageNotFoundError:
+            continue
+        # special stages like GAME_OVER are not places a route can go
+        if not isinstance(target, int):
+            continue
+
+        # points just inside the edge that are not in a platform are open
+        opening_start = None
+        for along in range(0, length + spacing, spacing):
+            point = {
+                "left": (1, along),
+                "right": (width - 2, along),
+                "up": (along, 1),
+                "down": (along, height - 2),
+            }[side]
+            is_open = along < length and not any(
+                solid.collidepoint(point) for solid in solids
+            )
+            if is_open and opening_start is None:
+                opening_start = along
+            elif not is_open and opening_start is not None:
+                if along - opening_start >= min_size:
+                    found.append((target, side, opening_start, along))
+                opening_start = None
+    return found
+
+
+def _which_exit(game: HeadlessGame, exits: List[Exit]) -> Exit | None:
+    """Internal function that finds the exit the player just left the room through.
+
+    :param game: The game, on the frame the player entered the next stage.
+    :type game: HeadlessGame
+    :param exits: The exits of the room the player left.
+    :type exits: List[Exit]
+    :return: The exit, or None if the player is not in a stage one of them leads to.
+    :rtype: Exit | None
+    """
+
+    # the position along the side is kept when the player changes rooms
+    plr = game.plr
+    best = None
+    best_distance = math.inf
+    for exit_ in exits:
+        target, side, start, end = exit_
+        if target != plr.stage:
+            continue
+        along = plr.ycor + plr.height / 2 if side in ("left", "right") else plr.xcor + plr.width / 2
+        distance = max(start - along, along - end, 0)
+        if distance < best_distance:
+            best, best_distance = exit_, distance
+    return best
+
+
+def _distance(game: HeadlessGame, exit_: Exit, size: Tuple[int, int]) -> float:
+    """Internal function that gets how far the center of the player is from an exit.
+
+    :param game: The game.
+    :type game: HeadlessGame
+    :param exit_: The exit.
+    :type exit_: Exit
+    :param size: The width and height of the room.
+    :type size: Tuple[int, int]
+    :return: The distance in pixels.
+    :rtype: float
+    """
+
+    _, side, start, end = exit_
+    center_x, center_y = game.plr.xcor + game.plr.width / 2, game.plr.ycor + game.plr.height / 2
+    if side in ("left", "right"):
+        across = center_x if side == "left" else size[0] - center_x
+        along = max(start - center_y, center_y - end, 0)
+    else:
+        across = center_y if side == "up" else size[1] - center_y
+        along = max(start - center_x, center_x - end, 0)
+    return math.hypot(across, along)
+
+
+def _key(game: HeadlessGame, cell: int) -> Tuple[int, ...]:
+    """Internal function that rounds the state of the player, except its speed, for deduplication.
+
+    :param game: The game.
+    :type game: HeadlessGame
+    :param cell: The size of a position cell in pixels.
+    :type cell: int
+    :return: The rounded state.
+    :rtype: Tuple[int, ...]
+    """
+
+    plr = game.plr
+    dash_timer = game.controls.dash_timer
+    return (
+        int(plr.xcor // cell),
+        int(plr.ycor // cell),
+        plr.on_ground,
+        plr.double_jump_debounce,
+        game.controls.dash_charged,
+        # waiting for the dash to recharge is progress, even while standing still
+        0 if dash_timer is None else dash_timer.remaining,
+        plr.interp_data.moving,
+    )
+
+
+def _actions(nodes: List[_Node], index: int, hold: int) -> bytes:
+    """Internal function that gets the action bits of every frame leading to a state.
+
+    :param nodes: Every state the search reached.
+    :type nodes: List[_Node]
+    :param index: The index of the state.
+    :type index: int
+    :param hold: The number of frames each move is held for.
+    :type hold: int
+    :return: The action bits of each frame.
+    :rtype: bytes
+    """
+
+    moves = []
+    while index > 0:
+        _, index, move = nodes[index]
+        moves.append(move)
+
+    actions = bytearray()
+    for move in reversed(moves):
+        actions.append(move)
+        actions.extend(bytes([move & (LEFT | RIGHT)]) * (hold - 1))
+    return bytes(actions)
+
+
+def _moves(game: HeadlessGame) -> List[int]:
+    """Internal function that gets the moves that do something different from each other.
+
+    Jumping without a jump left and dashing without the dash charged are
+    the same as walking, so they are left out.
+
+    :param game: The game.
+    :type game: HeadlessGame
+    :return: The action bits of the moves.
+    :rtype: List[int]
+    """
+
+    plr = game.plr
+    can_jump = plr.on_ground or not plr.double_jump_debounce
+    can_dash = game.controls.dash_charged
+    return [
+        move
+        for move in MOVES
+        if (can_jump or not move & JUMP) and (can_dash or not move & DASH)
+    ]
+
+
+def _move(  # pylint: disable=too-many-arguments
+    game: HeadlessGame,
+    move: int,
+    hold: int,
+    room: int | str,
+    ignore: Collection[str],
+    allow_damage: bool,
+) -> bool:
+    """Internal function that plays a move, stopping early if the player leaves the room.
+
+    :param game: The game.
+    :type game: HeadlessGame
+    :param move: The action bits of the move.
+    :type move: int
+    :param hold: The number of frames the move is held for.
+    :type hold: int
+    :param room: The name of the stage being searched.
+    :type room: int | str
+    :param ignore: The names of invariants to skip.
+    :type ignore: Collection[str]
+    :param allow_damage: Whether the player may get hurt.
+    :type allow_damage: bool
+    :return: Whether every frame kept the invariants, and the player unhurt if required.
+    :rtype: bool
+    """
+
+    # the jump and dash are pressed on the first frame, the walking is held
+    health = game.plr.health
+    actions = move
+    for _ in range(hold):
+        try:
+            game.step(actions)
+        except StageNotFoundError:
+            # the player left the room where there is no stage
+            return False
+        # clipping into a platform is not used, even for the frames the soak lets it last
+        if invariants.check(game, ignore) is not None or game.frames_inside:
+            return False
+        if not allow_damage and game.plr.health < health:
+            return False
+        if game.plr.stage != room:
+            break
+        actions = move & (LEFT | RIGHT)
+    return True
+
+
+def solve_room(  # pylint: disable=too-many-arguments,too-many-locals
+    start: bytes,
+    hold: int = 4,
+    max_frames: int = 1200,
+    beam_width: int = 1000,
+    cell: int = 16,
+    speed_cell: int = 150,
+    ignore: Collection[str] = (),
+    allow_damage: bool = False,
+) -> Tuple[List[Route], int]:
+    """Searches for the fastest route from a state to every exit of its room.
+
+    :param start: The snapshot of the game to start from.
+    :type start: bytes
+    :param hold: The number of frames each move is held for.
+    :type hold: int, optional
+    :param max_frames: The longest route to search for, in frames.
+    :type max_frames: int, optional
+    :param beam_width: The most states kept at each depth of the search.
+    :type beam_width: int, optional
+    :param cell: The size of a position cell in pixels. It should be less than the distance
+        walked in one move, or walking never leaves the cell it started in.
+    :type cell: int, optional
+    :param speed_cell: How much more upward speed, in pixels per second, a state needs to
+        be expanded again in a cell that was already reached.
+    :type speed_cell: int, optional
+    :param ignore: The names of invariants to skip. Moves that break the others, like
+        clipping into a platform, are not used.
+    :type ignore: Collection[str], optional
+    :param allow_damage: Whether routes may hurt the player. Routes that do can leave too
+        little health for the next rooms, so they are not used by default.
+    :type allow_damage: bool, optional
+    :return: The route found to each exit that can be reached, and the number of moves tried.
+    :rtype: Tuple[List[Route], int]
+    """
+
+    check_type(hold, int)
+
+    game = HeadlessGame()
+    game.restore(start, 0)
+    room = game.plr.stage
+    size = room_size(room)
+    exits = room_exits(room)
+
+    routes: Dict[Exit, Route] = {}
+    nodes: List[_Node] = [(start, 0, 0)]
+    # the most upward speed each rounded state was reached with
+    seen: Dict[Tuple[int, ...], float] = {_key(game, cell): game.plr.y_vel}
+    frontier = [0]
+    tried = 0
+
+    for depth in range(1, max_frames // hold + 1):
+        ranked: List[Tuple[float, int]] = []
+        remaining = [exit_ for exit_ in exits if exit_ not in routes]
+        for parent in frontier:
+            game.restore(nodes[parent][0], 0)
+            for move in _moves(game):
+                game.restore(nodes[parent][0], 0)
+                tried += 1
+
+                if not _move(game, move, hold, room, ignore, allow_damage):
+                    continue
+
+                if game.plr.stage != room:
+                    exit_ = _which_exit(game, exits)
+                    if exit_ is not None and exit_ not in routes:
+                        # the move is cut short on the frame the player left the room
+                        frames = (depth - 1) * hold + game.frame
+                        nodes.append((game.capture(), parent, move))
+                        actions = _actions(nodes, len(nodes) - 1, hold)[:frames]
+                        routes[exit_] = Route(room, exit_, frames, actions, nodes[-1][0])
+                    # dying and special stages end the route
+                    continue
+
+                # a state is only worse than one with more upward speed, which can reach
+                # everything it can
+                key = _key(game, cell)
+                if seen.get(key, math.inf) - speed_cell <= game.plr.y_vel:
+                    continue
+                seen[key] = game.plr.y_vel
+
+                nodes.append((game.capture(), parent, move))
+                ranked.append(
+                    (
+                        min((_distance(game, exit_, size) for exit_ in remaining), default=0),
+                        len(nodes) - 1,
+                    )
+                )
+
+        if len(routes) == len(exits) or not ranked:
+            break
+
+        # the states closest to an exit that was not reached yet are kept
+        if len(ranked) > beam_width:
+            ranked.sort()
+            del ranked[beam_width:]
+        frontier = [index for _, index in ranked]
+
+    return list(routes.values()), tried
+
+
+def search_key(start: bytes, **search: Any) -> str:
+    """Hashes everything a room search depends on.
+
+    :param start: The snapshot of the game the search starts from.
+    :type start: bytes
+    :param search: The arguments passed on to solve_room.
+    :type search: Any
+    :return: The hex digest of the colliders of the room and the rooms its exits lead to,
+        its exits, the start and the arguments.
+    :rtype: str
+    """
+
+    game = HeadlessGame()
+    game.restore(start, 0)
+    room = game.plr.stage
+
+    # the defaults are filled in, so leaving an argument out gives the same key as passing it
+    arguments = inspect.signature(solve_room).bind(start, **search)
+    arguments.apply_defaults()
+    del arguments.arguments["start"]
+
+    digest = hashlib.sha1()
+    digest.update(
+        repr(
+            (
+                SOLVER_VERSION,
+                room,
+                room_size(room),
+                room_exits(room),
+                sorted((name, repr(value)) for name, value in arguments.arguments.items()),
+            )
+        ).encode()
+    )
+    digest.update(start)
+    # the snapshots routes end with hold the objects of the rooms the exits lead to
+    for name in [room, *sorted({exit_[0] for exit_ in room_exits(room)}, key=str)]:
+        _hash_colliders(digest, STAGES[name])
+    return digest.hexdigest()
+
+
+def _hash_colliders(digest: Any, stage: Stage) -> None:
+    """Internal function that adds what the player collides with in a stage to a hash.
+
+    :param digest: The hash object.
+    :type digest: Any
+    :param stage: The stage.
+    :type stage: Stage
+    """
+
+    # spikes hurt through their own hitbox
+    for group in stage[1:4]:
+        for obj in group or ():
+            digest.update(
+                repr(
+                    (type(obj).__name__, tuple(getattr(obj, "hitbox", obj)), obj.has_collision)
+                ).encode()
+            )
+        digest.update(b";")
+
+
+def _load_search(path: str) -> Tuple[List[Route], int] | None:
+    """Internal function that reads a cached room search.
+
+    :param path: The path of the cache file.
+    :type path: str
+    :return: The routes and the number of moves tried, or None if the search is not cached.
+    :rtype: Tuple[List[Route], int] | None
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    routes = [
+        Route(
+            route["source"],
+            tuple(route["exit"]),
+            route["frames"],
+            bytes.fromhex(route["actions"]),
+            bytes.fromhex(route["end"]),
+        )
+        for route in data["routes"]
+    ]
+    return routes, data["tried"]
+
+
+def _save_search(path: str, routes: List[Route], tried: int) -> None:
+    """Internal function that writes a room search to the cache.
+
+    :param path: The path of the cache file.
+    :type path: str
+    :param routes: The routes found.
+    :type routes: List[Route]
+    :param tried: The number of moves tried.
+    :type tried: int
+    """
+
+    data = {
+        "tried": tried,
+        "routes": [
+            {
+                "source": route.source,
+                "exit": list(route.exit),
+                "frames": route.frames,
+                "actions": route.actions.hex(),
+                "end": route.end.hex(),
+            }
+            for route in routes
+        ],
+    }
+    # written next to the cache file and moved over it, so a stopped run leaves no half file
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(path + ".tmp", path)
+
+
+class WorldReport:
+    """Which stages can be reached from the start of the game and how fast."""
+
+    def __init__(self) -> None:
+        """Initializer for a WorldReport object."""
+
+        # the fastest route found through each exit, by the stage it starts in
+        self.routes: Dict[Tuple[int | str, Exit], Route] = {}
+
+        # the fewest frames from a new game to entering each stage, and the input that does it
+        self.arrival: Dict[int | str, int] = {}
+        self.inputs: Dict[int | str, bytes] = {}
+
+        # the number of moves tried and rooms searched, and how many searches came from the cache
+        self.tried: int = 0
+        self.searches: int = 0
+        self.cached: int = 0
+
+    @property
+    def unreachable(self) -> List[int | str]:
+        """The regular stages no route was found to."""
+
+        return [
+            name
+            for name in GRID_LOCATIONS
+            if isinstance(name, int) and name not in self.arrival
+        ]
+
+    def __str__(self) -> str:
+        """Formats the report with a line for each stage and route.
+
+        :return: The report.
+        :rtype: str
+        """
+
+        lines = [str(route) for _, route in sorted(self.routes.items(), key=str)]
+        lines.extend(
+            f"stage {name} reached in {frames} frames"
+            for name, frames in sorted(self.arrival.items(), key=lambda item: item[1])
+        )
+        if self.unreachable:
+            lines.append(f"unreachable: {', '.join(map(str, self.unreachable))}")
+        return "\n".join(lines)
+
+
+def solve_world(
+    workers: int | None = None, cache_dir: str | None = None, **search: Any
+) -> WorldReport:
+    """Searches every room reachable from the start of a new game, in a process pool.
+
+    A room is searched again for every exit it is entered through, since
+    different exits can lead to parts of the room that are not connected.
+
+    :param workers: The number of worker processes, defaults to the number of cores.
+    :type workers: int | None, optional
+    :param cache_dir: The directory room searches are cached in, or None to search every
+        room.
+    :type cache_dir: str | None, optional
+    :param search: Passed on to solve_room, like hold and beam_width.
+    :type search: Any
+    :return: The routes found and the fastest arrival at each stage.
+    :rtype: WorldReport
+    """
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    report = WorldReport()
+    game = HeadlessGame()
+    report.arrival[game.plr.stage] = 0
+    report.inputs[game.plr.stage] = b""
+
+    # each entry is searched once: its snapshot, and the frames and input since the start
+    wave: Dict[Tuple[int | str, Exit] | None, Tuple[bytes, int, bytes]] = {
+        None: (game.capture(), 0, b"")
+    }
+    searched: Set[Tuple[int | str, Exit] | None] = set()
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        while wave:
+            searched.update(wave)
+            report.searches += len(wave)
+
+            # (routes, tried) of each entry, from the cache or a future of the search
+            results: List[Tuple[Any, int, bytes, str | None]] = []
+            for snapshot, frames, inputs in wave.values():
+                path = None
+                if cache_dir is not None:
+                    path = os.path.join(cache_dir, search_key(snapshot, **search) + ".json")
+                    cached = _load_search(path)
+                    if cached is not None:
+                        report.cached += 1
+                        results.append((cached, frames, inputs, None))
+                        continue
+                results.append(
+                    (executor.submit(solve_room, snapshot, **search), frames, inputs, path)
+                )
+
+            entries: Dict[Tuple[int | str, Exit] | None, Tuple[bytes, int, bytes]] = {}
+            for result, start_frames, start_inputs, path in results:
+                if isinstance(result, concurrent.futures.Future):
+                    result = result.result()
+                    if path is not None:
+                        _save_search(path, *result)
+                routes, tried = result
+                report.tried += tried
+
+                for route in routes:
+                    frames = start_frames + route.frames
+                    inputs = start_inputs + route.actions
+
+                    entry = (route.source, route.exit)
+                    best = report.routes.get(entry)
+                    if best is None or route.frames < best.frames:
+                        report.routes[entry] = route
+                    if frames < report.arrival.get(route.target, frames + 1):
+                        report.arrival[route.target] = frames
+                        report.inputs[route.target] = inputs
+
+                    if entry not in searched and (
+                        entry not in entries or frames < entries[entry][1]
+                    ):
+                        entries[entry] = (route.end, frames, inputs)
+
+            wave = entries
+
+    return report
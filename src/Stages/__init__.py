@@ -1,6 +1,15 @@
 """Stages
 
-The Stages package contains preset Groups for each level.
+The Stages package contains preset Groups for each level and the
+lifecycle that loads and unloads them around the player, and the
+stress stage generator for scaling tests.
 """
 
 from .__stages import *
+
+# the old stage constants, like DEBUG and STAGE1, are built the first time they are used
+from .__stages import __getattr__
+from .lifecycle import EVENTS, Resource, ResourceKey, StageLifecycle, resource_size
+from .navigation import nav_graph
+from .preload import neighbours
+from .stress import SPAWN, Mover, add_stage, stress_stage
@@ -0,0 +1,396 @@
+"""Stages.lifecycle.py
+
+Module containing the stage lifecycle, which keeps only the stages around
+the player loaded.
+
+The stage the player is in and its neighbours are the active area. A stage
+is loaded when it joins the active area and unloaded when it leaves it,
+and the player enters and exits stages inside it. Hooks can be added for
+each of the four events.
+
+Everything built for a stage, the stage itself included, is a resource
+acquired through the lifecycle by the stages that use it, so a resource
+shared by several stages, like a line of text, is only built once.
+Unloading a stage only drops its references. Resources that no stage
+references are kept, so walking back into a room does not build it again,
+until their total size goes over the memory budget, when the ones used
+longest ago are freed. Memory follows the active area instead of how much
+of the world has been visited. Resources built from a stage, like its
+tilemap, depend on it and are freed with it, so they are never kept for
+a stage that has to be built again.
+"""
+
+import collections
+import sys
+from typing import Any, Callable, Dict, Hashable, List, OrderedDict, Set, Tuple
+
+import pygame
+
+from ..Internal import check_type, check_value
+from .__stages import GRID_LOCATIONS, STAGES, Stage, StageMap
+from .preload import neighbours
+
+EVENTS: Tuple[str, ...] = ("load", "enter", "exit", "unload")
+'''The events of the stage lifecycle, in the order they happen to a stage.
+'''
+
+ResourceKey = Tuple[Hashable, ...]
+'''The key of a resource, with the kind of resource first, e.g. ("tilemap", 7).
+'''
+
+
+def resource_size(value: Any) -> int:
+    """Estimates the memory a resource holds.
+
+    Surfaces count their pixels, objects with an nbytes attribute report
+    their own size, and anything else is measured with sys.getsizeof
+    through its containers and attributes.
+
+    :param value: The resource.
+    :type value: Any
+    :return: The estimated size in bytes.
+    :rtype: int
+    """
+
+    return _deep_size(value, set())
+
+
+def _deep_size(value: Any, seen: Set[int]) -> int:
+    """Internal function that measures a value and everything it holds, counting each once.
+
+    :param value: The value.
+    :type value: Any
+    :param seen: The ids of the values already counted.
+    :type seen: Set[int]
+    :return: The size in bytes.
+    :rtype: int
+    """
+
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, pygame.Surface):
+        return value.get_pitch() * value.get_height()
+    if isinstance(value, (str, bytes, bytearray, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+
+    # Group forwards missing attributes to its objects, so only look in the class
+    nbytes = getattr(type(value), "nbytes", None)
+    if isinstance(nbytes, property):
+        return nbytes.fget(value)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _deep_size(key, seen) + _deep_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _deep_size(item, seen)
+    if hasattr(value, "__dict__"):
+        size += _deep_size(vars(value), seen)
+    return size
+
+
+# pylint: disable=too-few-public-methods
+class Resource:
+    """Something built for one or more stages, and the stages that reference it."""
+
+    def __init__(self, value: Any, release: Callable[[Any], None] | None) -> None:
+        """Initializer for a Resource object.
+
+        :param value: The resource.
+        :type value: Any
+        :param release: Called with the resource when it is freed, to drop any other
+            reference to it, e.g. from a cache.
+        :type release: Callable[[Any], None] | None
+        """
+
+        self.value: Any = value
+        self.release: Callable[[Any], None] | None = release
+        self.owners: Set[int | str] = set()
+
+        # the keys of the resources built from this one, which are freed with it
+        self.dependents: Set[ResourceKey] = set()
+
+    @property
+    def size(self) -> int:
+        """The estimated memory the resource holds, measured every time since it can grow."""
+
+        return resource_size(self.value)
+
+
+class StageLifecycle:
+    """Loads and unloads stages around the player and frees their unused resources."""
+
+    def __init__(
+        self, budget: int, stages: StageMap = STAGES, include_neighbours: bool = True
+    ) -> None:
+        """Initializer for a StageLifecycle object.
+
+        :param budget: The most bytes of unreferenced resources kept before the ones used
+            longest ago are freed.
+        :type budget: int
+        :param stages: The stages to load.
+        :type stages: StageMap, optional
+        :param include_neighbours: Whether the stages next to the current one are loaded
+            with it.
+        :type include_neighbours: bool, optional
+        """
+
+        check_type(budget, int)
+        check_type(stages, StageMap)
+
+        self.budget: int = budget
+        self.stages: StageMap = stages
+        self.include_neighbours: bool = include_neighbours
+
+        self.hooks: Dict[str, List[Callable[[int | str], None]]] = {event: [] for event in EVENTS}
+        self.resources: Dict[ResourceKey, Resource] = {}
+
+        # the resources no stage references, the one used longest ago first
+        self.unused: OrderedDict[ResourceKey, None] = collections.OrderedDict()
+
+        self.current: int | str | None = None
+        self.active: List[int | str] = []
+
+        # the number of resources freed to stay under the budget
+        self.freed: int = 0
+
+    def add_hook(self, event: str, hook: Callable[[int | str], None]) -> None:
+        """Adds a hook that is called with the stage's name when the event happens to it.
+
+        Load hooks are where the resources of a stage are acquired.
+
+        :param event: One of EVENTS.
+        :type event: str
+        :param hook: The hook.
+        :type hook: Callable[[int | str], None]
+        """
+
+        check_value(event, *EVENTS)
+        self.hooks[event].append(hook)
+
+    def _fire(self, event: str, name: int | str) -> None:
+        """Internal method that calls the hooks of an event.
+
+        :param event: The event.
+        :type event: str
+        :param name: The name of the stage the event happened to.
+        :type name: int | str
+        """
+
+        for hook in self.hooks[event]:
+            hook(name)
+
+    def acquire(
+        self,
+        owner: int | str,
+        key: ResourceKey,
+        factory: Callable[[], Any],
+        release: Callable[[Any], None] | None = None,
+        depends_on: ResourceKey | None = None,
+    ) -> Any:
+        """Gets a resource for a stage, building it if it is not loaded.
+
+        The resource stays loaded at least until every stage that acquired it
+        is unloaded.
+
+        :param owner: The name of the stage that uses the resource.
+        :type owner: int | str
+        :param key: The key of the resource, with the kind of resource first.
+        :type key: ResourceKey
+        :param factory: Builds the resource.
+        :type factory: Callable[[], Any]
+        :param release: Called with the resource when it is freed.
+        :type release: Callable[[Any], None] | None, optional
+        :param depends_on: The key of the loaded resource this one is built from, e.g.
+            ("stage", 7) for the tilemap of stage 7, which frees this one when it is freed.
+        :type depends_on: ResourceKey | None, optional
+        :raises KeyError: If the resource it depends on is not loaded.
+        :return: The resource.
+        :rtype: Any
+        """
+
+        resource = self.resources.get(key)
+        if resource is None:
+            parent = None if depends_on is None else self.resources[depends_on]
+            resource = self.resources[key] = Resource(factory(), release)
+            if parent is not None:
+                parent.dependents.add(key)
+        elif not resource.owners:
+            del self.unused[key]
+        resource.owners.add(owner)
+        return resource.value
+
+    def get(self, key: ResourceKey) -> Any:
+        """Gets a loaded resource.
+
+        :param key: The key of the resource.
+        :type key: ResourceKey
+        :raises KeyError: If the resource is not loaded.
+        :return: The resource.
+        :rtype: Any
+        """
+
+        return self.resources[key].value
+
+    def _load(self, name: int | str) -> None:
+        """Internal method that acquires a stage for itself and runs its load hooks.
+
+        :param name: The name of the stage.
+        :type name: int | str
+        """
+
+        self.acquire(
+            name,
+            ("stage", name),
+            lambda: self.stages[name],
+            lambda _: self.stages.built.pop(name, None),
+        )
+        self._fire("load", name)
+
+    def _unload(self, name: int | str) -> None:
+        """Internal method that runs a stage's unload hooks and drops its references.
+
+        :param name: The name of the stage.
+        :type name: int | str
+        """
+
+        self._fire("unload", name)
+        for key, resource in self.resources.items():
+            if name in resource.owners:
+                resource.owners.discard(name)
+                if not resource.owners:
+                    self.unused[key] = None
+
+    def enter(self, name: int | str) -> Stage:
+        """Moves the player into a stage, loading and unloading the stages around it.
+
+        :param name: The name of the stage.
+        :type name: int | str
+        :return: The stage.
+        :rtype: Stage
+        """
+
+        if name == self.current:
+            return self.get(("stage", name))
+
+        if self.current is not None:
+            self._fire("exit", self.current)
+
+        area = [name]
+        if self.include_neighbours and name in GRID_LOCATIONS:
+            area += neighbours(name)
+
+        for stage_name in area:
+            if stage_name not in self.active:
+                self._load(stage_name)
+        for stage_name in self.active:
+            if stage_name not in area:
+                self._unload(stage_name)
+        self.active = area
+        self.current = name
+
+        self._fire("enter", name)
+        self.collect()
+        return self.get(("stage", name))
+
+    def collect(self) -> None:
+        """Frees the unreferenced resources used longest ago until they fit the budget."""
+
+        sizes = {key: self.resources[key].size for key in self.unused}
+        total = sum(sizes.values())
+        while total > self.budget and self.unused:
+            key = next(iter(self.unused))
+            for freed in self._free(key):
+                total -= sizes.get(freed, 0)
+                self.freed += 1
+
+    def _free(self, key: ResourceKey) -> List[ResourceKey]:
+        """Internal method that frees a resource and the resources that depend on it.
+
+        :param key: The key of the resource.
+        :type key: ResourceKey
+        :return: The keys of every resource freed.
+        :rtype: List[ResourceKey]
+        """
+
+        resource = self.resources.pop(key, None)
+        if resource is None:
+            # already freed on its own
+            return []
+        self.unused.pop(key, None)
+        if resource.release is not None:
+            resource.release(resource.value)
+
+        freed = [key]
+        for dependent in resource.dependents:
+            freed += self._free(dependent)
+        return freed
+
+    @property
+    def loaded_bytes(self) -> int:
+        """The estimated memory of every resource still loaded, referenced or not."""
+
+        return sum(resource.size for resource in self.resources.values())
+
+    def report(self) -> str:
+        """Formats what each loaded stage holds, and what is kept without a reference.
+
+        :return: The report, one line per stage and per resource.
+        :rtype: str
+        """
+
+        lines = []
+        for name in self.active:
+            owned = [
+                (key, resource)
+                for key, resource in self.resources.items()
+                if name in resource.owners
+            ]
+            total = sum(resource.size for _, resource in owned)
+            marker = " (current)" if name == self.current else ""
+            lines.append(
+                f"stage {name}{marker}: {len(owned)} resources, {_format_size(total)}"
+            )
+            for key, resource in owned:
+                shared = sorted(map(str, resource.owners - {name}))
+                lines.append(
+                    f"    {_format_key(key):<40} {_format_size(resource.size):>10}"
+                    + (f"  shared with {', '.join(shared)}" if shared else "")
+                )
+
+        unused = sum(self.resources[key].size for key in self.unused)
+        lines.append(
+            f"unused: {len(self.unused)} resources, {_format_size(unused)} "
+            f"of a {_format_size(self.budget)} budget, {self.freed} freed"
+        )
+        return "\n".join(lines)
+
+
+def _format_key(key: ResourceKey) -> str:
+    """Internal function that formats a resource key for the report, shortening long text.
+
+    :param key: The key.
+    :type key: ResourceKey
+    :return: The formatted key.
+    :rtype: str
+    """
+
+    parts = [str(part) if len(str(part)) <= 16 else str(part)[:13] + "..." for part in key]
+    return " ".join(parts)
+
+
+def _format_size(size: int) -> str:
+    """Internal function that formats a number of bytes in KiB or MiB.
+
+    :param size: The number of bytes.
+    :type size: int
+    :return: The formatted size.
+    :rtype: str
+    """
+
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MiB"
+    return f"{size / 1024:.1f} KiB"
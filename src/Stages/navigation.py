@@ -0,0 +1,28 @@
+"""Stages.navigation.py
+
+Module for building the navigation graph of each stage once and
+keeping it for the next time the stage is entered.
+"""
+
+from typing import Dict
+
+from ..Level import NavGraph
+from .__stages import STAGES, room_size
+
+# stage name -> the navigation graph of the stage
+_graphs: Dict[int | str, NavGraph] = {}
+
+
+def nav_graph(name: int | str) -> NavGraph:
+    """Gets the navigation graph of a stage, building it the first time.
+
+    :param name: The name of the stage.
+    :type name: int | str
+    :return: The navigation graph.
+    :rtype: NavGraph
+    """
+
+    graph = _graphs.get(name)
+    if graph is None:
+        graph = _graphs[name] = NavGraph.from_stage(STAGES[name], *room_size(name))
+    return graph
@@ -0,0 +1,34 @@
+"""Stages.preload.py
+
+Module for finding the stages around a stage, which the stage lifecycle
+loads before the player enters them.
+"""
+
+from typing import List
+
+from .__stages import GRID_LOCATIONS, StageNotFoundError, grid_to_stage
+
+
+def neighbours(name: int | str) -> List[int | str]:
+    """Gets the stages next to a stage on the grid.
+
+    :param name: The name of the stage.
+    :type name: int | str
+    :return: The names of the stages above, below, left and right of the stage.
+    :rtype: List[int | str]
+    """
+
+    grid_x, grid_y = GRID_LOCATIONS[name]
+
+    found = []
+    for grid in (
+        (grid_x, grid_y + 1),
+        (grid_x, grid_y - 1),
+        (grid_x - 1, grid_y),
+        (grid_x + 1, grid_y),
+    ):
+        try:
+            found.append(grid_to_stage(grid))
+        except StageNotFoundError:
+            pass
+    return found
@@ -0,0 +1,203 @@
+"""Stages.stress.py
+
+Module containing the stress stage generator, which builds stages with
+far more objects than the preset ones for scaling tests.
+
+Stages are generated in the same format as the preset stages, inside a
+floor, ceiling and walls, and the same seed always generates the same
+stage. Objects are placed on the tile lattice. Without a density they
+are packed into a single screen, stacking on top of each other past a
+few hundred. With a density the room is made as many screens wide as
+it takes for the objects to cover about that share of its tiles.
+"""
+
+import math
+import random
+from typing import List, Set, Tuple
+
+from ..Internal import SCREEN_HEIGHT, SCREEN_WIDTH, TILE_SIZE, check_range, check_type, interp
+from ..Level import Group, Lava, Platform, Spike
+from .__stages import GRID_LOCATIONS, ROOM_SIZES, STAGES, Stage
+
+SPAWN: Tuple[int, int] = (150, SCREEN_HEIGHT - 100)
+'''The bottom left of where the player is placed in a stress stage, which is kept clear.
+'''
+
+_SPAWN_TILES = 4
+_ATTEMPTS = 20
+
+
+class Mover:
+    """Moves a platform back and forth between where it starts and a target."""
+
+    def __init__(self, obj: Platform, target: Tuple[int, int], duration: float) -> None:
+        """Initializer for a Mover object.
+
+        :param obj: The platform to move.
+        :type obj: Platform
+        :param target: The position it moves to before turning back.
+        :type target: Tuple[int, int]
+        :param duration: The time it takes to move one way in seconds.
+        :type duration: float
+        """
+
+        check_type(obj, Platform)
+        check_type(duration, int, float)
+
+        self.obj: Platform = obj
+        self.start: Tuple[int | float, int | float] = (obj.xcor, obj.ycor)
+        self.target: Tuple[int | float, int | float] = target
+        self.duration: float = duration
+
+        obj.moveto(*target, duration, interp.linear, disable_collision=False)
+
+    def update(self, dt: float) -> None:
+        """Moves the platform for a frame, turning it around at either end.
+
+        :param dt: Delta time.
+        :type dt: float
+        """
+
+        obj = self.obj
+        obj.interp(dt)
+        if not obj.interp_data.moving:
+            self.start, self.target = self.target, self.start
+            obj.moveto(*self.target, self.duration, interp.linear, disable_collision=False)
+
+        # collisions use the rect, which interp leaves where it was
+        obj.topleft = (int(obj.xcor), int(obj.ycor))  # pylint: disable=attribute-defined-outside-init
+
+
+def stress_stage(  # pylint: disable=too-many-arguments,too-many-locals
+    seed: int,
+    platforms: int = 100,
+    spikes: int = 20,
+    lava: int = 10,
+    moving: float = 0,
+    density: float | None = None,
+    grid: Tuple[int, int] = (0, -10),
+) -> Tuple[Stage, Tuple[int, int], List[Mover]]:
+    """Generates a stage with the given number of each kind of object.
+
+    :param seed: The seed of the stage. The same arguments always give the same stage.
+    :type seed: int
+    :param platforms: The number of platforms, not counting the floor, ceiling and walls.
+    :type platforms: int, optional
+    :param spikes: The number of spikes.
+    :type spikes: int, optional
+    :param lava: The number of lava pools.
+    :type lava: int, optional
+    :param moving: The share of the platforms that move back and forth, from 0 to 1.
+    :type moving: float, optional
+    :param density: The share of the room's tiles the objects cover, from 0 to 1, which
+        sets how many screens wide the room is, or None to pack them into one screen.
+    :type density: float | None, optional
+    :param grid: The grid location of the stage.
+    :type grid: Tuple[int, int], optional
+    :return: The stage, the width and height of its room, and the movers of its moving
+        platforms, which should be updated every frame.
+    :rtype: Tuple[Stage, Tuple[int, int], List[Mover]]
+    """
+
+    check_type(seed, int)
+    check_type(platforms, int)
+    check_type(spikes, int)
+    check_type(lava, int)
+    check_type(moving, int, float)
+    check_range(moving, 0, 1)
+    if density is not None:
+        check_type(density, int, float)
+        check_range(density, 0.01, 1)
+
+    rng = random.Random(seed)
+    tile = TILE_SIZE
+
+    # the lattice inside the walls, ceiling and floor
+    rows = (SCREEN_HEIGHT - 200) // tile
+    screen_columns = (SCREEN_WIDTH - 200) // tile
+    screens = 1
+    if density is not None:
+        # platforms average 2.5 tiles, lava 2 and spikes 1
+        tiles = platforms * 2.5 + lava * 2 + spikes
+        screens = max(1, math.ceil(tiles / density / (rows * screen_columns)))
+    width = screens * SCREEN_WIDTH
+    columns = (width - 200) // tile
+
+    # the cells around the spawn are kept clear so the player does not start inside something
+    occupied: Set[Tuple[int, int]] = {
+        (column, row)
+        for column in range(_SPAWN_TILES)
+        for row in range(rows - _SPAWN_TILES, rows)
+    }
+
+    def place(span: int) -> Tuple[int, int]:
+        """Picks the top left of a free run of cells, or of any run if the room is full."""
+
+        for _ in range(_ATTEMPTS):
+            column = rng.randrange(columns - span + 1)
+            row = rng.randrange(rows)
+            cells = [(column + offset, row) for offset in range(span)]
+            if not any(cell in occupied for cell in cells):
+                break
+        # without a density objects may stack, only the spawn is kept clear
+        if density is not None:
+            occupied.update(cells)
+        return 100 + column * tile, 100 + row * tile
+
+    platform_group = Group(
+        Platform(0, SCREEN_HEIGHT - 100, width, 100),  # floor
+        Platform(0, 0, width, 100),  # ceiling
+        Platform(-50, 0, 150, SCREEN_HEIGHT),  # left wall
+        Platform(width - 100, 0, 150, SCREEN_HEIGHT),  # right wall
+    )
+    movers = []
+    for _ in range(platforms):
+        span = rng.randint(1, 4)
+        xcor, ycor = place(span)
+        platform = Platform(xcor, ycor, span * tile, tile)
+        platform_group.add(platform)
+
+        if rng.random() < moving:
+            # moving platforms go up to three tiles along one axis and stay inside the walls
+            distance = rng.randint(1, 3) * tile * rng.choice((-1, 1))
+            if rng.random() < 0.5:
+                target = (min(max(xcor + distance, 100), width - 100 - span * tile), ycor)
+            else:
+                target = (xcor, min(max(ycor + distance, 100), SCREEN_HEIGHT - 100 - tile))
+            movers.append(Mover(platform, target, rng.uniform(1, 3)))
+
+    spike_group = Group()
+    for _ in range(spikes):
+        spike_group.add(Spike(*place(1), tile, tile))
+
+    lava_group = Group()
+    for _ in range(lava):
+        span = rng.randint(1, 3)
+        lava_group.add(Lava(*place(span), span * tile, tile))
+
+    stage = (
+        grid,
+        platform_group,
+        spike_group if spikes else None,
+        lava_group if lava else None,
+        None,
+    )
+    return stage, (width, SCREEN_HEIGHT), movers
+
+
+def add_stage(name: int | str, stage: Stage, size: Tuple[int, int]) -> None:
+    """Registers a built stage, like a stress stage, so the player can be put in it.
+
+    :param name: The name of the stage.
+    :type name: int | str
+    :param stage: The stage. Its grid location must not be used by another stage.
+    :type stage: Stage
+    :param size: The width and height of the stage's room.
+    :type size: Tuple[int, int]
+    """
+
+    STAGES.builders[name] = lambda: stage
+    STAGES.built[name] = stage
+    GRID_LOCATIONS[name] = stage[0]
+    if size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        ROOM_SIZES[name] = size
@@ -1,4 +1,53 @@
 """src
 
 Contains all the modules/packages for the project.
+
+The packages are imported the first time they are used as an
+attribute of src, so importing src alone does not load them.
 """
+
+import importlib
+from types import ModuleType
+from typing import List
+
+__all__ = [
+    "Animation",
+    "ECS",
+    "Effects",
+    "GUI",
+    "Internal",
+    "Level",
+    "Net",
+    "Player",
+    "Render",
+    "Save",
+    "Sim",
+    "Stages",
+]
+
+
+def __getattr__(name: str) -> ModuleType:
+    """Imports a package the first time it is accessed.
+
+    :param name: The name of the package.
+    :type name: str
+    :raises AttributeError: If there is no package with the name.
+    :return: The package.
+    :rtype: ModuleType
+    """
+
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # importing the package also sets it as an attribute, so this only runs once per package
+    return importlib.import_module(f".{name}", __name__)
+
+
+def __dir__() -> List[str]:
+    """Lists the packages alongside the attributes that are already set.
+
+    :return: The attribute names.
+    :rtype: List[str]
+    """
+
+    return sorted(set(globals()) | set(__all__))
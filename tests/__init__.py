@@ -0,0 +1,4 @@
+"""tests
+
+Regression tests. Run them from the project root with `python -m pytest tests`.
+"""
@@ -0,0 +1,23 @@
+"""tests.test_ecs.py
+
+Tests for the colliders of a stage added where there was none.
+"""
+
+from src import ECS, Stages
+
+
+def test_colliders_of_added_stage() -> None:
+    """A grid location without a stage is not remembered as empty."""
+
+    grid = (50, 50)
+    assert ECS.colliders_for(grid) is None
+
+    stage, size, _ = Stages.stress_stage(0, platforms=5, spikes=0, lava=0, grid=grid)
+    Stages.add_stage("ADDED", stage, size)
+    try:
+        colliders = ECS.colliders_for(grid)
+        assert colliders is not None
+        assert len(colliders.platforms) == 9
+    finally:
+        del Stages.STAGES.builders["ADDED"], Stages.STAGES.built["ADDED"]
+        del Stages.GRID_LOCATIONS["ADDED"]
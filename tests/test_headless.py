@@ -0,0 +1,39 @@
+"""tests.test_headless.py
+
+Tests for the headless game going back to the first stage after dying.
+"""
+
+from src import Sim, Stages
+from src.Player.controls import RESTART
+
+
+def test_restart_loads_spawn_stage() -> None:
+    """Restarting from the game over room collides with the stage the player is put back in."""
+
+    game = Sim.HeadlessGame()
+    game.plr.take_damage(game.plr.health)
+    game.step(0)
+    assert game.plr.stage == "GAME_OVER"
+
+    game.step(RESTART)
+    assert game.plr.stage == 1
+    assert game.objects[0] == Stages.GRID_LOCATIONS[game.plr.stage]
+
+    for _ in range(120):
+        game.step(0)
+    assert game.objects[0] == Stages.GRID_LOCATIONS[game.plr.stage]
+
+
+def test_inside_for_a_few_frames() -> None:
+    """Being inside a platform only breaks the invariant once it lasts too many frames."""
+
+    game = Sim.HeadlessGame()
+    game.plr.xcor, game.plr.ycor = 20, 710
+
+    for _ in range(Sim.invariants.INSIDE_FRAMES):
+        assert Sim.invariants.outside_platforms(game) is None
+    assert Sim.invariants.outside_platforms(game) is not None
+
+    game.plr.xcor, game.plr.ycor = 300, 720
+    assert Sim.invariants.outside_platforms(game) is None
+    assert game.frames_inside == 0
@@ -0,0 +1,58 @@
+"""tests.test_lifecycle.py
+
+Tests for freeing the resources built from a stage together with the stage.
+"""
+
+from src import Stages
+
+
+def lifecycle(budget: int) -> Stages.StageLifecycle:
+    """Creates a lifecycle over two stages, each with a resource built from it.
+
+    The stages are large and what is built from them small, so a budget
+    between the two only has room for the small ones.
+
+    :param budget: The memory budget of the lifecycle.
+    :type budget: int
+    :return: The lifecycle.
+    :rtype: Stages.StageLifecycle
+    """
+
+    stages = Stages.StageMap()
+    for name in ("a", "b"):
+        stages.builders[name] = lambda: bytearray(2000)
+
+    stage_lifecycle = Stages.StageLifecycle(budget, stages, include_neighbours=False)
+
+    def load_stage(name: int | str) -> None:
+        stage = stage_lifecycle.get(("stage", name))
+        stage_lifecycle.acquire(
+            name, ("derived", name), lambda: [stage], depends_on=("stage", name)
+        )
+
+    stage_lifecycle.add_hook("load", load_stage)
+    return stage_lifecycle
+
+
+def test_derived_freed_with_stage() -> None:
+    """Freeing a stage frees what was built from it, even when that would fit the budget."""
+
+    stage_lifecycle = lifecycle(2500)
+    stage_lifecycle.enter("a")
+    stage_lifecycle.enter("b")
+
+    assert ("stage", "a") not in stage_lifecycle.resources
+    assert ("derived", "a") not in stage_lifecycle.resources
+    assert not stage_lifecycle.unused
+
+
+def test_derived_rebuilt_with_stage() -> None:
+    """A stage built again on re-entry gets its resources built again from it."""
+
+    stage_lifecycle = lifecycle(2500)
+    stage_lifecycle.enter("a")
+    stage_lifecycle.enter("b")
+    stage_lifecycle.enter("a")
+
+    stage = stage_lifecycle.get(("stage", "a"))
+    assert stage_lifecycle.get(("derived", "a"))[0] is stage
@@ -0,0 +1,56 @@
+"""tests.test_particles.py
+
+Tests for the particle system emitting into a pool that is almost full.
+"""
+
+import numpy as np
+import pygame
+
+from src import Effects
+
+
+def almost_full(space: int) -> Effects.ParticleSystem:
+    """Creates a particle system with room for only a few more particles.
+
+    :param space: The number of particles that still fit.
+    :type space: int
+    :return: The particle system.
+    :rtype: Effects.ParticleSystem
+    """
+
+    system = Effects.ParticleSystem(capacity=100, seed=0)
+    system.emit(100 - space, (0, 0), (0, 0), 1, (255, 255, 255))
+    return system
+
+
+def test_emit_arrays_when_full() -> None:
+    """Arrays of one value per particle are cut to the particles that fit."""
+
+    system = almost_full(10)
+    pos = np.arange(80, dtype=np.float64).reshape(40, 2)
+    vel = np.ones((40, 2))
+    life = np.full(40, 2.0)
+
+    assert system.emit(40, pos, vel, life, (255, 0, 0)) == 10
+    assert system.count == 100
+    assert np.array_equal(system.pos[90:100], pos[:10])
+    assert np.array_equal(system.life[90:100], life[:10])
+
+
+def test_emit_scalars_when_full() -> None:
+    """Scalars and tuples still broadcast over the particles that fit."""
+
+    system = almost_full(10)
+
+    assert system.emit(40, (5, 6), (1, 2), 0.5, (0, 255, 0)) == 10
+    assert np.array_equal(system.pos[90:100], np.tile((5.0, 6.0), (10, 1)))
+    assert system.emit(1, (5, 6), (1, 2), 0.5, (0, 255, 0)) == 0
+
+
+def test_bursts_when_full() -> None:
+    """The hazard and dash bursts do not fail when the pool is almost full."""
+
+    system = almost_full(3)
+    Effects.hazard_burst(system, "lava", pygame.Rect(0, 0, 50, 50))
+    Effects.hazard_burst(system, "spike", pygame.Rect(0, 0, 50, 50))
+    assert system.count == 100
@@ -0,0 +1,22 @@
+"""tests.test_savegame.py
+
+Tests for reading the extra section of a save only when it is used.
+"""
+
+import os
+
+from src import Save
+
+
+def test_visited_read_when_used(tmp_path: os.PathLike) -> None:
+    """Loading without the extra section keeps the visited rooms for the next save."""
+
+    save = Save.SaveGame()
+    save.visited = {(1, 1), (2, 1), (7, 0)}
+    path = os.path.join(tmp_path, "save.dat")
+    with open(path, "wb") as file:
+        file.write(save.to_bytes())
+
+    loaded = Save.SaveGame.load(path)
+    assert loaded.to_bytes() == save.to_bytes()
+    assert loaded.visited == {(1, 1), (2, 1), (7, 0)}
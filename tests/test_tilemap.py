@@ -0,0 +1,20 @@
+"""tests.test_tilemap.py
+
+Tests for tilemaps holding more objects than fit in two bytes.
+"""
+
+import pygame
+
+from src import Level
+
+
+def test_more_than_65535_objects() -> None:
+    """Objects past the 65,535th still own the cells they cover."""
+
+    tilemap = Level.TileMap(8, 4)
+    for index in range(70_000):
+        rect = pygame.Rect(50 * (index % 8), 50 * (index // 8 % 4), 50, 50)
+        tilemap.add(rect, Level.tilemap.PLATFORM)
+
+    assert tilemap.owners[0] == 69_985
+    assert tilemap.solid_rects(pygame.Rect(0, 0, 10, 10)) == [pygame.Rect(0, 0, 50, 50)]